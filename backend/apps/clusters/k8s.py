@@ -0,0 +1,113 @@
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+from typing import Dict, Optional
+
+import yaml
+from kubernetes import client, config
+
+from .models import Cluster
+
+
+class _Entry:
+    __slots__ = ('version', 'configuration', 'api_client', 'kubeconfig_path')
+
+    def __init__(self, version, configuration: client.Configuration):
+        self.version = version
+        self.configuration = configuration
+        self.api_client = client.ApiClient(configuration)
+        self.kubeconfig_path: Optional[str] = None
+
+
+class KubeClientCache:
+    """클러스터별 kubernetes Configuration / ApiClient 캐시 (thread-safe)
+
+    kubeconfig 를 메모리에서 파싱해 클러스터마다 독립된 Configuration 을 만들며,
+    ``config.load_kube_config`` 처럼 전역 기본 설정을 바꾸지 않는다. 클러스터가
+    수정되면 updated_at 이 달라져 새로 만든다. kubeconfig 파일은 kubectl 을
+    실행할 때만 필요하므로 처음 요청될 때 한 번 쓰고 계속 재사용한다.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, _Entry] = {}
+        self._lock = threading.Lock()
+        self._dir: Optional[str] = None
+
+    def _entry(self, cluster: Cluster) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(cluster.pk)
+            if entry is not None and entry.version == cluster.updated_at:
+                return entry
+
+        configuration = client.Configuration()
+        config.load_kube_config_from_dict(
+            yaml.safe_load(cluster.get_kubeconfig()),
+            client_configuration=configuration,
+            persist_config=False
+        )
+        new_entry = _Entry(cluster.updated_at, configuration)
+
+        with self._lock:
+            entry = self._entries.get(cluster.pk)
+            if entry is not None and entry.version == cluster.updated_at:
+                return entry
+            if entry is not None:
+                self._remove_file(entry)
+            self._entries[cluster.pk] = new_entry
+            return new_entry
+
+    def configuration(self, cluster: Cluster) -> client.Configuration:
+        return self._entry(cluster).configuration
+
+    def api_client(self, cluster: Cluster) -> client.ApiClient:
+        """REST 호출용 공용 ApiClient
+
+        ``kubernetes.stream`` 은 호출 중 ApiClient 를 바꿔 끼우므로 exec 스트림에는
+        ``new_api_client`` 로 만든 별도 클라이언트를 써야 한다.
+        """
+        return self._entry(cluster).api_client
+
+    def new_api_client(self, cluster: Cluster) -> client.ApiClient:
+        """캐시된 Configuration 을 공유하는 새 ApiClient"""
+        return client.ApiClient(self.configuration(cluster))
+
+    def kubeconfig_path(self, cluster: Cluster) -> str:
+        """kubectl --kubeconfig 에 넘길 파일 경로 (클러스터별로 한 번만 작성)"""
+        entry = self._entry(cluster)
+        with self._lock:
+            if entry.kubeconfig_path is None:
+                if self._dir is None:
+                    self._dir = tempfile.mkdtemp(prefix='kubeconfig-')
+                path = os.path.join(self._dir, f'cluster-{cluster.pk}.yaml')
+                tmp_path = f'{path}.tmp'
+                with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+                    f.write(cluster.get_kubeconfig())
+                os.replace(tmp_path, path)
+                entry.kubeconfig_path = path
+            return entry.kubeconfig_path
+
+    def invalidate(self, cluster_id: int) -> None:
+        """해당 클러스터의 설정과 kubeconfig 파일 제거"""
+        with self._lock:
+            entry = self._entries.pop(cluster_id, None)
+            if entry is not None:
+                self._remove_file(entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._dir is not None:
+                shutil.rmtree(self._dir, ignore_errors=True)
+                self._dir = None
+
+    @staticmethod
+    def _remove_file(entry: _Entry) -> None:
+        if entry.kubeconfig_path and os.path.exists(entry.kubeconfig_path):
+            os.unlink(entry.kubeconfig_path)
+        entry.kubeconfig_path = None
+
+
+kube_clients = KubeClientCache()
+atexit.register(kube_clients.clear)
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clusters', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cluster',
+            name='etcd_backend',
+            field=models.CharField(choices=[('exec', 'kubectl exec (etcdctl)'), ('gateway', 'etcd v3 HTTP gateway')], default='exec', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='cluster',
+            name='etcd_endpoint',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='cluster',
+            name='etcd_tls_encrypted',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
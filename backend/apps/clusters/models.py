@@ -3,14 +3,26 @@ from django.contrib.auth.models import User
 from cryptography.fernet import Fernet
 from django.conf import settings
 import base64
+import json
 import os
 
 
 class Cluster(models.Model):
     """Kubernetes 클러스터 정보"""
+    ETCD_BACKEND_CHOICES = [
+        ('exec', 'kubectl exec (etcdctl)'),
+        ('gateway', 'etcd v3 HTTP gateway'),
+    ]
+
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True)
     kubeconfig_encrypted = models.BinaryField()
+    etcd_backend = models.CharField(
+        max_length=20, choices=ETCD_BACKEND_CHOICES, default='exec'
+    )
+    # 비어 있으면 etcd pod 로 port-forward 하여 접속
+    etcd_endpoint = models.CharField(max_length=255, blank=True)
+    etcd_tls_encrypted = models.BinaryField(blank=True, null=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -45,6 +57,26 @@ class Cluster(models.Model):
         fernet = Fernet(self.get_encryption_key())
         return fernet.decrypt(self.kubeconfig_encrypted).decode()
 
+    def set_etcd_tls(self, ca_cert: str = '', client_cert: str = '', client_key: str = ''):
+        """gateway 접속용 etcd TLS 인증서(PEM)를 암호화하여 저장"""
+        if not (ca_cert or client_cert or client_key):
+            self.etcd_tls_encrypted = None
+            return
+        fernet = Fernet(self.get_encryption_key())
+        payload = json.dumps({
+            'ca_cert': ca_cert,
+            'client_cert': client_cert,
+            'client_key': client_key,
+        })
+        self.etcd_tls_encrypted = fernet.encrypt(payload.encode())
+
+    def get_etcd_tls(self) -> dict:
+        """암호화된 etcd TLS 인증서를 복호화하여 반환 (없으면 빈 dict)"""
+        if not self.etcd_tls_encrypted:
+            return {}
+        fernet = Fernet(self.get_encryption_key())
+        return json.loads(fernet.decrypt(bytes(self.etcd_tls_encrypted)).decode())
+
 
 class ClusterConnection(models.Model):
     """클러스터 연결 로그"""
@@ -0,0 +1,148 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from kubernetes import client
+
+from .k8s import kube_clients
+from .models import Cluster
+
+
+# 여러 클러스터 상태를 동시에 확인하기 위한 공용 스레드 풀
+_probe_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'CLUSTER_PROBE_WORKERS', 16),
+    thread_name_prefix='cluster-probe'
+)
+
+NODE_PAGE_SIZE = 500
+
+
+def count_nodes(core_api: client.CoreV1Api, timeout: float) -> int:
+    """노드 수 (limit=1 + remainingItemCount, 제공되지 않으면 페이지 단위로 셈)"""
+    nodes = core_api.list_node(limit=1, _request_timeout=timeout)
+    remaining = nodes.metadata.remaining_item_count
+    if remaining is not None or not nodes.metadata._continue:
+        return len(nodes.items) + (remaining or 0)
+
+    count = 0
+    token = None
+    while True:
+        page = core_api.list_node(limit=NODE_PAGE_SIZE, _continue=token, _request_timeout=timeout)
+        count += len(page.items)
+        token = page.metadata._continue
+        if not token:
+            return count
+
+
+def probe_cluster(cluster: Cluster, timeout: float = 5.0) -> Dict[str, Any]:
+    """K8s API 버전과 노드 수로 클러스터 연결 상태 확인 (ClusterStatusSerializer 형식)"""
+    result = {
+        'cluster_id': cluster.id,
+        'cluster_name': cluster.name,
+        'is_connected': False,
+        'version': None,
+        'nodes_count': None,
+        'error': None,
+    }
+    started = time.monotonic()
+    try:
+        k8s_client = kube_clients.api_client(cluster)
+        version = client.VersionApi(k8s_client).get_code(_request_timeout=timeout)
+        result['version'] = version.git_version
+        result['nodes_count'] = count_nodes(client.CoreV1Api(k8s_client), timeout)
+        result['is_connected'] = True
+    except Exception as e:
+        result['error'] = str(e)
+    result['latency_ms'] = int((time.monotonic() - started) * 1000)
+    return result
+
+
+class ClusterStatusCache:
+    """클러스터 상태 결과 캐시 (클러스터가 수정되면 updated_at 이 달라져 자동 무효화)"""
+
+    def __init__(self, ttl: float = 15.0):
+        self.ttl = ttl
+        self._entries: Dict[int, Tuple[Any, Dict[str, Any], float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, cluster: Cluster) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(cluster.pk)
+        if entry is None:
+            return None
+        updated_at, result, checked = entry
+        if updated_at != cluster.updated_at or time.monotonic() - checked > self.ttl:
+            return None
+        return result
+
+    def set(self, cluster: Cluster, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[cluster.pk] = (cluster.updated_at, result, time.monotonic())
+
+
+status_cache = ClusterStatusCache(ttl=getattr(settings, 'CLUSTER_STATUS_CACHE_TTL', 15))
+
+
+def _timed_probe(cluster: Cluster, timeout: float, started: Dict[int, float]) -> Dict[str, Any]:
+    """풀 스레드에서 실제로 시작한 시각을 남기고 probe_cluster 실행"""
+    started[cluster.pk] = time.monotonic()
+    return probe_cluster(cluster, timeout)
+
+
+def _timed_out(cluster: Cluster, timeout: float) -> Dict[str, Any]:
+    return {
+        'cluster_id': cluster.id,
+        'cluster_name': cluster.name,
+        'is_connected': False,
+        'version': None,
+        'nodes_count': None,
+        'error': f'Timed out after {timeout:g}s',
+        'latency_ms': None,
+    }
+
+
+def probe_fleet(clusters: Iterable[Cluster], timeout: float = 5.0, refresh: bool = False) -> List[Dict[str, Any]]:
+    """여러 클러스터를 공용 풀에서 동시에 확인 (캐시된 결과는 재사용)
+
+    timeout 은 클러스터마다 probe 가 풀 스레드에서 시작된 시점부터 센다. 클러스터가
+    CLUSTER_PROBE_WORKERS 보다 많으면 나머지는 스레드가 빌 때까지 기다리므로 전체
+    소요 시간은 최대 (클러스터 수 / 스레드 수) * timeout 정도가 된다.
+    """
+    results: Dict[int, Dict[str, Any]] = {}
+    started: Dict[int, float] = {}
+    pending = {}
+    clusters = list(clusters)
+    for cluster in clusters:
+        cached = None if refresh else status_cache.get(cluster)
+        if cached is not None:
+            results[cluster.pk] = dict(cached, cached=True)
+        else:
+            pending[_probe_executor.submit(_timed_probe, cluster, timeout, started)] = cluster
+
+    while pending:
+        now = time.monotonic()
+        deadlines = []
+        for future, cluster in list(pending.items()):
+            begun = started.get(cluster.pk)
+            if begun is None:
+                continue
+            if now - begun >= timeout and not future.done():
+                # 실행 중인 스레드는 요청별 timeout 으로 곧 끝나므로 결과만 버린다
+                results[cluster.pk] = dict(_timed_out(cluster, timeout), cached=False)
+                del pending[future]
+            else:
+                deadlines.append(begun + timeout)
+        if not pending:
+            break
+
+        wait_for = max(min(deadlines) - now, 0) if deadlines else timeout
+        done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+        for future in done:
+            cluster = pending.pop(future)
+            result = future.result()
+            status_cache.set(cluster, result)
+            results[cluster.pk] = dict(result, cached=False)
+
+    return [results[cluster.pk] for cluster in clusters]
@@ -11,6 +11,7 @@ class ClusterSerializer(serializers.ModelSerializer):
         model = Cluster
         fields = [
             'id', 'name', 'description', 'is_active',
+            'etcd_backend', 'etcd_endpoint',
             'created_at', 'updated_at', 'created_by_username'
         ]
         read_only_fields = ['created_at', 'updated_at', 'created_by_username']
@@ -18,24 +19,48 @@ class ClusterSerializer(serializers.ModelSerializer):
 
 class ClusterCreateSerializer(serializers.ModelSerializer):
     kubeconfig = serializers.CharField(write_only=True)
+    etcd_ca_cert = serializers.CharField(write_only=True, required=False, allow_blank=True)
+    etcd_client_cert = serializers.CharField(write_only=True, required=False, allow_blank=True)
+    etcd_client_key = serializers.CharField(write_only=True, required=False, allow_blank=True)
+
+    TLS_FIELDS = ['etcd_ca_cert', 'etcd_client_cert', 'etcd_client_key']
 
     class Meta:
         model = Cluster
-        fields = ['id', 'name', 'description', 'kubeconfig', 'is_active']
+        fields = [
+            'id', 'name', 'description', 'kubeconfig', 'is_active',
+            'etcd_backend', 'etcd_endpoint',
+            'etcd_ca_cert', 'etcd_client_cert', 'etcd_client_key'
+        ]
+
+    def _pop_tls(self, validated_data):
+        if not any(field in validated_data for field in self.TLS_FIELDS):
+            return None
+        return {
+            'ca_cert': validated_data.pop('etcd_ca_cert', ''),
+            'client_cert': validated_data.pop('etcd_client_cert', ''),
+            'client_key': validated_data.pop('etcd_client_key', ''),
+        }
 
     def create(self, validated_data):
         kubeconfig = validated_data.pop('kubeconfig')
+        tls = self._pop_tls(validated_data)
         cluster = Cluster(**validated_data)
         cluster.set_kubeconfig(kubeconfig)
+        if tls:
+            cluster.set_etcd_tls(**tls)
         cluster.save()
         return cluster
 
     def update(self, instance, validated_data):
         kubeconfig = validated_data.pop('kubeconfig', None)
+        tls = self._pop_tls(validated_data)
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         if kubeconfig:
             instance.set_kubeconfig(kubeconfig)
+        if tls is not None:
+            instance.set_etcd_tls(**tls)
         instance.save()
         return instance
 
@@ -59,3 +84,5 @@ class ClusterStatusSerializer(serializers.Serializer):
     version = serializers.CharField(allow_null=True)
     nodes_count = serializers.IntegerField(allow_null=True)
     error = serializers.CharField(allow_null=True)
+    latency_ms = serializers.IntegerField(allow_null=True, required=False)
+    cached = serializers.BooleanField(required=False)
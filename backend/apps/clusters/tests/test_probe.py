@@ -0,0 +1,69 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.test import TestCase
+
+from apps.clusters import probe
+from apps.clusters.models import Cluster
+
+
+class ProbeFleetTests(TestCase):
+    def setUp(self):
+        # 풀보다 클러스터가 많은 상황
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown, wait=True)
+        for name, value in (('_probe_executor', executor), ('status_cache', probe.ClusterStatusCache())):
+            patcher = mock.patch.object(probe, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.clusters = [
+            Cluster.objects.create(name=f'c{i}', kubeconfig_encrypted=b'') for i in range(6)
+        ]
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def fake_probe(self, slow=()):
+        def probe_cluster(cluster, timeout):
+            if cluster.name in slow:
+                self.release.wait(5)
+            else:
+                time.sleep(0.1)
+            return {
+                'cluster_id': cluster.id,
+                'cluster_name': cluster.name,
+                'is_connected': True,
+                'version': 'v1.30.0',
+                'nodes_count': 3,
+                'error': None,
+                'latency_ms': 100,
+            }
+        return mock.patch.object(probe, 'probe_cluster', side_effect=probe_cluster)
+
+    def test_queued_clusters_are_not_timed_out(self):
+        with self.fake_probe():
+            results = probe.probe_fleet(self.clusters, timeout=0.25, refresh=True)
+
+        # 한 번에 2개씩 0.1초 → 전체는 timeout 보다 길지만 각 클러스터는 제 시간 안에 끝남
+        self.assertEqual([r['cluster_name'] for r in results], [c.name for c in self.clusters])
+        self.assertTrue(all(r['is_connected'] for r in results), results)
+
+    def test_slow_cluster_times_out_from_its_own_start(self):
+        with self.fake_probe(slow={'c0'}):
+            started = time.monotonic()
+            results = probe.probe_fleet(self.clusters, timeout=0.3, refresh=True)
+            elapsed = time.monotonic() - started
+
+        self.assertEqual(results[0]['error'], 'Timed out after 0.3s')
+        self.assertFalse(results[0]['is_connected'])
+        # 남은 스레드 하나로 나머지 5개를 차례로 확인
+        self.assertTrue(all(r['is_connected'] for r in results[1:]), results)
+        self.assertLess(elapsed, 1.5)
+
+    def test_cached_results_are_reused(self):
+        with self.fake_probe() as probe_cluster:
+            probe.probe_fleet(self.clusters[:2], timeout=1)
+            results = probe.probe_fleet(self.clusters[:2], timeout=1)
+        self.assertEqual(probe_cluster.call_count, 2)
+        self.assertTrue(all(r['cached'] for r in results))
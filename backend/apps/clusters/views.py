@@ -2,13 +2,14 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.conf import settings
 from django.shortcuts import get_object_or_404
-from kubernetes import client, config
-import tempfile
-import os
+from kubernetes import client
 import yaml
 
+from .k8s import kube_clients
 from .models import Cluster, ClusterConnection
+from .probe import probe_cluster, probe_fleet, status_cache
 from .serializers import (
     ClusterSerializer,
     ClusterCreateSerializer,
@@ -33,43 +34,33 @@ class ClusterViewSet(viewsets.ModelViewSet):
     def status(self, request, pk=None):
         """클러스터 연결 상태 확인"""
         cluster = self.get_object()
-        result = {
-            'cluster_id': cluster.id,
-            'cluster_name': cluster.name,
-            'is_connected': False,
-            'version': None,
-            'nodes_count': None,
-            'error': None
-        }
+        result = probe_cluster(cluster, timeout=settings.CLUSTER_PROBE_TIMEOUT)
+        status_cache.set(cluster, result)
 
-        try:
-            k8s_client = self._get_k8s_client(cluster)
-            version_api = client.VersionApi(k8s_client)
-            version = version_api.get_code()
-            result['version'] = version.git_version
-
-            core_api = client.CoreV1Api(k8s_client)
-            nodes = core_api.list_node()
-            result['nodes_count'] = len(nodes.items)
-            result['is_connected'] = True
-
-            ClusterConnection.objects.create(
-                cluster=cluster,
-                user=request.user,
-                status='success'
-            )
-        except Exception as e:
-            result['error'] = str(e)
-            ClusterConnection.objects.create(
-                cluster=cluster,
-                user=request.user,
-                status='failed',
-                error_message=str(e)
-            )
+        ClusterConnection.objects.create(
+            cluster=cluster,
+            user=request.user,
+            status='success' if result['is_connected'] else 'failed',
+            error_message=result['error'] or ''
+        )
 
         serializer = ClusterStatusSerializer(result)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'])
+    def fleet_status(self, request):
+        """활성 클러스터 전체 상태를 동시에 확인 (CLUSTER_STATUS_CACHE_TTL 동안 캐시)"""
+        refresh = request.query_params.get('refresh', '').lower() == 'true'
+        clusters = Cluster.objects.filter(is_active=True).defer('etcd_tls_encrypted')
+        results = probe_fleet(clusters, timeout=settings.CLUSTER_PROBE_TIMEOUT, refresh=refresh)
+
+        serializer = ClusterStatusSerializer(results, many=True)
+        return Response({
+            'clusters': serializer.data,
+            'count': len(results),
+            'connected': sum(1 for r in results if r['is_connected']),
+        })
+
     @action(detail=True, methods=['post'])
     def test_connection(self, request, pk=None):
         """연결 테스트"""
@@ -102,20 +93,8 @@ class ClusterViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
 
     def _get_k8s_client(self, cluster: Cluster):
-        """클러스터의 kubeconfig로 K8s 클라이언트 생성"""
-        kubeconfig_content = cluster.get_kubeconfig()
-
-        with tempfile.NamedTemporaryFile(
-            mode='w', suffix='.yaml', delete=False
-        ) as f:
-            f.write(kubeconfig_content)
-            temp_path = f.name
-
-        try:
-            config.load_kube_config(config_file=temp_path)
-            return client.ApiClient()
-        finally:
-            os.unlink(temp_path)
+        """클러스터의 kubeconfig로 K8s 클라이언트 생성 (클러스터별 캐시)"""
+        return kube_clients.api_client(cluster)
 
 
 class ClusterConnectionViewSet(viewsets.ReadOnlyModelViewSet):
@@ -1,3 +1,15 @@
 from django.contrib import admin
+from .models import PrefixDeleteJob, EtcdSnapshot
 
-# etcd는 외부 서비스이므로 admin 모델 없음
+
+@admin.register(PrefixDeleteJob)
+class PrefixDeleteJobAdmin(admin.ModelAdmin):
+    list_display = ['cluster', 'prefix', 'status', 'deleted', 'batches', 'started_by', 'started_at']
+    list_filter = ['status', 'started_at']
+    search_fields = ['prefix']
+
+
+@admin.register(EtcdSnapshot)
+class EtcdSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['cluster', 'status', 'revision', 'keys', 'size', 'created_by', 'created_at']
+    list_filter = ['status', 'created_at']
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class EtcdConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.etcd'
+    label = 'etcd'
+
+    def ready(self):
+        from . import signals  # noqa: F401
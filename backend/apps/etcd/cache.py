@@ -0,0 +1,156 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+
+
+# 응답이 다루는 키 범위: ('prefix', '/registry/') / ('key', '/a') / None (쓰기로 무효화하지 않음)
+Scope = Optional[Tuple[str, str]]
+
+
+def scope_overlaps(scope: Scope, key: str, prefix: bool) -> bool:
+    """key (prefix=True 면 key 로 시작하는 범위) 쓰기가 scope 응답에 영향을 주는지"""
+    if scope is None:
+        return False
+    kind, value = scope
+    if kind == 'key':
+        return value == key or (prefix and value.startswith(key))
+    return key.startswith(value) or (prefix and value.startswith(key))
+
+
+def make_params_key(endpoint: str, params: Dict[str, Any]) -> str:
+    payload = json.dumps(params, sort_keys=True, default=str)
+    return f'{endpoint}:{hashlib.sha1(payload.encode()).hexdigest()}'
+
+
+class BaseResponseCache:
+    """읽기 전용 etcd 응답 캐시 (cluster, endpoint, params) → (data, age)"""
+
+    def __init__(self, ttl: float = 5.0):
+        self.ttl = ttl
+
+    async def get(self, cluster_id: int, endpoint: str, params: Dict[str, Any]) -> Optional[Tuple[Any, float]]:
+        return None
+
+    async def set(self, cluster_id: int, endpoint: str, params: Dict[str, Any], scope: Scope, data: Any) -> None:
+        pass
+
+    async def invalidate(self, cluster_id: int, key: Optional[str] = None, prefix: bool = False) -> None:
+        """key 범위와 겹치는 엔트리 제거 (key 가 None 이면 클러스터 전체)"""
+
+    def clear_cluster(self, cluster_id: int) -> None:
+        pass
+
+
+class LocalResponseCache(BaseResponseCache):
+    """프로세스 내 LRU + TTL 캐시, 쓰기와 겹치는 범위의 엔트리만 정확히 제거"""
+
+    def __init__(self, ttl: float = 5.0, max_size: int = 512):
+        super().__init__(ttl)
+        self.max_size = max_size
+        self._entries: 'OrderedDict[Tuple[int, str], Tuple[Any, float, Scope]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, cluster_id, endpoint, params):
+        key = (cluster_id, make_params_key(endpoint, params))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            data, created, _ = entry
+            age = time.time() - created
+            if age > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return data, age
+
+    async def set(self, cluster_id, endpoint, params, scope, data):
+        key = (cluster_id, make_params_key(endpoint, params))
+        with self._lock:
+            self._entries[key] = (data, time.time(), scope)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def invalidate(self, cluster_id, key=None, prefix=False):
+        with self._lock:
+            for entry_key, (_, _, scope) in list(self._entries.items()):
+                if entry_key[0] == cluster_id and (key is None or scope_overlaps(scope, key, prefix)):
+                    del self._entries[entry_key]
+
+    def clear_cluster(self, cluster_id):
+        with self._lock:
+            for entry_key in [k for k in self._entries if k[0] == cluster_id]:
+                del self._entries[entry_key]
+
+
+class DjangoResponseCache(BaseResponseCache):
+    """Django cache backend (예: Redis) 사용, 여러 프로세스가 캐시를 공유
+
+    cache backend 는 키 목록을 순회할 수 없으므로 클러스터별 generation 을 두고,
+    쓰기가 있으면 generation 을 올려 해당 클러스터의 엔트리 전체를 무효화한다.
+    """
+
+    def __init__(self, ttl: float = 5.0, alias: str = 'default', namespace: str = 'etcd-response'):
+        super().__init__(ttl)
+        self.alias = alias
+        self.namespace = namespace
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    def _generation_key(self, cluster_id: int) -> str:
+        return f'{self.namespace}:{cluster_id}:generation'
+
+    async def _entry_key(self, cluster_id, endpoint, params) -> str:
+        generation = await self.cache.aget(self._generation_key(cluster_id), 0)
+        return f'{self.namespace}:{cluster_id}:{generation}:{make_params_key(endpoint, params)}'
+
+    async def get(self, cluster_id, endpoint, params):
+        entry = await self.cache.aget(await self._entry_key(cluster_id, endpoint, params))
+        if entry is None:
+            return None
+        data, created = entry
+        return data, time.time() - created
+
+    async def set(self, cluster_id, endpoint, params, scope, data):
+        key = await self._entry_key(cluster_id, endpoint, params)
+        await self.cache.aset(key, (data, time.time()), self.ttl)
+
+    async def invalidate(self, cluster_id, key=None, prefix=False):
+        generation_key = self._generation_key(cluster_id)
+        try:
+            await self.cache.aincr(generation_key)
+        except ValueError:
+            await self.cache.aset(generation_key, 1, None)
+
+    def clear_cluster(self, cluster_id):
+        generation_key = self._generation_key(cluster_id)
+        try:
+            self.cache.incr(generation_key)
+        except ValueError:
+            self.cache.set(generation_key, 1, None)
+
+
+def build_response_cache(ttl: Optional[float] = None, namespace: str = 'etcd-response') -> BaseResponseCache:
+    backend = getattr(settings, 'ETCD_RESPONSE_CACHE', 'local')
+    if ttl is None:
+        ttl = getattr(settings, 'ETCD_RESPONSE_CACHE_TTL', 5)
+    if backend == 'local':
+        return LocalResponseCache(ttl, getattr(settings, 'ETCD_RESPONSE_CACHE_SIZE', 512))
+    if backend == 'django':
+        return DjangoResponseCache(ttl, getattr(settings, 'ETCD_RESPONSE_CACHE_ALIAS', 'default'), namespace)
+    return BaseResponseCache(ttl)
+
+
+response_cache = build_response_cache()
+
+# keyspace 통계는 전체를 읽어야 해서 비싸므로 쓰기로 무효화하지 않고 TTL 동안 재사용한다
+stats_cache = build_response_cache(getattr(settings, 'ETCD_STATS_CACHE_TTL', 300), namespace='etcd-stats')
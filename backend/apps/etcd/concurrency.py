@@ -0,0 +1,158 @@
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from django.conf import settings
+
+from .metrics import record
+
+
+class ClusterBusy(Exception):
+    """클러스터의 etcd 호출 대기열이 가득 찼거나 대기 시간이 초과됨 (429 로 응답)"""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _ClusterQueue:
+    __slots__ = ('semaphore', 'waiting')
+
+    def __init__(self, per_cluster: int):
+        self.semaphore = asyncio.Semaphore(per_cluster)
+        self.waiting = 0
+
+
+class ClusterCallLimiter:
+    """async view 에서 blocking etcd 호출을 스레드 풀로 넘기고 클러스터별 동시 실행 수 제한
+
+    etcd 호출은 대부분 kubectl 서브프로세스 / HTTP 대기라서 스레드로 충분히 겹쳐
+    실행되며, event loop 는 그동안 다른 요청을 처리한다. 한 클러스터가 풀을
+    독점하지 않도록 클러스터마다 ``per_cluster`` 개까지만 동시에 실행한다.
+
+    자리가 없으면 최대 ``max_queue`` 개까지 ``queue_timeout`` 초 동안 기다리고,
+    그보다 많거나 오래 기다린 호출은 ``ClusterBusy`` 로 바로 거절해 장애 중인
+    etcd 에 요청이 쌓이지 않게 한다.
+    """
+
+    def __init__(self, per_cluster: int = 8, workers: int = 128, max_queue: int = 32,
+                 queue_timeout: float = 10.0):
+        self.per_cluster = per_cluster
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='etcd-call')
+        # asyncio.Semaphore 는 event loop 에 묶이므로 loop 별로 따로 둔다
+        self._queues = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _queue(self, cluster_id: int) -> _ClusterQueue:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            queues = self._queues.setdefault(loop, {})
+            if cluster_id not in queues:
+                queues[cluster_id] = _ClusterQueue(self.per_cluster)
+            return queues[cluster_id]
+
+    async def _acquire(self, cluster_id: int, operation: str, bounded: bool) -> asyncio.Semaphore:
+        queue = self._queue(cluster_id)
+        if not queue.semaphore.locked():
+            await queue.semaphore.acquire()
+            return queue.semaphore
+
+        if bounded and queue.waiting >= self.max_queue:
+            record(cluster_id, operation, 'queue', 0.0, 'rejected')
+            raise ClusterBusy(f'Too many concurrent etcd requests for cluster {cluster_id}, try again later')
+
+        started = time.perf_counter()
+        queue.waiting += 1
+        try:
+            await asyncio.wait_for(queue.semaphore.acquire(), self.queue_timeout if bounded else None)
+        except asyncio.TimeoutError:
+            record(cluster_id, operation, 'queue', time.perf_counter() - started, 'rejected')
+            raise ClusterBusy(
+                f'Timed out after {self.queue_timeout:g}s waiting for an etcd slot on cluster {cluster_id}'
+            ) from None
+        finally:
+            queue.waiting -= 1
+        record(cluster_id, operation, 'queue', time.perf_counter() - started)
+        return queue.semaphore
+
+    async def _run(self, cluster_id: int, bounded: bool, func: Callable, args, kwargs) -> Any:
+        # run_in_executor 는 contextvars 를 넘기지 않으므로 요청별 Server-Timing 기록을 위해 복사
+        context = contextvars.copy_context()
+        semaphore = await self._acquire(cluster_id, getattr(func, '__name__', 'call'), bounded)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, functools.partial(context.run, func, *args, **kwargs)
+            )
+        finally:
+            semaphore.release()
+
+    async def run(self, cluster_id: int, func: Callable, *args, **kwargs) -> Any:
+        """대기열이 가득 찼거나 queue_timeout 안에 자리가 나지 않으면 ``ClusterBusy``"""
+        return await self._run(cluster_id, True, func, args, kwargs)
+
+    async def run_admitted(self, cluster_id: int, func: Callable, *args, **kwargs) -> Any:
+        """이미 응답을 시작한 스트림의 후속 호출, 거절하지 않고 자리가 날 때까지 기다림"""
+        return await self._run(cluster_id, False, func, args, kwargs)
+
+
+class SingleFlight:
+    """같은 key 의 호출이 진행 중이면 새로 실행하지 않고 그 결과를 함께 받음
+
+    여러 사용자가 같은 트리/목록을 동시에 열 때 etcd 에는 한 번만 조회한다.
+    먼저 온 요청이 끊겨도 나머지가 결과를 받을 수 있도록 호출은 별도 task 로
+    실행한다. 결과 객체는 공유되므로 호출한 쪽에서 수정하면 안 된다.
+    """
+
+    def __init__(self):
+        # loop 별 진행 중인 호출 (task 는 만든 loop 에서만 await 할 수 있음)
+        self._calls = weakref.WeakKeyDictionary()
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        calls: Dict[Hashable, asyncio.Task] = self._calls.setdefault(loop, {})
+        task = calls.get(key)
+        if task is None:
+            task = loop.create_task(func())
+            calls[key] = task
+            task.add_done_callback(functools.partial(self._done, calls, key))
+            return await asyncio.shield(task)
+
+        cluster_id, operation = key[:2] if isinstance(key, tuple) else (None, 'call')
+        started = time.perf_counter()
+        try:
+            return await asyncio.shield(task)
+        finally:
+            record(cluster_id, operation, 'coalesced', time.perf_counter() - started)
+
+    @staticmethod
+    def _done(calls, key, task):
+        if calls.get(key) is task:
+            del calls[key]
+        # 기다리던 요청이 모두 끊긴 경우 'exception was never retrieved' 경고 방지
+        if not task.cancelled():
+            task.exception()
+
+
+etcd_calls = ClusterCallLimiter(
+    per_cluster=getattr(settings, 'ETCD_CLUSTER_CONCURRENCY', 8),
+    workers=getattr(settings, 'ETCD_ASYNC_WORKERS', 128),
+    max_queue=getattr(settings, 'ETCD_CLUSTER_QUEUE_SIZE', 32),
+    queue_timeout=getattr(settings, 'ETCD_CLUSTER_QUEUE_TIMEOUT', 10),
+)
+
+# 저장된 스냅샷 조회는 etcd 를 호출하지 않으므로 클러스터 대기열과 따로 제한한다
+snapshot_calls = ClusterCallLimiter(
+    per_cluster=getattr(settings, 'ETCD_SNAPSHOT_CONCURRENCY', 4),
+    workers=getattr(settings, 'ETCD_ASYNC_WORKERS', 128),
+    max_queue=getattr(settings, 'ETCD_CLUSTER_QUEUE_SIZE', 32),
+    queue_timeout=getattr(settings, 'ETCD_CLUSTER_QUEUE_TIMEOUT', 10),
+)
+
+etcd_reads = SingleFlight()
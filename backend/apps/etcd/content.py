@@ -0,0 +1,177 @@
+import base64
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+
+K8S_PROTOBUF_MAGIC = b'k8s\x00'
+
+SNIFF_SIZE = 512
+
+_YAML_LINE = re.compile(r'^(---|- |[\w.\-"\']+:(\s|$))')
+_CONTROL_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+
+
+class DecodeError(ValueError):
+    """값을 읽을 수 있는 형태로 변환할 수 없음"""
+
+
+def to_text(value: bytes) -> Optional[str]:
+    """제어 문자가 없는 UTF-8 이면 str, 아니면 None"""
+    try:
+        text = value.decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+    return None if _CONTROL_CHARS.search(text) else text
+
+
+def sniff_content_type(value: bytes, text: Optional[str] = None) -> str:
+    """값 앞부분만 보고 empty / protobuf / json / yaml / text / binary 판별
+
+    ``text`` 는 ``to_text(value)`` 결과로, 이미 계산했다면 넘겨서 재디코딩을 피한다.
+    """
+    if not value:
+        return 'empty'
+    if value.startswith(K8S_PROTOBUF_MAGIC):
+        return 'protobuf'
+    if text is None:
+        text = to_text(value)
+        if text is None:
+            return 'binary'
+
+    head = text[:SNIFF_SIZE].lstrip()
+    if head[:1] in ('{', '['):
+        return 'json'
+    for line in head.splitlines():
+        if not line.strip() or line.startswith('#'):
+            continue
+        return 'yaml' if _YAML_LINE.match(line) else 'text'
+    return 'text'
+
+
+def decode_value(value: bytes, content_type: str, max_size: int) -> Any:
+    """content_type 에 맞게 값을 구조화된 형태로 변환 (max_size 초과 시 DecodeError)"""
+    if len(value) > max_size:
+        raise DecodeError(f'Value is too large to decode ({len(value)} bytes > {max_size})')
+
+    if content_type == 'json':
+        try:
+            return json.loads(value)
+        except ValueError as e:
+            raise DecodeError(f'Invalid JSON: {e}')
+    if content_type == 'yaml':
+        try:
+            return yaml.safe_load(value)
+        except yaml.YAMLError as e:
+            raise DecodeError(f'Invalid YAML: {e}')
+    if content_type == 'protobuf':
+        return decode_k8s_protobuf(value)
+    if content_type == 'binary':
+        try:
+            return decode_protobuf_raw(value)
+        except DecodeError as e:
+            raise DecodeError(f'Binary value is not protobuf: {e}')
+    return value.decode('utf-8', 'replace')
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(data) or shift > 63:
+            raise DecodeError('Truncated varint')
+        b = data[pos]
+        pos += 1
+        result |= (b & 0x7f) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _iter_fields(data: bytes):
+    """protobuf wire format 필드 (field_no, wire_type, value) 순회"""
+    pos = 0
+    while pos < len(data):
+        tag, pos = _read_varint(data, pos)
+        field_no, wire_type = tag >> 3, tag & 0x7
+        if field_no == 0:
+            raise DecodeError('Invalid field number')
+        if wire_type == 0:
+            value, pos = _read_varint(data, pos)
+        elif wire_type == 1:
+            value, pos = data[pos:pos + 8], pos + 8
+        elif wire_type == 2:
+            length, pos = _read_varint(data, pos)
+            value, pos = data[pos:pos + length], pos + length
+        elif wire_type == 5:
+            value, pos = data[pos:pos + 4], pos + 4
+        else:
+            raise DecodeError(f'Unsupported wire type {wire_type}')
+        if pos > len(data):
+            raise DecodeError('Truncated field')
+        yield field_no, wire_type, value
+
+
+def decode_protobuf_raw(data: bytes, depth: int = 0, max_depth: int = 16) -> List[Dict[str, Any]]:
+    """스키마 없이 protobuf 를 필드 목록으로 변환 (``protoc --decode_raw`` 와 유사)
+
+    length-delimited 필드는 출력 가능한 문자열 → 중첩 메시지 → base64 순으로 해석한다.
+    """
+    fields = []
+    for field_no, wire_type, value in _iter_fields(data):
+        item: Dict[str, Any] = {'field': field_no}
+        if wire_type == 0:
+            item['varint'] = value
+        elif wire_type == 1:
+            item['fixed64'] = int.from_bytes(value, 'little')
+        elif wire_type == 5:
+            item['fixed32'] = int.from_bytes(value, 'little')
+        else:
+            item.update(_decode_bytes_field(value, depth, max_depth))
+        fields.append(item)
+    return fields
+
+
+def _decode_bytes_field(value: bytes, depth: int, max_depth: int) -> Dict[str, Any]:
+    text = to_text(value)
+    if text is not None and text.isprintable():
+        return {'string': text}
+    if value and depth < max_depth:
+        try:
+            return {'message': decode_protobuf_raw(value, depth + 1, max_depth)}
+        except DecodeError:
+            pass
+    if text is not None:
+        return {'string': text}
+    return {'bytes': base64.b64encode(value).decode()}
+
+
+def decode_k8s_protobuf(value: bytes) -> Dict[str, Any]:
+    """Kubernetes protobuf 저장 형식 (``k8s\\0`` + runtime.Unknown) 해석
+
+    runtime.Unknown: 1=TypeMeta(1=apiVersion, 2=kind), 2=raw, 3=contentEncoding, 4=contentType
+    raw 는 타입별 스키마가 없으므로 raw 필드 목록으로 변환한다.
+    """
+    if not value.startswith(K8S_PROTOBUF_MAGIC):
+        raise DecodeError('Missing k8s protobuf magic')
+
+    result: Dict[str, Any] = {'api_version': '', 'kind': ''}
+    raw = b''
+    for field_no, wire_type, field in _iter_fields(value[len(K8S_PROTOBUF_MAGIC):]):
+        if wire_type != 2:
+            continue
+        if field_no == 1:
+            for meta_no, meta_type, meta in _iter_fields(field):
+                if meta_type == 2 and meta_no in (1, 2):
+                    result['api_version' if meta_no == 1 else 'kind'] = meta.decode('utf-8', 'replace')
+        elif field_no == 2:
+            raw = field
+        elif field_no == 3:
+            result['content_encoding'] = field.decode('utf-8', 'replace')
+        elif field_no == 4:
+            result['content_type'] = field.decode('utf-8', 'replace')
+
+    result['object'] = decode_protobuf_raw(raw)
+    return result
@@ -0,0 +1,85 @@
+import difflib
+import json
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+from .backends import WatchStream
+from .content import to_text, sniff_content_type, decode_value, DecodeError
+
+
+_END = object()
+
+
+def replay_watch(stream: WatchStream, deadline: float, idle_timeout: float) -> Iterator[Dict[str, Any]]:
+    """과거 revision 부터 연 watch 응답을 deadline 까지 yield
+
+    watch 는 남아 있는 이벤트를 곧바로 보낸 뒤 새 변경을 기다리므로, idle_timeout
+    동안 응답이 없으면 재생이 끝난 것으로 보고 멈춘다. 스트림 읽기는 별도 스레드가
+    맡아 blocking read 에 묶이지 않으며, 끝나면 stream 을 닫는다.
+    """
+    responses: queue.Queue = queue.Queue()
+
+    def pump():
+        try:
+            for resp in stream:
+                responses.put(resp)
+        except Exception as e:
+            responses.put(e)
+        finally:
+            responses.put(_END)
+
+    threading.Thread(target=pump, daemon=True, name='etcd-history').start()
+    try:
+        while True:
+            wait = min(idle_timeout, deadline - time.monotonic())
+            if wait <= 0:
+                return
+            try:
+                item = responses.get(timeout=wait)
+            except queue.Empty:
+                return
+            if item is _END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stream.close()
+
+
+def diffable_text(value: bytes, max_size: int) -> Optional[str]:
+    """diff 할 텍스트 (텍스트 값은 그대로, protobuf 등은 구조화한 JSON, 불가능하면 None)"""
+    text = to_text(value)
+    if text is not None:
+        return text
+    try:
+        decoded = decode_value(value, sniff_content_type(value), max_size)
+    except DecodeError:
+        return None
+    return json.dumps(decoded, indent=2, ensure_ascii=False, sort_keys=True)
+
+
+def diff_values(old: bytes, new: bytes, old_label: str, new_label: str,
+                max_size: int = 256 * 1024, context: int = 3) -> Dict[str, Any]:
+    """두 값의 unified diff (텍스트로 만들 수 없으면 ``binary: True`` 로 일치 여부만)"""
+    result: Dict[str, Any] = {'identical': old == new, 'binary': False, 'diff': ''}
+    if result['identical']:
+        return result
+
+    old_text = diffable_text(old, max_size)
+    new_text = diffable_text(new, max_size)
+    if old_text is None or new_text is None:
+        result.update(binary=True, diff=None)
+        return result
+
+    result['diff'] = '\n'.join(difflib.unified_diff(
+        old_text.splitlines(),
+        new_text.splitlines(),
+        old_label,
+        new_label,
+        n=context,
+        lineterm=''
+    ))
+    return result
@@ -0,0 +1,224 @@
+import bisect
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from .backends import EtcdBackendError, prefix_range_end
+
+
+logger = logging.getLogger(__name__)
+
+
+class KeyIndex:
+    """정렬된 키 목록의 메모리 인덱스 (값은 보관하지 않음)
+
+    ``prefix`` 아래 키만 담으므로 그 밖의 범위는 ``covers`` 로 확인하고 etcd 에서 읽어야 한다.
+    """
+
+    def __init__(self, prefix: bytes = b''):
+        self.prefix = prefix
+        self._keys: List[bytes] = []
+        self.revision = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def covers(self, prefix: bytes) -> bool:
+        """prefix 아래 키가 모두 인덱스 범위 안에 있는지"""
+        return prefix.startswith(self.prefix)
+
+    def load(self, keys: List[bytes], revision: int) -> None:
+        with self._lock:
+            self._keys = keys
+            self.revision = revision
+
+    def apply(self, events: List[Dict[str, Any]], revision: int) -> None:
+        """watch 이벤트 반영"""
+        with self._lock:
+            for event in events:
+                key = event['kv']['key']
+                i = bisect.bisect_left(self._keys, key)
+                exists = i < len(self._keys) and self._keys[i] == key
+                if event['type'] == 'DELETE':
+                    if exists:
+                        del self._keys[i]
+                elif not exists:
+                    self._keys.insert(i, key)
+            self.revision = max(self.revision, revision)
+
+    def _bounds(self, start: bytes, end: bytes) -> Tuple[int, int]:
+        lo = bisect.bisect_left(self._keys, start)
+        hi = len(self._keys) if end == b'\0' else bisect.bisect_left(self._keys, end)
+        return lo, hi
+
+    def range(self, start: bytes, end: bytes, limit: int = 0) -> Tuple[List[bytes], bool, int]:
+        """[start, end) 키 목록 → (keys, more, revision)"""
+        with self._lock:
+            lo, hi = self._bounds(start, end)
+            stop = min(hi, lo + limit) if limit else hi
+            return self._keys[lo:stop], stop < hi, self.revision
+
+    def count(self, start: bytes, end: bytes) -> int:
+        with self._lock:
+            lo, hi = self._bounds(start, end)
+            return hi - lo
+
+    def children(
+        self,
+        prefix: bytes,
+        start: bytes,
+        limit: int
+    ) -> Tuple[Dict[bytes, Dict[str, Any]], bool, int]:
+        """prefix 바로 아래 자식 → ({name: {is_dir, count}}, more, revision)
+
+        하위 디렉터리는 bisect 로 건너뛰므로 O(자식 수 * log n) 이다.
+        """
+        children: Dict[bytes, Dict[str, Any]] = {}
+        with self._lock:
+            i, hi = self._bounds(start, prefix_range_end(prefix))
+            while i < hi:
+                name, sep, _ = self._keys[i][len(prefix):].partition(b'/')
+                if name not in children:
+                    if len(children) >= limit:
+                        return children, True, self.revision
+                    children[name] = {'is_dir': False, 'count': 0}
+                if sep:
+                    j = bisect.bisect_left(self._keys, prefix_range_end(prefix + name + b'/'), i, hi)
+                    children[name]['is_dir'] = True
+                    children[name]['count'] += j - i
+                    i = j
+                else:
+                    i += 1
+            return children, False, self.revision
+
+
+class KeyIndexWatcher(threading.Thread):
+    """클러스터 하나의 KeyIndex 를 snapshot + watch 로 최신 상태로 유지"""
+
+    PREFIX = b'/'
+    SNAPSHOT_BATCH = 10000
+
+    def __init__(self, service, retry_interval: float = 5.0):
+        super().__init__(daemon=True, name=f'etcd-key-index-{service.cluster.pk}')
+        self.service = service
+        self.index = KeyIndex(self.PREFIX)
+        self.ready = False
+        self.last_access = time.monotonic()
+        self.retry_interval = retry_interval
+        self._stopped = threading.Event()
+        self._stream = None
+        self._stream_lock = threading.Lock()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        with self._stream_lock:
+            stream = self._stream
+        if stream is not None:
+            stream.close()
+
+    def run(self):
+        need_snapshot = True
+        while not self._stopped.is_set():
+            try:
+                if need_snapshot:
+                    self._snapshot()
+                    need_snapshot = False
+                need_snapshot = self._follow()
+            except EtcdBackendError as e:
+                self.ready = False
+                need_snapshot = True
+                if not self._stopped.is_set():
+                    logger.warning('key index watch for cluster %s failed: %s', self.service.cluster.pk, e)
+                    self._stopped.wait(self.retry_interval)
+
+    def _snapshot(self) -> None:
+        """keys-only 로 고정 revision 스캔"""
+        keys: List[bytes] = []
+        revision = 0
+        for revision, kvs in self.service.scan(
+            self.PREFIX, keys_only=True, batch_size=self.SNAPSHOT_BATCH
+        ):
+            if self._stopped.is_set():
+                return
+            keys.extend(kv['key'] for kv in kvs)
+
+        self.index.load(keys, revision)
+        self.ready = True
+
+    def _follow(self) -> bool:
+        """watch 이벤트 반영, compaction 등으로 snapshot 이 다시 필요하면 True"""
+        stream = self.service.watch(
+            self.PREFIX, start_revision=self.index.revision + 1
+        )
+        with self._stream_lock:
+            if self._stopped.is_set():
+                # 여는 동안 stop() 됨, 이벤트가 없으면 영영 깨어나지 못한다
+                stream.close()
+                return False
+            self._stream = stream
+        try:
+            for resp in stream:
+                if self._stopped.is_set():
+                    return False
+                if resp['canceled'] or resp['compact_revision']:
+                    self.ready = False
+                    return True
+                self.index.apply(resp['events'], resp['header']['revision'])
+        finally:
+            stream.close()
+            with self._stream_lock:
+                self._stream = None
+        return False
+
+
+class KeyIndexRegistry:
+    """클러스터별 KeyIndexWatcher 관리 (요청 시 시작, 유휴 시 종료)"""
+
+    def __init__(self, enabled: bool = False, idle_timeout: float = 600.0):
+        self.enabled = enabled
+        self.idle_timeout = idle_timeout
+        self._watchers: Dict[int, KeyIndexWatcher] = {}
+        self._lock = threading.Lock()
+
+    def get(self, service) -> Optional[KeyIndex]:
+        """준비된 인덱스 반환, 없으면 백그라운드로 시작하고 None"""
+        if not self.enabled:
+            return None
+
+        cluster_id = service.cluster.pk
+        with self._lock:
+            self._stop_idle()
+            watcher = self._watchers.get(cluster_id)
+            if watcher is None or not watcher.is_alive():
+                watcher = KeyIndexWatcher(service)
+                self._watchers[cluster_id] = watcher
+                watcher.start()
+            watcher.last_access = time.monotonic()
+
+        return watcher.index if watcher.ready else None
+
+    def stop(self, cluster_id: int, service=None) -> None:
+        """클러스터의 watcher 종료 (service 를 주면 그 서비스로 시작한 watcher 만)"""
+        with self._lock:
+            watcher = self._watchers.get(cluster_id)
+            if watcher is None or (service is not None and watcher.service is not service):
+                return
+            del self._watchers[cluster_id]
+        watcher.stop()
+
+    def _stop_idle(self) -> None:
+        now = time.monotonic()
+        for cluster_id, watcher in list(self._watchers.items()):
+            if now - watcher.last_access > self.idle_timeout:
+                del self._watchers[cluster_id]
+                watcher.stop()
+
+
+key_indexes = KeyIndexRegistry(
+    enabled=getattr(settings, 'ETCD_KEY_INDEX_ENABLED', False),
+    idle_timeout=getattr(settings, 'ETCD_KEY_INDEX_IDLE_TIMEOUT', 600),
+)
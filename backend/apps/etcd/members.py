@@ -0,0 +1,76 @@
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class EtcdPodSelector:
+    """클러스터의 etcd pod 목록 캐시와 요청별 pod 선택
+
+    pod 목록은 ttl 동안 재사용하고 (동시 조회는 한 번만 실행), 읽기는 정상 pod 들에
+    round-robin 으로 나누며, 쓰기는 최근 응답 시간(EWMA)이 가장 짧은 pod 로 보낸다.
+    실패한 pod 는 failure_ttl 동안 제외하고 목록을 다시 조회한다.
+    """
+
+    EWMA_ALPHA = 0.3
+
+    def __init__(
+        self,
+        lookup: Callable[[str], List[str]],
+        ttl: float = 30.0,
+        failure_ttl: float = 30.0
+    ):
+        self.lookup = lookup
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self._pods: Dict[str, Tuple[List[str], float]] = {}
+        self._latency: Dict[str, float] = {}
+        self._failed: Dict[str, float] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def pods(self, namespace: str) -> List[str]:
+        with self._lock:
+            cached = self._pods.get(namespace)
+            if cached and time.monotonic() - cached[1] < self.ttl:
+                return cached[0]
+
+            pods = self.lookup(namespace)
+            self._pods[namespace] = (pods, time.monotonic())
+            return pods
+
+    def healthy(self, namespace: str, exclude: Tuple[str, ...] = ()) -> List[str]:
+        """최근 실패하지 않은 pod (모두 실패했다면 제외한 것 외 전체)"""
+        pods = [p for p in self.pods(namespace) if p not in exclude]
+        now = time.monotonic()
+        with self._lock:
+            healthy = [p for p in pods if now - self._failed.get(p, -self.failure_ttl) >= self.failure_ttl]
+        return healthy or pods
+
+    def pick(self, namespace: str, write: bool = False, exclude: Tuple[str, ...] = ()) -> Optional[str]:
+        pods = self.healthy(namespace, exclude)
+        if not pods:
+            return None
+        if write:
+            # 응답 기록이 없는 pod 는 0 으로 취급해 한 번씩은 시도된다
+            with self._lock:
+                return min(pods, key=lambda p: self._latency.get(p, 0.0))
+        return pods[next(self._counter) % len(pods)]
+
+    def record(self, pod: str, elapsed: float) -> None:
+        with self._lock:
+            previous = self._latency.get(pod)
+            self._latency[pod] = elapsed if previous is None else (
+                self.EWMA_ALPHA * elapsed + (1 - self.EWMA_ALPHA) * previous
+            )
+            self._failed.pop(pod, None)
+
+    def mark_failed(self, namespace: str, pod: str) -> None:
+        with self._lock:
+            self._failed[pod] = time.monotonic()
+            self._latency.pop(pod, None)
+            self._pods.pop(namespace, None)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._pods.clear()
@@ -0,0 +1,152 @@
+import contextvars
+import hmac
+import ipaddress
+import os
+import subprocess
+import threading
+import time
+from typing import Dict, List, Optional
+
+import urllib3
+from django.conf import settings
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # /metrics 는 선택 사항 (Server-Timing 은 없어도 동작)
+    prometheus_client = None
+
+
+# 단계별 소요 시간 histogram 구간 (초), kubectl exec 는 수십~수백 ms
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+TIMEOUT_ERRORS = (TimeoutError, subprocess.TimeoutExpired, urllib3.exceptions.TimeoutError)
+
+METRICS_ENABLED = getattr(settings, 'ETCD_METRICS_ENABLED', True) and prometheus_client is not None
+
+if METRICS_ENABLED:
+    STAGE_SECONDS = prometheus_client.Histogram(
+        'etcd_stage_duration_seconds',
+        'Time spent in each stage of an etcd operation',
+        ['cluster', 'operation', 'stage', 'outcome'],
+        buckets=STAGE_BUCKETS,
+    )
+    TIMEOUTS = prometheus_client.Counter(
+        'etcd_timeouts',
+        'etcd operations that timed out',
+        ['cluster', 'operation'],
+    )
+    RESPONSE_BYTES = prometheus_client.Counter(
+        'etcd_response_bytes',
+        'Bytes returned by etcdctl or the etcd gateway',
+        ['cluster', 'operation'],
+    )
+
+
+class RequestTimings:
+    """요청 하나에서 단계별로 걸린 시간 합계 (Server-Timing 헤더용, 여러 스레드에서 기록)"""
+
+    def __init__(self):
+        self.stages: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            entry = self.stages.setdefault(stage, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+    def header(self, total: Optional[float] = None) -> str:
+        """``Server-Timing`` 헤더 값 (같은 단계가 여러 번이면 합계와 횟수)"""
+        with self._lock:
+            items = [
+                f'{stage};dur={seconds * 1000:.1f}' + (f';desc="{count}x"' if count > 1 else '')
+                for stage, (seconds, count) in self.stages.items()
+            ]
+        if total is not None:
+            items.append(f'app;dur={total * 1000:.1f}')
+        return ', '.join(items)
+
+
+current_timings: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar(
+    'etcd_request_timings', default=None
+)
+
+
+def record(cluster_id, operation: str, stage: str, seconds: float, outcome: str = 'ok') -> None:
+    """단계 하나의 소요 시간을 metrics 와 현재 요청의 Server-Timing 에 기록"""
+    if METRICS_ENABLED:
+        STAGE_SECONDS.labels(str(cluster_id), operation, stage, outcome).observe(seconds)
+        # 시간 초과는 작업 단위로 한 번만 (내부 단계가 아니라 total 에서) 센다
+        if outcome == 'timeout' and stage == 'total':
+            TIMEOUTS.labels(str(cluster_id), operation).inc()
+    timings = current_timings.get()
+    if timings is not None:
+        timings.add(stage, seconds)
+
+
+def record_timeout(cluster_id, operation: str) -> None:
+    if METRICS_ENABLED:
+        TIMEOUTS.labels(str(cluster_id), operation).inc()
+
+
+def record_bytes(cluster_id, operation: str, size: int) -> None:
+    if METRICS_ENABLED:
+        RESPONSE_BYTES.labels(str(cluster_id), operation).inc(size)
+
+
+class timed:
+    """with 블록 소요 시간을 ``record`` 로 기록
+
+    예외가 나면 outcome 은 error (timeout 류면 timeout) 가 되며, 블록 안에서
+    ``outcome`` 을 직접 바꿀 수도 있다.
+    """
+
+    __slots__ = ('cluster_id', 'operation', 'stage', 'outcome', '_started')
+
+    def __init__(self, cluster_id, operation: str, stage: str):
+        self.cluster_id = cluster_id
+        self.operation = operation
+        self.stage = stage
+        self.outcome = 'ok'
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and self.outcome == 'ok':
+            self.outcome = 'timeout' if issubclass(exc_type, TIMEOUT_ERRORS) else 'error'
+        record(self.cluster_id, self.operation, self.stage, time.perf_counter() - self._started, self.outcome)
+        return False
+
+
+def metrics_allowed(request) -> bool:
+    """/metrics 접근 허용 여부 (ETCD_METRICS_TOKEN 과 같은 Bearer token, 또는 허용 IP 대역)"""
+    token = getattr(settings, 'ETCD_METRICS_TOKEN', '')
+    authorization = request.META.get('HTTP_AUTHORIZATION', '')
+    if token and authorization.startswith('Bearer '):
+        return hmac.compare_digest(authorization[len('Bearer '):].encode(), token.encode())
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    for allowed in getattr(settings, 'ETCD_METRICS_ALLOWED_IPS', ['127.0.0.1', '::1']):
+        try:
+            if address in ipaddress.ip_network(allowed, strict=False):
+                return True
+        except ValueError:
+            continue
+    return False
+
+
+def render_latest():
+    """(본문, content type), prometheus_client 가 없거나 꺼져 있으면 None"""
+    if not METRICS_ENABLED:
+        return None
+    registry = prometheus_client.REGISTRY
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        # uvicorn --workers 처럼 여러 프로세스일 때는 프로세스별 기록을 합쳐서 노출
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
@@ -0,0 +1,53 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .metrics import RequestTimings, current_timings
+
+
+class ServerTimingMiddleware:
+    """요청 중 기록된 etcd 단계별 소요 시간을 ``Server-Timing`` 헤더로 반환
+
+    스트리밍 응답은 헤더를 먼저 보내므로 첫 응답까지의 단계만 포함된다.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'ETCD_SERVER_TIMING_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        return self._add_header(response, timings, started)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        return self._add_header(response, timings, started)
+
+    @staticmethod
+    def _add_header(response, timings: RequestTimings, started: float):
+        response['Server-Timing'] = timings.header(time.perf_counter() - started)
+        return response
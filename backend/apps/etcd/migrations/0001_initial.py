@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:53
+
+import apps.etcd.models
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('clusters', '0002_etcd_backend'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrefixDeleteJob',
+            fields=[
+                ('id', models.CharField(default=apps.etcd.models._job_id, editable=False, max_length=32, primary_key=True, serialize=False)),
+                ('prefix', models.TextField()),
+                ('batch_size', models.PositiveIntegerField()),
+                ('pause', models.FloatField(default=0)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('completed', 'Completed'), ('cancelled', 'Cancelled'), ('failed', 'Failed')], default='running', max_length=20)),
+                ('cancel_requested', models.BooleanField(default=False)),
+                ('deleted', models.BigIntegerField(default=0)),
+                ('batches', models.PositiveIntegerField(default=0)),
+                ('revision', models.BigIntegerField(default=0)),
+                ('last_key', models.TextField(blank=True)),
+                ('error_message', models.TextField(blank=True)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('cluster', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='prefix_delete_jobs', to='clusters.cluster')),
+                ('started_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+    ]
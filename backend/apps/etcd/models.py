@@ -1,5 +1,176 @@
-from django.db import models
+import os
+import uuid
+from datetime import timedelta
 
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import models, transaction
+from django.utils import timezone
 
-# etcd는 외부 서비스이므로 별도 모델 없음
-# 필요시 즐겨찾기, 히스토리 등 추가 가능
+from apps.clusters.models import Cluster
+
+
+# etcd 데이터 자체는 DB 에 저장하지 않고, 여러 worker 가 함께 봐야 하는 작업 상태와 스냅샷 파일 정보만 둔다
+
+def _job_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+class PrefixDeleteJob(models.Model):
+    """batch 단위 prefix 삭제 작업 (진행 상황, 취소 요청, 이력)
+
+    스트리밍 응답을 보내는 worker 와 취소 / 조회 요청을 받는 worker 가 다를 수
+    있으므로 상태를 DB 에 둔다.
+    """
+
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('cancelled', 'Cancelled'),
+        ('failed', 'Failed'),
+    ]
+
+    # 이 시간 동안 진행이 없는 running 작업은 worker 가 죽은 것으로 보고 겹침 검사에서 제외
+    STALE_AFTER = timedelta(minutes=5)
+
+    id = models.CharField(primary_key=True, max_length=32, default=_job_id, editable=False)
+    cluster = models.ForeignKey(
+        Cluster, on_delete=models.CASCADE, related_name='prefix_delete_jobs'
+    )
+    prefix = models.TextField()
+    batch_size = models.PositiveIntegerField()
+    pause = models.FloatField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
+    cancel_requested = models.BooleanField(default=False)
+    deleted = models.BigIntegerField(default=0)
+    batches = models.PositiveIntegerField(default=0)
+    revision = models.BigIntegerField(default=0)
+    last_key = models.TextField(blank=True)
+    error_message = models.TextField(blank=True)
+    started_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True
+    )
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f'{self.cluster_id}:{self.prefix} ({self.status})'
+
+    @classmethod
+    async def aoverlapping(cls, cluster_id: int, prefix: str):
+        """같은 클러스터에서 prefix 범위가 겹치는 진행 중 작업 (없으면 None)"""
+        running = cls.objects.filter(
+            cluster_id=cluster_id,
+            status='running',
+            updated_at__gte=timezone.now() - cls.STALE_AFTER
+        )
+        async for job in running:
+            if job.prefix.startswith(prefix) or prefix.startswith(job.prefix):
+                return job
+        return None
+
+    def progress(self) -> dict:
+        return {
+            'job_id': self.id,
+            'prefix': self.prefix,
+            'status': self.status,
+            'batch_size': self.batch_size,
+            'pause': self.pause,
+            'deleted': self.deleted,
+            'batches': self.batches,
+            'revision': self.revision,
+            'last_key': self.last_key or None,
+            'cancelled': self.status == 'cancelled' or self.cancel_requested,
+            'error': self.error_message or None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class EtcdSnapshot(models.Model):
+    """etcd 스냅샷 백업 (파일은 ETCD_SNAPSHOT_DIR 아래 클러스터별 디렉터리에 저장)"""
+
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    # 이 시간 동안 진행이 없는 running 스냅샷은 worker 가 죽은 것으로 본다
+    STALE_AFTER = timedelta(minutes=5)
+
+    cluster = models.ForeignKey(
+        Cluster, on_delete=models.CASCADE, related_name='snapshots'
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
+    size = models.BigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, blank=True)
+    # etcd 가 스냅샷 끝에 붙인 sha256 과 일치했는지 (붙어 있지 않으면 None)
+    etcd_checksum = models.BooleanField(null=True)
+    revision = models.BigIntegerField(default=0)
+    keys = models.BigIntegerField(default=0)
+    error_message = models.TextField(blank=True)
+    created_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f'{self.cluster_id}:{self.pk} ({self.status})'
+
+    @property
+    def path(self) -> str:
+        return os.path.join(settings.ETCD_SNAPSHOT_DIR, str(self.cluster_id), f'snapshot-{self.pk}.db')
+
+    def remove_file(self) -> None:
+        for path in (self.path, self.path + '.part'):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    @classmethod
+    def running(cls, cluster_id: int):
+        """같은 클러스터에서 진행 중인 스냅샷 (없으면 None)"""
+        return cls.objects.filter(
+            cluster_id=cluster_id,
+            status='running',
+            updated_at__gte=timezone.now() - cls.STALE_AFTER
+        ).first()
+
+    @classmethod
+    def start(cls, cluster_id: int, user):
+        """진행 중인 스냅샷이 없을 때만 새로 만든다 (새 스냅샷, 진행 중인 스냅샷)
+
+        클러스터 row 를 잠근 채 확인과 생성을 한 transaction 에서 해 동시 요청이
+        둘 다 저장을 시작하지 못하게 한다 (PostgreSQL 의 SELECT ... FOR UPDATE).
+        """
+        with transaction.atomic():
+            Cluster.objects.select_for_update().get(pk=cluster_id)
+            running = cls.running(cluster_id)
+            if running is not None:
+                return None, running
+            return cls.objects.create(cluster_id=cluster_id, created_by=user), None
+
+    def summary(self) -> dict:
+        return {
+            'id': self.pk,
+            'status': self.status,
+            'size': self.size,
+            'sha256': self.sha256 or None,
+            'etcd_checksum': self.etcd_checksum,
+            'revision': self.revision,
+            'keys': self.keys,
+            'error': self.error_message or None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
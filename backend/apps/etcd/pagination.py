@@ -0,0 +1,32 @@
+import base64
+import binascii
+import json
+from typing import Tuple
+
+
+class InvalidCursor(ValueError):
+    """잘못된 continuation token"""
+
+
+def encode_cursor(last_key: bytes, revision: int) -> str:
+    """마지막으로 반환한 키와 조회 revision 을 opaque token 으로 인코딩"""
+    payload = json.dumps({
+        'k': base64.b64encode(last_key).decode(),
+        'r': revision,
+    }, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: str) -> Tuple[bytes, int]:
+    """token 을 (last_key, revision) 으로 복원"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_key = base64.b64decode(payload['k'])
+        revision = int(payload['r'])
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise InvalidCursor('Invalid cursor')
+
+    if revision <= 0:
+        raise InvalidCursor('Invalid cursor')
+    return last_key, revision
@@ -0,0 +1,166 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from apps.clusters.models import Cluster
+from .services import EtcdService, SnapshotService
+
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[int, Optional[str]]
+
+
+class EtcdServicePool:
+    """클러스터별 EtcdService 재사용 풀 (LRU + TTL, thread-safe)
+
+    키는 (cluster.id, cluster.updated_at) 이므로 클러스터가 수정되면
+    이전 엔트리는 더 이상 조회되지 않는다. ``acquire()`` 로 빌린 서비스는
+    ``release()`` 로 돌려줘야 하며, LRU / TTL / invalidate 로 제거된 서비스는 빌려 간
+    요청이 모두 돌려준 뒤에 풀의 lock 밖에서 ``close()`` 해 exec 세션, port-forward,
+    그 서비스에 묶인 키 인덱스 / watch 스레드를 정리한다.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 32,
+        ttl: float = 300.0,
+        factory: Callable[[Cluster], EtcdService] = EtcdService
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.factory = factory
+        self._entries: 'OrderedDict[PoolKey, Tuple[EtcdService, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks = {}
+        # 빌려 간 수, 풀에서 제거됐지만 아직 빌려 간 요청이 있어 닫지 않은 서비스
+        self._leases: Dict[EtcdService, int] = {}
+        self._retired = set()
+
+    @staticmethod
+    def make_key(cluster: Cluster) -> PoolKey:
+        updated_at = cluster.updated_at.isoformat() if cluster.updated_at else None
+        return (cluster.pk, updated_at)
+
+    def acquire(self, cluster: Cluster) -> EtcdService:
+        """풀에서 서비스를 빌리거나 새로 생성 (다 쓰면 ``release()``)"""
+        key = self.make_key(cluster)
+
+        service = self._lookup(key)
+        if service is not None:
+            return service
+
+        # 같은 클러스터에 대한 동시 생성은 한 번만 수행
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        with build_lock:
+            service = self._lookup(key)
+            if service is not None:
+                return service
+
+            try:
+                service = self.factory(cluster)
+                with self._lock:
+                    removed = self._drop_cluster(cluster.pk)
+                    self._entries[key] = (service, time.monotonic())
+                    self._leases[service] = 1
+                    removed += self._evict()
+                    closing = self._retire(removed)
+            finally:
+                with self._lock:
+                    self._build_locks.pop(key, None)
+            self._close(closing)
+            return service
+
+    def release(self, service: EtcdService) -> None:
+        """빌린 서비스 반납, 풀에서 제거된 서비스면 마지막 반납 때 닫는다"""
+        with self._lock:
+            count = self._leases.get(service, 0) - 1
+            if count > 0:
+                self._leases[service] = count
+                return
+            self._leases.pop(service, None)
+            if service not in self._retired:
+                return
+            self._retired.discard(service)
+        self._close([service])
+
+    def invalidate(self, cluster_id: int) -> None:
+        """해당 클러스터의 모든 엔트리 제거"""
+        with self._lock:
+            closing = self._retire(self._drop_cluster(cluster_id))
+        self._close(closing)
+
+    def clear(self) -> None:
+        with self._lock:
+            removed = [service for service, _ in self._entries.values()]
+            self._entries.clear()
+            closing = self._retire(removed)
+        self._close(closing)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _lookup(self, key: PoolKey) -> Optional[EtcdService]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            service, created = entry
+            if not self.ttl or time.monotonic() - created <= self.ttl:
+                self._entries.move_to_end(key)
+                self._leases[service] = self._leases.get(service, 0) + 1
+                return service
+            del self._entries[key]
+            closing = self._retire([service])
+
+        self._close(closing)
+        return None
+
+    def _drop_cluster(self, cluster_id: int) -> List[EtcdService]:
+        keys = [k for k in self._entries if k[0] == cluster_id]
+        return [self._entries.pop(key)[0] for key in keys]
+
+    def _evict(self) -> List[EtcdService]:
+        removed = []
+        while len(self._entries) > self.max_size:
+            removed.append(self._entries.popitem(last=False)[1][0])
+        return removed
+
+    def _retire(self, services: List[EtcdService]) -> List[EtcdService]:
+        """풀에서 제거한 서비스 중 지금 닫을 것, 빌려 간 요청이 있으면 반납 때 닫는다"""
+        closing = []
+        for service in services:
+            if self._leases.get(service):
+                self._retired.add(service)
+            else:
+                closing.append(service)
+        return closing
+
+    @staticmethod
+    def _close(services: List[EtcdService]) -> None:
+        for service in services:
+            try:
+                service.close()
+            except Exception as e:
+                logger.warning('failed to close etcd service for cluster %s: %s', service.cluster.pk, e)
+
+
+service_pool = EtcdServicePool(
+    max_size=getattr(settings, 'ETCD_SERVICE_POOL_SIZE', 32),
+    ttl=getattr(settings, 'ETCD_SERVICE_POOL_TTL', 300),
+)
+
+# 스냅샷은 열 때 키 인덱스를 만들므로 연 것을 재사용한다 (키는 (snapshot.id, snapshot.updated_at))
+snapshot_pool = EtcdServicePool(
+    max_size=getattr(settings, 'ETCD_SNAPSHOT_OPEN_MAX', 4),
+    ttl=getattr(settings, 'ETCD_SNAPSHOT_OPEN_TTL', 1800),
+    factory=SnapshotService,
+)
@@ -0,0 +1,103 @@
+import fnmatch
+import re
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+
+SEARCH_MODES = ('glob', 'regex')
+
+GLOB_SPECIAL = '*?['
+
+SNIPPET_CONTEXT = 40
+
+# 사용자 regex 는 backtracking 엔진으로 실행되므로 길이와 구조를 제한 (ReDoS 방지)
+MAX_PATTERN_LENGTH = 256
+
+REPEAT_OPS = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT)
+
+
+class InvalidPattern(ValueError):
+    """검색 패턴을 컴파일할 수 없음"""
+
+
+def compile_key_matcher(pattern: str, mode: str = 'glob', ignore_case: bool = False) -> Optional[Callable[[str], Any]]:
+    """키 이름 matcher (패턴이 없으면 None)
+
+    glob 은 키 전체와 일치해야 하고 (``*`` 는 ``/`` 도 포함), regex 는 키의 일부와 일치하면 된다.
+    regex 는 ``(a+)+`` / ``(a|aa)*`` 처럼 반복 안에 반복이나 alternation 이 있는 패턴을 거절한다.
+    """
+    if not pattern:
+        return None
+    if mode not in SEARCH_MODES:
+        raise InvalidPattern(f'Unsupported search mode: {mode}')
+    if len(pattern) > MAX_PATTERN_LENGTH:
+        raise InvalidPattern(f'Pattern is too long (max {MAX_PATTERN_LENGTH} characters)')
+
+    flags = re.IGNORECASE if ignore_case else 0
+    try:
+        if mode == 'glob':
+            return re.compile(fnmatch.translate(pattern), flags).match
+        if _has_ambiguous_repeat(sre_parse.parse(pattern, flags)):
+            raise InvalidPattern(
+                'Quantifiers or alternation inside a repeated group, such as (a+)+ or (a|aa)*, are not allowed'
+            )
+        return re.compile(pattern, flags).search
+    except re.error as e:
+        raise InvalidPattern(f'Invalid pattern: {e}')
+
+
+def _has_ambiguous_repeat(items, in_repeat: bool = False) -> bool:
+    """여러 번 반복되는 그룹 안에 다시 반복(``?`` 포함)이나 alternation 이 있는지
+
+    같은 입력을 여러 방식으로 나눠 맞출 수 있어 backtracking 이 지수적으로 늘어나는
+    구조다. 한 글자짜리 alternation(``a|b``)은 문자 집합으로 바뀌므로 허용된다.
+    """
+    for op, av in items:
+        if in_repeat and (op in REPEAT_OPS or op is sre_parse.BRANCH):
+            return True
+        if op in REPEAT_OPS:
+            _, max_count, sub = av
+            if max_count > 1:
+                if _has_ambiguous_repeat(sub, True):
+                    return True
+                continue
+        for arg in av if isinstance(av, (tuple, list)) else ():
+            subs = arg if isinstance(arg, list) else [arg]
+            for sub in subs:
+                if isinstance(sub, sre_parse.SubPattern) and _has_ambiguous_repeat(sub, in_repeat):
+                    return True
+    return False
+
+
+def narrow_prefix(prefix: str, pattern: str, mode: str = 'glob', ignore_case: bool = False) -> Optional[str]:
+    """scan 할 prefix 범위 (glob 의 고정된 앞부분이 더 길면 그만큼 좁힘, 겹치지 않으면 None)"""
+    if mode != 'glob' or ignore_case or not pattern:
+        return prefix
+    literal = pattern
+    for i, ch in enumerate(pattern):
+        if ch in GLOB_SPECIAL:
+            literal = pattern[:i]
+            break
+    if literal.startswith(prefix):
+        return literal
+    if prefix.startswith(literal):
+        return prefix
+    return None
+
+
+def find_value(value: bytes, needle: bytes, ignore_case: bool = False) -> Optional[Dict[str, Any]]:
+    """값에서 needle 을 찾아 위치와 앞뒤 일부를 반환 (없으면 None)"""
+    haystack = value.lower() if ignore_case else value
+    offset = haystack.find(needle.lower() if ignore_case else needle)
+    if offset < 0:
+        return None
+    start = max(0, offset - SNIPPET_CONTEXT)
+    end = offset + len(needle) + SNIPPET_CONTEXT
+    return {
+        'offset': offset,
+        'snippet': value[start:end].decode('utf-8', 'replace'),
+    }
@@ -1,20 +1,174 @@
+import base64
+import binascii
+
 from rest_framework import serializers
 
+from .pagination import decode_cursor, InvalidCursor
+from .search import SEARCH_MODES, compile_key_matcher, InvalidPattern
+from .transfer import COMPRESSIONS, check_compression
+
 
 class KeyListRequestSerializer(serializers.Serializer):
     prefix = serializers.CharField(default='/', required=False)
     keys_only = serializers.BooleanField(default=True, required=False)
     limit = serializers.IntegerField(default=100, min_value=1, max_value=1000, required=False)
+    cursor = serializers.CharField(required=False, allow_blank=True)
+
+    def validate_cursor(self, value):
+        if value:
+            try:
+                decode_cursor(value)
+            except InvalidCursor as e:
+                raise serializers.ValidationError(str(e))
+        return value or None
+
+
+class KeyTreeRequestSerializer(KeyListRequestSerializer):
+    keys_only = None
+    limit = serializers.IntegerField(default=500, min_value=1, max_value=5000, required=False)
+
+
+class KeyChildrenRequestSerializer(serializers.Serializer):
+    path = serializers.CharField(default='/', required=False)
+    limit = serializers.IntegerField(default=500, min_value=1, max_value=5000, required=False)
+    cursor = serializers.CharField(required=False, allow_blank=True)
+
+    def validate_cursor(self, value):
+        if value:
+            try:
+                decode_cursor(value)
+            except InvalidCursor as e:
+                raise serializers.ValidationError(str(e))
+        return value or None
+
+
+class KeyWatchRequestSerializer(serializers.Serializer):
+    prefix = serializers.CharField(default='/', required=False)
+
+
+class KeySearchRequestSerializer(serializers.Serializer):
+    prefix = serializers.CharField(default='/', required=False)
+    pattern = serializers.CharField(required=False, allow_blank=True, default='')
+    mode = serializers.ChoiceField(choices=SEARCH_MODES, default='glob', required=False)
+    value = serializers.CharField(required=False, allow_blank=True, default='', trim_whitespace=False)
+    ignore_case = serializers.BooleanField(default=False, required=False)
+    limit = serializers.IntegerField(default=100, min_value=1, max_value=10000, required=False)
+    time_budget = serializers.FloatField(min_value=0.1, max_value=60, required=False)
+
+    def validate(self, attrs):
+        if not attrs['pattern'] and not attrs['value']:
+            raise serializers.ValidationError('pattern or value is required')
+        try:
+            compile_key_matcher(attrs['pattern'], attrs['mode'], attrs['ignore_case'])
+        except InvalidPattern as e:
+            raise serializers.ValidationError({'pattern': str(e)})
+        return attrs
+
+
+class KeyspaceStatsRequestSerializer(serializers.Serializer):
+    prefix = serializers.CharField(default='/', required=False)
+    depth = serializers.IntegerField(default=1, min_value=1, max_value=8, required=False)
+    top = serializers.IntegerField(default=10, min_value=1, max_value=100, required=False)
+    refresh = serializers.BooleanField(default=False, required=False)
+
+
+class KeyValueRequestSerializer(serializers.Serializer):
+    key = serializers.CharField()
+    decode = serializers.BooleanField(default=False, required=False)
+    revision = serializers.IntegerField(default=0, min_value=0, required=False)
+
+
+class KeyHistoryRequestSerializer(serializers.Serializer):
+    key = serializers.CharField()
+    limit = serializers.IntegerField(default=50, min_value=1, max_value=1000, required=False)
+    before = serializers.IntegerField(default=0, min_value=0, required=False)
+    include_values = serializers.BooleanField(default=False, required=False)
+
+
+class KeyDiffRequestSerializer(serializers.Serializer):
+    key = serializers.CharField()
+    from_revision = serializers.IntegerField(min_value=1)
+    to_revision = serializers.IntegerField(default=0, min_value=0, required=False)
+
+    def validate(self, attrs):
+        if attrs['to_revision'] and attrs['to_revision'] <= attrs['from_revision']:
+            raise serializers.ValidationError('to_revision must be greater than from_revision')
+        return attrs
 
 
 class KeyValueSerializer(serializers.Serializer):
+    ENCODING_CHOICES = ['utf-8', 'base64']
+
     key = serializers.CharField()
-    value = serializers.CharField(required=False, allow_blank=True)
+    value = serializers.CharField(required=False, allow_blank=True, trim_whitespace=False)
+    encoding = serializers.ChoiceField(choices=ENCODING_CHOICES, default='utf-8', required=False)
+    expected_mod_revision = serializers.IntegerField(min_value=0, required=False, allow_null=True)
+
+    def validate(self, attrs):
+        if attrs.get('encoding') == 'base64':
+            try:
+                base64.b64decode(attrs.get('value', ''), validate=True)
+            except binascii.Error:
+                raise serializers.ValidationError({'value': 'Invalid base64'})
+        return attrs
 
 
 class KeyDeleteSerializer(serializers.Serializer):
     key = serializers.CharField()
     prefix = serializers.BooleanField(default=False, required=False)
+    expected_mod_revision = serializers.IntegerField(min_value=0, required=False, allow_null=True)
+
+    def validate(self, attrs):
+        if attrs.get('prefix') and attrs.get('expected_mod_revision') is not None:
+            raise serializers.ValidationError('expected_mod_revision is not allowed for prefix delete')
+        return attrs
+
+
+class PrefixDeleteRequestSerializer(serializers.Serializer):
+    prefix = serializers.CharField()
+    dry_run = serializers.BooleanField(default=False, required=False)
+    batch_size = serializers.IntegerField(min_value=1, max_value=10000, required=False)
+    pause = serializers.FloatField(min_value=0, max_value=60, required=False)
+
+
+class BatchOperationSerializer(serializers.Serializer):
+    OP_CHOICES = ['get', 'put', 'delete']
+
+    op = serializers.ChoiceField(choices=OP_CHOICES)
+    key = serializers.CharField()
+    value = serializers.CharField(required=False, allow_blank=True)
+    prefix = serializers.BooleanField(default=False, required=False)
+
+    def validate(self, attrs):
+        if attrs['op'] == 'put' and attrs.get('prefix'):
+            raise serializers.ValidationError('prefix is not allowed for put')
+        return attrs
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    operations = BatchOperationSerializer(many=True, allow_empty=False, max_length=128)
+
+
+class CompressionField(serializers.ChoiceField):
+    def __init__(self, **kwargs):
+        super().__init__(choices=COMPRESSIONS, default='none', required=False, **kwargs)
+
+    def to_internal_value(self, data):
+        value = super().to_internal_value(data)
+        try:
+            check_compression(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        return value
+
+
+class ExportRequestSerializer(serializers.Serializer):
+    prefix = serializers.CharField(default='/', required=False)
+    compression = CompressionField()
+
+
+class ImportRequestSerializer(serializers.Serializer):
+    compression = CompressionField()
 
 
 class EtcdResponseSerializer(serializers.Serializer):
@@ -26,6 +180,9 @@ class EtcdResponseSerializer(serializers.Serializer):
         required=False
     )
     count = serializers.IntegerField(required=False)
+    revision = serializers.IntegerField(required=False)
+    has_more = serializers.BooleanField(required=False)
+    next_cursor = serializers.CharField(required=False, allow_null=True)
 
 
 class TreeNodeSerializer(serializers.Serializer):
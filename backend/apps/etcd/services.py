@@ -1,189 +1,1039 @@
-import tempfile
-import os
-import subprocess
+import base64
+import contextvars
 import json
-from typing import Optional, List, Dict, Any
-from kubernetes import client, config
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Tuple
+from django.conf import settings
+
 from apps.clusters.models import Cluster
+from .backends import (
+    BaseEtcdBackend,
+    ExecBackend,
+    GatewayBackend,
+    EtcdBackendError,
+    EtcdBackendUnavailable,
+    WatchStream,
+    prefix_range_end,
+)
+from .index import KeyIndex, key_indexes
+from .metrics import record_timeout
+from .content import to_text, sniff_content_type, decode_value, DecodeError
+from .pagination import encode_cursor, decode_cursor, InvalidCursor
+from .search import compile_key_matcher, narrow_prefix, find_value, InvalidPattern
+from .stats import KeyspaceStats
+from .watch import watch_hub
+from .history import replay_watch, diff_values
+from .transfer import encode_record, decode_record, InvalidRecord
+from .snapshot import SnapshotBackend, SnapshotWriter
+
+
+# health/status/members 같은 조회를 동시에 실행하기 위한 공용 스레드 풀
+_probe_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'ETCD_PROBE_WORKERS', 16),
+    thread_name_prefix='etcd-probe'
+)
 
 
 class EtcdService:
-    """K8s API를 통한 etcd 접근 서비스"""
+    """K8s API를 통한 etcd 접근 서비스
+
+    실제 etcd 호출은 클러스터에 설정된 backend(exec / gateway)가 담당하며,
+    gateway 에 접속할 수 없으면 exec backend 로 fallback 한다.
+    """
 
     def __init__(self, cluster: Cluster):
         self.cluster = cluster
-        self._setup_k8s_client()
+        self.exec_backend = ExecBackend(cluster)
+        self.backend: BaseEtcdBackend = self.exec_backend
+
+        if cluster.etcd_backend == 'gateway':
+            self.backend = GatewayBackend(cluster, self.exec_backend)
+
+    def _call(self, method: str, *args, **kwargs):
+        """backend 호출 (gateway 접속 실패 시 exec backend 로 재시도)"""
+        try:
+            return getattr(self.backend, method)(*args, **kwargs)
+        except EtcdBackendUnavailable:
+            if self.backend is self.exec_backend:
+                raise
+            return getattr(self.exec_backend, method)(*args, **kwargs)
+
+    def scan(
+        self,
+        prefix: bytes,
+        keys_only: bool = False,
+        batch_size: int = 1000,
+        revision: int = 0
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """prefix 범위를 고정 revision 으로 batch 단위 순회하며 (revision, kvs) 를 yield
+
+        첫 batch 는 비어 있어도 yield 하므로 빈 범위의 revision 도 알 수 있다.
+        실패 시 ``EtcdBackendError`` 를 발생시킨다.
+        """
+        end = prefix_range_end(prefix)
+        start = prefix
+        last_key = None
+
+        while True:
+            resp = self._call(
+                'range',
+                start,
+                end,
+                limit=batch_size + (1 if last_key is not None else 0),
+                revision=revision,
+                keys_only=keys_only
+            )
+            revision = revision or resp['header']['revision']
+            kvs = resp['kvs']
+            if last_key is not None and kvs and kvs[0]['key'] == last_key:
+                kvs = kvs[1:]
+            if kvs or last_key is None:
+                yield revision, kvs
+            if not resp['more'] or not kvs:
+                return
+            start = last_key = kvs[-1]['key']
+
+    def get_revision(self, prefix: bytes = b'/') -> int:
+        """현재 store revision (count-only range 의 header)"""
+        resp = self._call('range', prefix, prefix_range_end(prefix), count_only=True)
+        return resp['header']['revision']
+
+    def watch(self, prefix: bytes, start_revision: int = 0) -> WatchStream:
+        """prefix 변경 이벤트 스트림"""
+        return self._call('watch', prefix, prefix_range_end(prefix), start_revision)
 
-    def _setup_k8s_client(self):
-        """K8s 클라이언트 설정"""
-        kubeconfig_content = self.cluster.get_kubeconfig()
+    def _key_index(self, prefix: bytes) -> Optional[KeyIndex]:
+        """prefix 범위를 담은 준비된 키 인덱스
 
-        with tempfile.NamedTemporaryFile(
-            mode='w', suffix='.yaml', delete=False
-        ) as f:
-            f.write(kubeconfig_content)
-            self.kubeconfig_path = f.name
+        ETCD_KEY_INDEX_ENABLED 가 꺼져 있거나, 준비 중이거나, 인덱스가 prefix 범위를
+        담고 있지 않으면(예: ``/`` 밖의 키) None 을 돌려주고 etcd 에서 읽는다.
+        """
+        index = key_indexes.get(self)
+        return index if index is not None and index.covers(prefix) else None
 
-        config.load_kube_config(config_file=self.kubeconfig_path)
-        self.core_api = client.CoreV1Api()
+    @staticmethod
+    def _serializable(revision: int) -> bool:
+        """목록/트리 조회에 serializable read 를 쓸지 여부
 
-    def _cleanup(self):
-        """임시 파일 정리"""
-        if hasattr(self, 'kubeconfig_path') and os.path.exists(self.kubeconfig_path):
-            os.unlink(self.kubeconfig_path)
+        serializable read 는 요청받은 멤버가 leader 확인 없이 응답하므로 빠르지만
+        조금 뒤처질 수 있다. revision 이 고정된 다음 페이지는 뒤처진 멤버에서
+        future revision 오류가 날 수 있어 linearizable 로 읽는다.
+        """
+        return getattr(settings, 'ETCD_SERIALIZABLE_READS', False) and not revision
 
-    def _exec_etcdctl(
+    @staticmethod
+    def _encode(key: str) -> bytes:
+        return key.encode('utf-8', 'surrogateescape')
+
+    @staticmethod
+    def _decode(data: bytes) -> str:
+        return data.decode('utf-8', 'replace')
+
+    def get_keys(
         self,
-        command: List[str],
-        namespace: str = 'kube-system',
-        pod_name: Optional[str] = None
+        prefix: str = '/',
+        keys_only: bool = True,
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
-        """etcd pod에서 etcdctl 명령 실행"""
-        try:
-            if not pod_name:
-                pod_name = self._find_etcd_pod(namespace)
-
-            etcdctl_cmd = [
-                'etcdctl',
-                '--endpoints=https://127.0.0.1:2379',
-                '--cacert=/etc/kubernetes/pki/etcd/ca.crt',
-                '--cert=/etc/kubernetes/pki/etcd/server.crt',
-                '--key=/etc/kubernetes/pki/etcd/server.key',
-            ] + command
-
-            exec_command = [
-                'kubectl',
-                '--kubeconfig', self.kubeconfig_path,
-                'exec', '-n', namespace, pod_name, '--',
-            ] + etcdctl_cmd
-
-            result = subprocess.run(
-                exec_command,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+        """키 목록 조회
 
-            if result.returncode != 0:
-                return {
-                    'success': False,
-                    'error': result.stderr or 'Command failed'
-                }
+        ``cursor`` 가 주어지면 이전 페이지의 마지막 키 다음부터, 첫 페이지를 읽은
+        revision 기준으로 조회하므로 페이지 간 결과가 일관된다.
+        """
+        prefix_bytes = self._encode(prefix)
+        start = prefix_bytes
+        revision = 0
+        last_key = None
 
+        if cursor:
+            try:
+                last_key, revision = decode_cursor(cursor)
+            except InvalidCursor as e:
+                return {'success': False, 'error': str(e)}
+            if not last_key.startswith(prefix_bytes):
+                return {'success': False, 'error': 'Cursor does not match prefix'}
+            # etcdctl 인자로 NUL 을 넘길 수 없으므로 last_key 부터 한 개 더 읽고 건너뛴다
+            start = last_key
+
+        index = self._key_index(prefix_bytes) if keys_only else None
+        if index is not None and revision in (0, index.revision):
+            keys, has_more, revision = index.range(
+                last_key + b'\0' if last_key is not None else start,
+                prefix_range_end(prefix_bytes),
+                limit
+            )
             return {
                 'success': True,
-                'data': result.stdout
+                'keys': [self._decode(k) for k in keys],
+                'count': len(keys),
+                'revision': revision,
+                'has_more': has_more,
+                'next_cursor': encode_cursor(keys[-1], revision) if has_more and keys else None,
+                'source': 'index',
             }
-        except subprocess.TimeoutExpired:
-            return {'success': False, 'error': 'Command timeout'}
-        except Exception as e:
+
+        try:
+            resp = self._call(
+                'range',
+                start,
+                prefix_range_end(prefix_bytes),
+                limit=limit + 1 if last_key is not None else limit,
+                revision=revision,
+                keys_only=keys_only,
+                serializable=self._serializable(revision)
+            )
+        except EtcdBackendError as e:
             return {'success': False, 'error': str(e)}
 
-    def _find_etcd_pod(self, namespace: str = 'kube-system') -> str:
-        """etcd pod 찾기"""
-        pods = self.core_api.list_namespaced_pod(
-            namespace=namespace,
-            label_selector='component=etcd'
-        )
+        kvs = resp['kvs']
+        has_more = resp['more']
+        if last_key is not None and kvs and kvs[0]['key'] == last_key:
+            kvs = kvs[1:]
+        if len(kvs) > limit:
+            kvs = kvs[:limit]
+            has_more = True
 
-        if not pods.items:
-            pods = self.core_api.list_namespaced_pod(
-                namespace=namespace,
-                label_selector='tier=control-plane'
-            )
-            for pod in pods.items:
-                if 'etcd' in pod.metadata.name:
-                    return pod.metadata.name
+        revision = revision or resp['header']['revision']
+        keys = [self._decode(kv['key']) for kv in kvs]
+        result = {
+            'success': True,
+            'keys': keys,
+            'count': len(keys),
+            'revision': revision,
+            'has_more': has_more,
+            'next_cursor': encode_cursor(kvs[-1]['key'], revision) if has_more and kvs else None,
+            'source': 'etcd',
+        }
+        if not keys_only:
+            result['values'] = [self._decode(kv['value']) for kv in kvs]
+        return result
 
-            raise Exception('No etcd pod found')
+    def list_children(
+        self,
+        path: str = '/',
+        limit: int = 500,
+        cursor: Optional[str] = None,
+        batch_size: int = 500
+    ) -> Dict[str, Any]:
+        """path 바로 아래 자식(디렉터리/키)만 조회
 
-        return pods.items[0].metadata.name
+        keys-only range 를 batch 단위로 읽다가 하위 디렉터리 안으로 들어가면
+        해당 디렉터리의 range_end 로 건너뛰므로, 비용은 전체 키 수가 아니라
+        자식 수에 비례한다. 건너뛴 디렉터리의 ``count`` 는 하한값(approximate)이다.
+        """
+        prefix = path.rstrip('/') + '/'
+        prefix_bytes = self._encode(prefix)
+        end = prefix_range_end(prefix_bytes)
+        start = prefix_bytes
+        skip_key = None
+        revision = 0
 
-    def get_keys(
+        if cursor:
+            try:
+                last_key, revision = decode_cursor(cursor)
+            except InvalidCursor as e:
+                return {'success': False, 'error': str(e)}
+            if not last_key.startswith(prefix_bytes):
+                return {'success': False, 'error': 'Cursor does not match path'}
+            if last_key.endswith(b'/'):
+                start = prefix_range_end(last_key)
+            else:
+                start = skip_key = last_key
+
+        index = self._key_index(prefix_bytes)
+        if index is not None and revision in (0, index.revision):
+            if skip_key is not None:
+                start = skip_key + b'\0'
+            found, has_more, revision = index.children(prefix_bytes, start, limit)
+            items = [
+                {
+                    'name': self._decode(name),
+                    'key': self._decode(prefix_bytes + name),
+                    'is_dir': child['is_dir'],
+                    'count': child['count'],
+                    'approximate': False,
+                }
+                for name, child in found.items()
+            ]
+            return self._children_result(path, items, has_more, revision, source='index')
+
+        children: Dict[bytes, Dict[str, Any]] = {}
+        has_more = False
+
+        while start < end or end == b'\0':
+            try:
+                resp = self._call(
+                    'range',
+                    start,
+                    end,
+                    limit=batch_size + (1 if skip_key is not None else 0),
+                    revision=revision,
+                    keys_only=True,
+                    serializable=self._serializable(revision)
+                )
+            except EtcdBackendError as e:
+                return {'success': False, 'error': str(e)}
+
+            revision = revision or resp['header']['revision']
+            kvs = resp['kvs']
+            if skip_key is not None and kvs and kvs[0]['key'] == skip_key:
+                kvs = kvs[1:]
+            if not kvs:
+                break
+
+            current_dir = None
+            for kv in kvs:
+                name, sep, _ = kv['key'][len(prefix_bytes):].partition(b'/')
+                if name not in children:
+                    if len(children) >= limit:
+                        has_more = True
+                        break
+                    children[name] = {
+                        'name': self._decode(name),
+                        'key': self._decode(prefix_bytes + name),
+                        'is_dir': False,
+                        'count': 0,
+                        'approximate': False,
+                    }
+                child = children[name]
+                if sep:
+                    child['is_dir'] = True
+                    child['count'] += 1
+                    current_dir = name
+                else:
+                    current_dir = None
+
+            if has_more or not resp['more']:
+                break
+
+            if current_dir is not None:
+                # 디렉터리 내부에서 batch 가 끝나면 나머지는 읽지 않고 건너뛴다
+                children[current_dir]['approximate'] = True
+                start = prefix_range_end(prefix_bytes + current_dir + b'/')
+                skip_key = None
+            else:
+                start = skip_key = kvs[-1]['key']
+
+        return self._children_result(path, list(children.values()), has_more, revision)
+
+    def _children_result(
+        self,
+        path: str,
+        items: List[Dict[str, Any]],
+        has_more: bool,
+        revision: int,
+        source: str = 'etcd'
+    ) -> Dict[str, Any]:
+        next_cursor = None
+        if has_more and items:
+            last = items[-1]
+            last_key = self._encode(last['key']) + (b'/' if last['is_dir'] else b'')
+            next_cursor = encode_cursor(last_key, revision)
+
+        return {
+            'success': True,
+            'path': path,
+            'children': items,
+            'count': len(items),
+            'revision': revision,
+            'has_more': has_more,
+            'next_cursor': next_cursor,
+            'source': source,
+        }
+
+    def search_keys(
         self,
         prefix: str = '/',
-        keys_only: bool = True,
-        limit: int = 100
+        pattern: str = '',
+        mode: str = 'glob',
+        value: str = '',
+        ignore_case: bool = False,
+        limit: int = 100,
+        time_budget: float = 10.0,
+        batch_size: int = 1000
     ) -> Dict[str, Any]:
-        """키 목록 조회"""
-        cmd = ['get', prefix, '--prefix']
+        """키 이름(glob/regex)과 값(부분 문자열)으로 prefix 아래를 검색
 
-        if keys_only:
-            cmd.append('--keys-only')
+        prefix 범위를 batch 단위로 읽으면서 일치하는 키를 ``results`` 로 흘려보내고,
+        limit 개를 찾거나 time_budget 을 넘기면 멈춘다. 마지막 항목은 ``type: done``
+        요약이다. 값 조건이 없고 키 인덱스가 준비되어 있으면 etcd 대신 인덱스를 훑는다.
+        """
+        deadline = time.monotonic() + time_budget
+        try:
+            match_key = compile_key_matcher(pattern, mode, ignore_case)
+        except InvalidPattern as e:
+            return {'success': False, 'error': str(e)}
+        needle = self._encode(value) if value else None
 
-        cmd.extend(['--limit', str(limit)])
+        scan_prefix = narrow_prefix(prefix, pattern, mode, ignore_case)
+        index = self._key_index(self._encode(scan_prefix)) if needle is None and scan_prefix is not None else None
+        if scan_prefix is None:
+            # glob 의 고정 앞부분이 prefix 와 겹치지 않으면 키를 읽을 필요가 없다
+            batches = self._empty_batches(self._encode(prefix))
+            source = 'etcd'
+        elif index is not None:
+            batches = self._index_batches(index, self._encode(scan_prefix), batch_size)
+            source = 'index'
+        else:
+            batches = self.scan(self._encode(scan_prefix), keys_only=needle is None, batch_size=batch_size)
+            source = 'etcd'
 
-        result = self._exec_etcdctl(cmd)
+        try:
+            revision, first = next(batches)
+        except EtcdBackendError as e:
+            return {'success': False, 'error': str(e)}
 
-        if result['success']:
-            lines = result['data'].strip().split('\n')
-            keys = [line for line in lines if line]
-            result['keys'] = keys
-            result['count'] = len(keys)
+        def results() -> Iterator[Dict[str, Any]]:
+            matched = scanned = 0
+            reason = 'complete'
+            kvs = first
+            try:
+                while reason == 'complete':
+                    for kv in kvs:
+                        # 느린 패턴이 한 batch 안에서 예산을 넘기지 않도록 키마다 확인
+                        if time.monotonic() > deadline:
+                            reason = 'time_budget'
+                            break
+                        scanned += 1
+                        key = self._decode(kv['key'])
+                        if match_key is not None and not match_key(key):
+                            continue
+                        item = {'type': 'match', 'key': key}
+                        if needle is not None:
+                            found = find_value(kv['value'], needle, ignore_case)
+                            if found is None:
+                                continue
+                            item.update(found, mod_revision=kv['mod_revision'], size=len(kv['value']))
+                        matched += 1
+                        yield item
+                        if matched >= limit:
+                            reason = 'limit'
+                            break
+                    if reason == 'complete' and time.monotonic() > deadline:
+                        reason = 'time_budget'
+                    if reason == 'complete':
+                        _, kvs = next(batches)
+            except StopIteration:
+                pass
+            except EtcdBackendError as e:
+                yield {'type': 'error', 'error': str(e), 'matched': matched, 'scanned': scanned}
+                return
+            yield {
+                'type': 'done',
+                'matched': matched,
+                'scanned': scanned,
+                'revision': revision,
+                'truncated': reason != 'complete',
+                'reason': reason,
+            }
 
-        return result
+        return {'success': True, 'revision': revision, 'source': source, 'results': results()}
 
-    def get_value(self, key: str) -> Dict[str, Any]:
-        """특정 키의 값 조회"""
-        cmd = ['get', key, '--print-value-only']
-        result = self._exec_etcdctl(cmd)
+    def _empty_batches(self, prefix: bytes) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        yield self.get_revision(prefix), []
 
-        if result['success']:
-            result['key'] = key
-            result['value'] = result['data']
+    @staticmethod
+    def _index_batches(index, prefix: bytes, batch_size: int) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """키 인덱스를 scan() 과 같은 (revision, kvs) batch 형태로 순회"""
+        start = prefix
+        end = prefix_range_end(prefix)
+        while True:
+            keys, more, revision = index.range(start, end, batch_size)
+            yield revision, [{'key': key} for key in keys]
+            if not more or not keys:
+                return
+            start = keys[-1] + b'\0'
 
-        return result
+    def keyspace_stats(
+        self,
+        prefix: str = '/',
+        depth: int = 1,
+        top: int = 10,
+        max_groups: int = 1000,
+        batch_size: int = 200
+    ) -> Dict[str, Any]:
+        """prefix 아래 키를 depth 단계 경로별로 묶어 키 수 / 크기 / 크기 분포 / 큰 키 집계
 
-    def put_value(self, key: str, value: str) -> Dict[str, Any]:
-        """키-값 저장"""
-        cmd = ['put', key, value]
-        return self._exec_etcdctl(cmd)
+        값 크기가 필요하므로 값까지 batch 단위로 한 번 순회하며, batch 는 집계 후
+        바로 버려서 메모리는 batch 크기와 그룹 수로 제한된다.
+        """
+        prefix = prefix.rstrip('/') + '/'
+        stats = KeyspaceStats(self._encode(prefix), depth, top, max_groups)
+        revision = 0
+        try:
+            for revision, kvs in self.scan(self._encode(prefix), batch_size=batch_size):
+                for kv in kvs:
+                    stats.add(kv['key'], len(kv['value']))
+        except EtcdBackendError as e:
+            return {'success': False, 'error': str(e)}
 
-    def delete_key(self, key: str, prefix: bool = False) -> Dict[str, Any]:
-        """키 삭제"""
-        cmd = ['del', key]
-        if prefix:
-            cmd.append('--prefix')
-        return self._exec_etcdctl(cmd)
+        return {
+            'success': True,
+            'prefix': prefix,
+            'depth': depth,
+            'revision': revision,
+            'computed_at': time.time(),
+            **stats.result(self._decode),
+        }
 
-    def get_cluster_health(self) -> Dict[str, Any]:
-        """etcd 클러스터 상태 확인"""
-        cmd = ['endpoint', 'health', '--write-out=json']
-        result = self._exec_etcdctl(cmd)
+    def get_value(
+        self,
+        key: str,
+        decode: bool = False,
+        max_decode_size: int = 256 * 1024,
+        revision: int = 0
+    ) -> Dict[str, Any]:
+        """특정 키의 값 조회 (revision 을 주면 그 시점의 값)
 
-        if result['success']:
-            try:
-                result['health'] = json.loads(result['data'])
-            except json.JSONDecodeError:
-                result['health'] = result['data']
+        값은 bytes 로 받아 텍스트(UTF-8)면 그대로, 아니면 base64 로 돌려주며
+        ``encoding`` 과 앞부분만 보고 판별한 ``content_type`` 을 함께 반환한다.
+        ``decode`` 를 요청한 경우에만 max_decode_size 이하의 값을 ``decoded`` 로 변환한다.
+        """
+        try:
+            resp = self._call('range', self._encode(key), revision=revision)
+        except EtcdBackendError as e:
+            return {'success': False, 'error': str(e)}
+
+        kvs = resp['kvs']
+        kv = kvs[0] if kvs else {'value': b'', 'mod_revision': 0, 'version': 0}
+        value = kv['value']
+        text = to_text(value)
+        content_type = sniff_content_type(value, text)
 
+        result = {
+            'success': True,
+            'key': key,
+            'found': bool(kvs),
+            'value': text if text is not None else base64.b64encode(value).decode(),
+            'encoding': 'utf-8' if text is not None else 'base64',
+            'content_type': content_type,
+            'size': len(value),
+            'mod_revision': kv['mod_revision'],
+            'version': kv['version'],
+            'revision': revision or resp['header']['revision'],
+        }
+        if decode:
+            try:
+                result['decoded'] = decode_value(value, content_type, max_decode_size)
+            except DecodeError as e:
+                result['decoded'] = None
+                result['decode_error'] = str(e)
         return result
 
-    def get_cluster_status(self) -> Dict[str, Any]:
-        """etcd 클러스터 상태 상세"""
-        cmd = ['endpoint', 'status', '--write-out=json']
-        result = self._exec_etcdctl(cmd)
+    def key_history(
+        self,
+        key: str,
+        limit: int = 50,
+        before: int = 0,
+        include_values: bool = False,
+        timeout: float = 10.0,
+        idle_timeout: float = 1.0
+    ) -> Dict[str, Any]:
+        """compaction 이후 남아 있는 key 의 변경 이력 (최신순 limit 개, before 미만 revision)
+
+        revision 마다 range 를 호출하지 않고, watch 를 과거 revision 부터 열어 남은
+        이벤트를 한 번에 재생한다. compact 된 revision 에서 시작하면 etcd 가 watch 를
+        취소하며 compact revision 을 알려주므로 그 revision 부터 다시 연다.
+        """
+        key_bytes = self._encode(key)
+        deadline = time.monotonic() + timeout
+        try:
+            current = self._call('range', key_bytes)
+        except EtcdBackendError as e:
+            return {'success': False, 'error': str(e)}
+
+        revision = current['header']['revision']
+        kv = current['kvs'][0] if current['kvs'] else None
+        stop_at = min(before, revision + 1) if before else revision + 1
+        last_mod = kv['mod_revision'] if kv else 0
+        versions: deque = deque(maxlen=limit)
+        seen = 0
+        compact_revision = 0
+        start = 1
+
+        try:
+            while start:
+                watch_start, start = start, 0
+                for resp in replay_watch(self._call('watch', key_bytes, None, watch_start), deadline, idle_timeout):
+                    if resp['compact_revision']:
+                        compact_revision = resp['compact_revision']
+                        # 현재 값이 compact 이전에 쓰였다면 재생할 이벤트가 없다
+                        if compact_revision > watch_start and not (kv and last_mod < compact_revision):
+                            start = compact_revision
+                        break
+                    done = False
+                    for event in resp['events']:
+                        event_revision = event['kv']['mod_revision']
+                        if event_revision >= stop_at:
+                            done = True
+                            break
+                        versions.append(self._history_entry(event['type'], event['kv'], include_values))
+                        seen += 1
+                        if event_revision == last_mod:
+                            done = True
+                            break
+                    if done:
+                        break
+        except EtcdBackendError as e:
+            return {'success': False, 'error': str(e)}
+
+        if kv and last_mod < stop_at and (not versions or versions[-1]['revision'] != last_mod):
+            # 현재 값이 compaction 이전에 쓰였으면 이벤트는 없지만 range 결과로 알 수 있다
+            versions.append(self._history_entry('PUT', kv, include_values))
+            seen += 1
+
+        items = list(reversed(versions))
+        has_more = seen > len(items)
+        return {
+            'success': True,
+            'key': key,
+            'versions': items,
+            'count': len(items),
+            'revision': revision,
+            'compact_revision': compact_revision,
+            'has_more': has_more,
+            'next_before': items[-1]['revision'] if has_more else None,
+            'timed_out': time.monotonic() >= deadline,
+        }
+
+    def _history_entry(self, event_type: str, kv: Dict[str, Any], include_values: bool) -> Dict[str, Any]:
+        entry = {
+            'type': event_type.lower(),
+            'revision': kv['mod_revision'],
+            'create_revision': kv['create_revision'],
+            'version': kv['version'],
+            'size': len(kv['value']),
+        }
+        if include_values and event_type == 'PUT':
+            text = to_text(kv['value'])
+            entry['value'] = text if text is not None else base64.b64encode(kv['value']).decode()
+            entry['encoding'] = 'utf-8' if text is not None else 'base64'
+        return entry
 
-        if result['success']:
+    def diff_revisions(
+        self,
+        key: str,
+        from_revision: int,
+        to_revision: int = 0,
+        max_size: int = 256 * 1024
+    ) -> Dict[str, Any]:
+        """key 의 두 시점 값 diff (to_revision 이 0 이면 현재 값)"""
+        key_bytes = self._encode(key)
+        try:
+            old = self._call('range', key_bytes, revision=from_revision)
+            new = self._call('range', key_bytes, revision=to_revision)
+        except EtcdBackendError as e:
+            return {'success': False, 'error': str(e)}
+
+        to_revision = to_revision or new['header']['revision']
+        old_kv = old['kvs'][0] if old['kvs'] else None
+        new_kv = new['kvs'][0] if new['kvs'] else None
+        result = diff_values(
+            old_kv['value'] if old_kv else b'',
+            new_kv['value'] if new_kv else b'',
+            f'{key}@{from_revision}',
+            f'{key}@{to_revision}',
+            max_size=max_size
+        )
+        return {
+            'success': True,
+            'key': key,
+            'from': {
+                'revision': from_revision,
+                'found': old_kv is not None,
+                'mod_revision': old_kv['mod_revision'] if old_kv else 0,
+            },
+            'to': {
+                'revision': to_revision,
+                'found': new_kv is not None,
+                'mod_revision': new_kv['mod_revision'] if new_kv else 0,
+            },
+            **result,
+        }
+
+    def put_value(
+        self,
+        key: str,
+        value: str,
+        encoding: str = 'utf-8',
+        expected_mod_revision: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """키-값 저장 (encoding 이 base64 면 디코딩한 bytes 를 저장)
+
+        expected_mod_revision 을 주면 현재 mod_revision 이 같을 때만 저장한다
+        (0 은 키가 없을 때만 생성). 다르면 ``conflict`` 와 현재 값을 반환한다.
+        """
+        data = base64.b64decode(value) if encoding == 'base64' else value.encode()
+        key_bytes = self._encode(key)
+        if expected_mod_revision is not None:
+            return self._guarded_write(
+                key_bytes, expected_mod_revision, {'type': 'put', 'key': key_bytes, 'value': data}
+            )
+
+        try:
+            resp = self._call('put', key_bytes, data)
+        except EtcdBackendError as e:
+            return {'success': False, 'error': str(e)}
+
+        return {'success': True, 'revision': resp['header']['revision']}
+
+    def delete_key(
+        self,
+        key: str,
+        prefix: bool = False,
+        expected_mod_revision: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """키 삭제 (expected_mod_revision 은 단일 키 삭제에만 사용)"""
+        key_bytes = self._encode(key)
+        range_end = prefix_range_end(key_bytes) if prefix else None
+        if expected_mod_revision is not None and not prefix:
+            return self._guarded_write(key_bytes, expected_mod_revision, {'type': 'delete', 'key': key_bytes})
+
+        try:
+            resp = self._call('delete_range', key_bytes, range_end)
+        except EtcdBackendError as e:
+            return {'success': False, 'error': str(e)}
+
+        return {
+            'success': True,
+            'deleted': resp['deleted'],
+            'revision': resp['header']['revision'],
+        }
+
+    def estimate_prefix_delete(
+        self,
+        prefix: str,
+        batch_size: int = 500,
+        scan_batch_size: int = 200
+    ) -> Dict[str, Any]:
+        """prefix 삭제 dry-run: 지워질 키 수, 키/값 크기, 삭제 batch 수
+
+        값 크기가 필요하므로 값까지 scan_batch_size 개씩 한 번 순회한다.
+        """
+        count = key_bytes = value_bytes = 0
+        revision = 0
+        try:
+            for revision, kvs in self.scan(self._encode(prefix), batch_size=scan_batch_size):
+                count += len(kvs)
+                for kv in kvs:
+                    key_bytes += len(kv['key'])
+                    value_bytes += len(kv['value'])
+        except EtcdBackendError as e:
+            return {'success': False, 'error': str(e)}
+
+        return {
+            'success': True,
+            'dry_run': True,
+            'prefix': prefix,
+            'count': count,
+            'key_bytes': key_bytes,
+            'value_bytes': value_bytes,
+            'batch_size': batch_size,
+            'batches': -(-count // batch_size),
+            'revision': revision,
+        }
+
+    def delete_prefix_batches(self, prefix: str, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """prefix 아래 키를 batch_size 개씩 나눠 지우며 batch 마다 결과를 yield
+
+        남은 키 중 앞쪽 batch_size 개의 이름만 읽고 그 키 범위만 지우므로 raft
+        proposal 하나가 batch 크기로 제한된다. 범위 끝(마지막 키 + NUL)은 etcdctl
+        인자로 넘길 수 없어 txn 으로 지운다. 실패하면 ``EtcdBackendError``.
+        """
+        start = self._encode(prefix)
+        end = prefix_range_end(start)
+        while True:
+            resp = self._call('range', start, end, limit=batch_size, keys_only=True)
+            kvs = resp['kvs']
+            if not kvs:
+                return
+            # 다음 batch 는 방금 지운 마지막 키부터 읽는다 (이미 지워져 다시 나오지 않음)
+            start = kvs[-1]['key']
+            txn = self._call('txn', [], [{'type': 'delete', 'key': kvs[0]['key'], 'range_end': start + b'\0'}])
+            yield {
+                'deleted': txn['responses'][0].get('deleted', 0),
+                'revision': txn['header']['revision'],
+                'last_key': self._decode(start),
+            }
+            if not resp['more']:
+                return
+
+    def _guarded_write(self, key: bytes, expected_mod_revision: int, op: Dict[str, Any]) -> Dict[str, Any]:
+        """mod_revision compare 와 쓰기를 한 txn 으로 실행 (실패 시 같은 txn 에서 현재 값 조회)"""
+        compare = [{'key': key, 'target': 'MOD', 'result': 'EQUAL', 'value': expected_mod_revision}]
+        try:
+            resp = self._call('txn', compare, [op], [{'type': 'get', 'key': key}])
+        except EtcdBackendError as e:
+            return {'success': False, 'error': str(e)}
+
+        revision = resp['header']['revision']
+        if resp['succeeded']:
+            result = {'success': True, 'revision': revision}
+            if op['type'] == 'delete':
+                result['deleted'] = resp['responses'][0].get('deleted', 0)
+            return result
+
+        kvs = resp['responses'][0].get('kvs', []) if resp['responses'] else []
+        kv = kvs[0] if kvs else {'value': b'', 'mod_revision': 0, 'version': 0}
+        text = to_text(kv['value'])
+        return {
+            'success': False,
+            'conflict': True,
+            'error': (
+                f"Key was modified (expected mod_revision {expected_mod_revision}, "
+                f"current {kv['mod_revision']})"
+            ),
+            'current': {
+                'found': bool(kvs),
+                'value': text if text is not None else base64.b64encode(kv['value']).decode(),
+                'encoding': 'utf-8' if text is not None else 'base64',
+                'mod_revision': kv['mod_revision'],
+                'version': kv['version'],
+            },
+            'revision': revision,
+        }
+
+    def batch(self, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """여러 get/put/delete 를 하나의 etcd 트랜잭션으로 실행
+
+        operations: ``[{'op': 'get'|'put'|'delete', 'key', 'value'?, 'prefix'?}]``
+        모든 연산이 같은 revision 에서 원자적으로 적용되며 결과는 입력 순서를 따른다.
+        """
+        ops = []
+        for item in operations:
+            key = self._encode(item['key'])
+            op = {'type': item['op'], 'key': key}
+            if item['op'] == 'put':
+                op['value'] = item.get('value', '').encode()
+            elif item.get('prefix'):
+                op['range_end'] = prefix_range_end(key)
+            ops.append(op)
+
+        try:
+            resp = self._call('txn', [], ops)
+        except EtcdBackendError as e:
+            return {'success': False, 'error': str(e)}
+
+        results = []
+        for item, op_resp in zip(operations, resp['responses']):
+            result = {'op': item['op'], 'key': item['key']}
+            if item['op'] == 'get':
+                kvs = op_resp.get('kvs', [])
+                if item.get('prefix'):
+                    result['keys'] = [self._decode(kv['key']) for kv in kvs]
+                    result['values'] = [self._decode(kv['value']) for kv in kvs]
+                    result['count'] = len(kvs)
+                else:
+                    result['found'] = bool(kvs)
+                    result['value'] = self._decode(kvs[0]['value']) if kvs else ''
+                    result['mod_revision'] = kvs[0]['mod_revision'] if kvs else 0
+            elif item['op'] == 'delete':
+                result['deleted'] = op_resp.get('deleted', 0)
+            results.append(result)
+
+        return {
+            'success': True,
+            'results': results,
+            'count': len(results),
+            'revision': resp['header']['revision'],
+        }
+
+    def export_prefix(self, prefix: str = '/', batch_size: int = 500) -> Dict[str, Any]:
+        """prefix 아래 키/값을 NDJSON 레코드 스트림으로 export
+
+        첫 batch 는 바로 조회해서 revision 과 오류를 응답 전에 확인하고,
+        나머지는 같은 revision 으로 batch 단위로 읽으면서 ``records`` 로 흘려보낸다.
+        스트림 도중 실패하면 마지막 줄에 ``{"error": ...}`` 를 쓴다.
+        """
+        batches = self.scan(self._encode(prefix), batch_size=batch_size)
+        try:
+            revision, first = next(batches)
+        except EtcdBackendError as e:
+            return {'success': False, 'error': str(e)}
+
+        def records() -> Iterator[bytes]:
+            kvs = first
             try:
-                result['status'] = json.loads(result['data'])
-            except json.JSONDecodeError:
-                result['status'] = result['data']
+                while True:
+                    yield b''.join(encode_record(kv) for kv in kvs)
+                    _, kvs = next(batches)
+            except StopIteration:
+                return
+            except EtcdBackendError as e:
+                yield json.dumps({'error': str(e)}).encode() + b'\n'
 
-        return result
+        return {'success': True, 'revision': revision, 'records': records()}
+
+    def import_records(
+        self,
+        lines: Iterable[Tuple[int, bytes]],
+        batch_ops: int = 128,
+        batch_bytes: int = 1024 * 1024
+    ) -> Dict[str, Any]:
+        """NDJSON 레코드를 최대 batch_ops 개 / batch_bytes 크기의 txn 으로 나눠 put
+
+        batch 단위로만 메모리에 올리며, 실패 시 그때까지 적용된 개수를 함께 반환한다.
+        """
+        imported = 0
+        batches = 0
+        revision = 0
+        ops: List[Dict[str, Any]] = []
+        size = 0
+
+        def flush():
+            nonlocal imported, batches, revision, ops, size
+            if ops:
+                resp = self._call('txn', [], ops)
+                imported += len(ops)
+                batches += 1
+                revision = resp['header']['revision']
+            ops = []
+            size = 0
+
+        try:
+            for line_no, line in lines:
+                try:
+                    key, value = decode_record(line)
+                except InvalidRecord as e:
+                    raise InvalidRecord(f'Line {line_no}: {e}')
+                if ops and (len(ops) >= batch_ops or size + len(key) + len(value) > batch_bytes):
+                    flush()
+                ops.append({'type': 'put', 'key': key, 'value': value})
+                size += len(key) + len(value)
+            flush()
+        except (InvalidRecord, EtcdBackendError, OSError, EOFError) as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'imported': imported,
+                'batches': batches,
+                'revision': revision,
+            }
+
+        return {
+            'success': True,
+            'imported': imported,
+            'batches': batches,
+            'revision': revision,
+        }
+
+    def save_snapshot(
+        self,
+        path: str,
+        timeout: float = 600.0,
+        progress_bytes: int = 8 * 1024 * 1024
+    ) -> Iterator[Dict[str, Any]]:
+        """etcd 스냅샷을 path 에 저장하며 progress_bytes 마다 진행 상황(``size``)을 yield
+
+        backend 가 보내는 chunk 를 바로 파일에 쓰면서 sha256 을 계산하므로 메모리에는
+        chunk 하나만 올라간다. 저장한 파일을 다시 열어 읽을 수 있는지 확인하며, 마지막
+        항목(``done``)에 크기 / sha256 / etcd checksum 확인 결과 / revision / 키 수가 있다.
+        실패하면 ``EtcdBackendError`` (쓰던 임시 파일은 지운다).
+        """
+        chunks = self._call('snapshot', timeout=timeout)
+        writer = SnapshotWriter(path)
+        try:
+            reported = 0
+            for chunk in chunks:
+                writer.write(chunk)
+                if writer.size - reported >= progress_bytes:
+                    reported = writer.size
+                    yield {'done': False, 'size': writer.size}
+            result = writer.finish()
+        finally:
+            chunks.close()
+            writer.abort()
+
+        backend = SnapshotBackend(path)
+        try:
+            result.update(revision=backend.revision, keys=len(backend.keyspace))
+        finally:
+            backend.close()
+        yield {'done': True, **result}
+
+    def get_cluster_health(self) -> Dict[str, Any]:
+        """etcd 클러스터 상태 확인"""
+        try:
+            return {'success': True, 'health': self._call('endpoint_health')}
+        except EtcdBackendError as e:
+            return {'success': False, 'error': str(e)}
+
+    def get_cluster_status(self) -> Dict[str, Any]:
+        """etcd 클러스터 상태 상세"""
+        try:
+            return {'success': True, 'status': self._call('endpoint_status')}
+        except EtcdBackendError as e:
+            return {'success': False, 'error': str(e)}
 
     def get_members(self) -> Dict[str, Any]:
         """etcd 클러스터 멤버 조회"""
-        cmd = ['member', 'list', '--write-out=json']
-        result = self._exec_etcdctl(cmd)
+        try:
+            return {'success': True, 'members': self._call('member_list')}
+        except EtcdBackendError as e:
+            return {'success': False, 'error': str(e)}
+
+    def get_cluster_overview(self, timeout: float = 10.0) -> Dict[str, Any]:
+        """health / status / members 를 동시에 조회
+
+        각 조회는 backend 호출 자체에 timeout 을 넘겨 끝내므로 느린 조회가 probe
+        스레드를 붙잡고 있지 않는다. 실패하거나 timeout 된 항목은 None 으로 두고
+        ``errors`` 에 사유를 남기며, 모두 실패하면 success 는 False 다.
+        """
+        probes = {
+            'health': 'endpoint_health',
+            'status': 'endpoint_status',
+            'members': 'member_list',
+        }
+        # 각 조회가 요청의 Server-Timing 에 기록되도록 context 를 복사해 실행
+        futures = {
+            name: _probe_executor.submit(contextvars.copy_context().run, self._call, method, timeout=timeout)
+            for name, method in probes.items()
+        }
+        # backend 가 timeout 을 지키지 못해도 응답은 기다리지 않는다 (port-forward 시작 등)
+        done, _ = wait(futures.values(), timeout=timeout + 1)
 
-        if result['success']:
+        result: Dict[str, Any] = {'success': False, 'errors': {}}
+        for name, future in futures.items():
+            result[name] = None
+            if future not in done:
+                record_timeout(self.cluster.pk, probes[name])
+                result['errors'][name] = f'Timed out after {timeout:g}s'
+                continue
             try:
-                result['members'] = json.loads(result['data'])
-            except json.JSONDecodeError:
-                result['members'] = result['data']
+                result[name] = future.result()
+            except EtcdBackendError as e:
+                result['errors'][name] = str(e)
 
+        result['success'] = any(result[name] is not None for name in probes)
+        if not result['success']:
+            result['error'] = '; '.join(f'{name}: {error}' for name, error in result['errors'].items())
         return result
 
-    def __del__(self):
-        self._cleanup()
+    def close(self):
+        """backend 연결과 이 서비스로 시작한 키 인덱스 / watch 스레드 정리"""
+        key_indexes.stop(self.cluster.pk, service=self)
+        watch_hub.stop(self.cluster.pk, service=self)
+        if self.backend is not self.exec_backend:
+            self.backend.close()
+        self.exec_backend.close()
+
+
+class SnapshotService(EtcdService):
+    """저장된 스냅샷 파일을 EtcdService 와 같은 조회 메서드로 제공 (읽기 전용)
+
+    파일은 mmap 으로 열고 마지막 revision 의 키 목록만 메모리에 두므로 목록 / 트리 /
+    검색 / 통계가 실제 etcd 를 호출하지 않는다. 다른 revision 은 조회할 수 없다.
+    """
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.cluster = snapshot.cluster
+        self.backend = self.exec_backend = SnapshotBackend(snapshot.path)
+        self.index = KeyIndex()
+        self.index.load(self.backend.keyspace.keys, self.backend.revision)
+
+    def _key_index(self, prefix: bytes) -> Optional[KeyIndex]:
+        return self.index
@@ -0,0 +1,160 @@
+import shlex
+import threading
+import time
+import uuid
+from typing import List, Optional, Tuple
+
+from kubernetes.stream import stream
+
+
+class ExecSessionError(Exception):
+    """exec 스트림 세션을 사용할 수 없음 (명령을 보내기 전이므로 kubectl 로 fallback 가능)"""
+
+
+class ExecSessionLost(ExecSessionError):
+    """명령을 보낸 뒤 스트림이 끊김
+
+    명령이 실행됐는지 알 수 없으므로 다시 실행하면 안 된다 (put/del/txn 중복 적용).
+    """
+
+
+class ExecSessionTimeout(ExecSessionLost):
+    """명령이 제한 시간 안에 끝나지 않음"""
+
+
+class EtcdExecSession:
+    """etcd pod 에 열어 둔 셸 스트림 위에서 etcdctl 명령을 순차 실행
+
+    ``kubectl exec`` 프로세스를 매번 띄우는 대신 websocket exec 스트림 하나를
+    유지하고, 명령마다 고유 마커를 붙여 stdout/stderr 경계와 종료 코드를 구분한다.
+    스트림이 끊기면 다음 명령에서 다시 연결한다.
+    """
+
+    def __init__(
+        self,
+        core_api,
+        namespace: str,
+        pod_name: str,
+        shell: str = '/bin/sh',
+        container: Optional[str] = None
+    ):
+        self.core_api = core_api
+        self.namespace = namespace
+        self.pod_name = pod_name
+        self.shell = shell
+        self.container = container
+        self._ws = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        kwargs = {}
+        if self.container:
+            kwargs['container'] = self.container
+
+        try:
+            self._ws = stream(
+                self.core_api.connect_get_namespaced_pod_exec,
+                self.pod_name,
+                self.namespace,
+                command=[self.shell],
+                stdin=True,
+                stdout=True,
+                stderr=True,
+                tty=False,
+                binary=True,
+                _preload_content=False,
+                **kwargs
+            )
+        except Exception as e:
+            self._ws = None
+            raise ExecSessionError(f'Failed to open exec stream: {e}')
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        if self._ws is not None:
+            try:
+                self._ws.close()
+            except Exception:
+                pass
+            self._ws = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._ws is not None and self._ws.is_open()
+
+    def run(
+        self,
+        argv: List[str],
+        timeout: float = 30,
+        input: Optional[bytes] = None
+    ) -> Tuple[int, bytes, bytes]:
+        """명령 실행 후 (returncode, stdout, stderr) 반환"""
+        command = shlex.join(argv)
+        if input is not None:
+            # 셸 문자열로 옮길 수 없는 입력(NUL, 비 UTF-8)은 kubectl -i 로 넘긴다
+            if b'\0' in input:
+                raise ExecSessionError('Binary stdin is not supported')
+            try:
+                text = input.decode()
+            except UnicodeDecodeError:
+                raise ExecSessionError('Binary stdin is not supported')
+            command = f"printf '%s' {shlex.quote(text)} | {command}"
+
+        with self._lock:
+            if not self.is_open:
+                self._close()
+                self._open()
+
+            marker = f'__EWM_{uuid.uuid4().hex}__'
+            script = (
+                f'{command}; '
+                f"printf '\\n{marker} %s\\n' \"$?\"; "
+                f"printf '\\n{marker}\\n' >&2\n"
+            )
+
+            # write_stdin 이 실패해도 일부는 전달됐을 수 있으므로 여기부터는 ExecSessionLost
+            try:
+                self._ws.write_stdin(script.encode('utf-8', 'surrogateescape'))
+                return self._collect(marker.encode(), timeout)
+            except ExecSessionLost:
+                self._close()
+                raise
+            except Exception as e:
+                self._close()
+                raise ExecSessionLost(str(e))
+
+    def _collect(self, marker: bytes, timeout: float) -> Tuple[int, bytes, bytes]:
+        out = bytearray()
+        err = bytearray()
+        out_end = err_end = -1
+        deadline = time.monotonic() + timeout
+
+        while out_end < 0 or err_end < 0:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise ExecSessionTimeout('Command timeout')
+            if not self._ws.is_open():
+                raise ExecSessionLost('Exec stream closed')
+
+            self._ws.update(timeout=min(remaining, 1.0))
+            out += self._ws.read_stdout(timeout=0) or b''
+            err += self._ws.read_stderr(timeout=0) or b''
+
+            if out_end < 0:
+                pos = out.find(b'\n' + marker + b' ')
+                # 종료 코드 줄이 끝까지 도착했을 때만 완료로 본다
+                if pos >= 0 and out.find(b'\n', pos + len(marker) + 2) >= 0:
+                    out_end = pos
+            if err_end < 0:
+                err_end = err.find(b'\n' + marker + b'\n')
+
+        status_line = out[out_end + len(marker) + 2:].split(b'\n', 1)[0]
+        try:
+            returncode = int(status_line)
+        except ValueError:
+            raise ExecSessionLost('Malformed exec frame')
+
+        return returncode, bytes(out[:out_end]), bytes(err[:err_end])
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.clusters.k8s import kube_clients
+from apps.clusters.models import Cluster
+from .cache import response_cache, stats_cache
+from .index import key_indexes
+from .pool import service_pool
+from .watch import watch_hub
+
+
+@receiver(post_save, sender=Cluster)
+@receiver(post_delete, sender=Cluster)
+def invalidate_cluster_service(sender, instance, **kwargs):
+    """클러스터 변경/삭제 시 풀에 남은 EtcdService, K8s 클라이언트, 키 인덱스, watch, 응답 캐시 제거"""
+    service_pool.invalidate(instance.pk)
+    kube_clients.invalidate(instance.pk)
+    key_indexes.stop(instance.pk)
+    watch_hub.stop(instance.pk)
+    response_cache.clear_cluster(instance.pk)
+    stats_cache.clear_cluster(instance.pk)
@@ -0,0 +1,357 @@
+import bisect
+import hashlib
+import mmap
+import os
+import struct
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .backends import BaseEtcdBackend, EtcdBackendError, WatchStream
+
+
+class SnapshotFormatError(EtcdBackendError):
+    """스냅샷 파일이 etcd (bbolt) 형식이 아니거나 checksum 이 맞지 않음"""
+
+
+# etcd 는 스냅샷 끝에 DB 내용의 sha256 을 붙여 보낸다
+TRAILER_SIZE = hashlib.sha256().digest_size
+
+
+class SnapshotWriter:
+    """스냅샷 chunk 를 ``<path>.part`` 에 이어 쓰며 sha256 계산, ``finish()`` 에서 fsync 후 rename
+
+    마지막 32바이트(etcd 가 붙인 sha256)는 따로 두고 나머지로 checksum 을 확인한다
+    (크기 % 512 == 32 일 때만, etcdutl snapshot restore 와 같은 조건).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.part_path = path + '.part'
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.file = open(self.part_path, 'wb')
+        self.size = 0
+        self._sha256 = hashlib.sha256()
+        self._db_sha256 = hashlib.sha256()
+        self._tail = b''
+
+    def write(self, chunk: bytes) -> None:
+        self.file.write(chunk)
+        self._sha256.update(chunk)
+        self.size += len(chunk)
+        if len(chunk) >= TRAILER_SIZE:
+            self._db_sha256.update(self._tail)
+            self._db_sha256.update(memoryview(chunk)[:-TRAILER_SIZE])
+            self._tail = chunk[-TRAILER_SIZE:]
+        else:
+            data = self._tail + chunk
+            self._db_sha256.update(data[:-TRAILER_SIZE])
+            self._tail = data[-TRAILER_SIZE:]
+
+    def finish(self) -> Dict[str, Any]:
+        """파일을 확정하고 {size, sha256, etcd_checksum} 반환 (checksum 이 없으면 etcd_checksum 은 None)"""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+
+        etcd_checksum = None
+        if self.size % 512 == TRAILER_SIZE:
+            if self._db_sha256.digest() != self._tail:
+                self.abort()
+                raise SnapshotFormatError('Snapshot sha256 does not match the checksum sent by etcd')
+            etcd_checksum = True
+        os.replace(self.part_path, self.path)
+        return {
+            'size': self.size,
+            'sha256': self._sha256.hexdigest(),
+            'etcd_checksum': etcd_checksum,
+        }
+
+    def abort(self) -> None:
+        """쓰던 임시 파일 삭제 (finish 이후에는 아무것도 하지 않음)"""
+        if not self.file.closed:
+            self.file.close()
+        try:
+            os.unlink(self.part_path)
+        except FileNotFoundError:
+            pass
+
+
+# bbolt 파일 형식 (go.etcd.io/bbolt page.go / db.go)
+_PAGE_HEADER = struct.Struct('<QHHI')    # id, flags, count, overflow
+_META = struct.Struct('<IIIIQQQQQQ')     # magic, version, page_size, flags, root, sequence, freelist, pgid, txid, checksum
+_BRANCH_ELEMENT = struct.Struct('<IIQ')  # pos, ksize, pgid
+_LEAF_ELEMENT = struct.Struct('<IIII')   # flags, pos, ksize, vsize
+_BUCKET = struct.Struct('<QQ')           # root, sequence
+
+_BRANCH_PAGE = 0x01
+_LEAF_PAGE = 0x02
+_BUCKET_LEAF = 0x01
+_MAGIC = 0xED0CDAED
+_VERSION = 2
+_META_CHECKSUM_OFFSET = _META.size - 8
+
+
+def _fnv64a(data: bytes) -> int:
+    h = 0xcbf29ce484222325
+    for b in data:
+        h = ((h ^ b) * 0x100000001b3) & 0xffffffffffffffff
+    return h
+
+
+class BoltFile:
+    """bbolt DB 파일을 mmap 으로 읽기 전용으로 열어 bucket 을 순회
+
+    두 meta page 중 checksum 이 맞고 txid 가 큰 쪽을 기준으로 하며, 페이지는
+    필요할 때 OS 가 읽어 오므로 파일 크기만큼 메모리를 쓰지 않는다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            try:
+                self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise SnapshotFormatError('Snapshot file is empty')
+        try:
+            self.page_size, self.root = self._read_meta()
+        except Exception:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        if not self.mm.closed:
+            self.mm.close()
+
+    def _meta_at(self, offset: int) -> Optional[Tuple]:
+        if offset + _PAGE_HEADER.size + _META.size > len(self.mm):
+            return None
+        start = offset + _PAGE_HEADER.size
+        meta = _META.unpack_from(self.mm, start)
+        if meta[0] != _MAGIC or meta[1] != _VERSION:
+            return None
+        if meta[9] != _fnv64a(self.mm[start:start + _META_CHECKSUM_OFFSET]):
+            return None
+        return meta
+
+    def _read_meta(self) -> Tuple[int, int]:
+        first = self._meta_at(0)
+        page_size = first[2] if first else 4096
+        candidates = [m for m in (first, self._meta_at(page_size)) if m is not None]
+        if not candidates:
+            raise SnapshotFormatError('Not a bbolt database (no valid meta page)')
+        meta = max(candidates, key=lambda m: m[8])
+        return meta[2], meta[4]
+
+    def _elements(self, offset: int) -> Iterator[Tuple[int, int, int, int, int]]:
+        """offset 의 페이지 아래 leaf element (flags, key 위치, key 길이, 값 위치, 값 길이) 를 키 순서대로"""
+        _, flags, count, _ = _PAGE_HEADER.unpack_from(self.mm, offset)
+        base = offset + _PAGE_HEADER.size
+        if flags & _BRANCH_PAGE:
+            for i in range(count):
+                elem = base + i * _BRANCH_ELEMENT.size
+                _, _, pgid = _BRANCH_ELEMENT.unpack_from(self.mm, elem)
+                yield from self._elements(pgid * self.page_size)
+        elif flags & _LEAF_PAGE:
+            for i in range(count):
+                elem = base + i * _LEAF_ELEMENT.size
+                elem_flags, pos, ksize, vsize = _LEAF_ELEMENT.unpack_from(self.mm, elem)
+                yield elem_flags, elem + pos, ksize, elem + pos + ksize, vsize
+        else:
+            raise SnapshotFormatError(f'Unexpected page type 0x{flags:x} at offset {offset}')
+
+    def _bucket_page(self, offset: int) -> int:
+        """bucket 값 (root, sequence [+ inline page]) 이 가리키는 페이지 위치"""
+        root, _ = _BUCKET.unpack_from(self.mm, offset)
+        return root * self.page_size if root else offset + _BUCKET.size
+
+    def bucket(self, name: bytes) -> Optional[int]:
+        """최상위 bucket 의 페이지 위치 (없으면 None)"""
+        for flags, key_at, ksize, value_at, _ in self._elements(self.root * self.page_size):
+            if flags & _BUCKET_LEAF and self.mm[key_at:key_at + ksize] == name:
+                return self._bucket_page(value_at)
+        return None
+
+    def items(self, bucket: int) -> Iterator[Tuple[bytes, int, int]]:
+        """bucket 의 (key, 값 위치, 값 길이), 하위 bucket 은 건너뜀"""
+        for flags, key_at, ksize, value_at, vsize in self._elements(bucket):
+            if not flags & _BUCKET_LEAF:
+                yield self.mm[key_at:key_at + ksize], value_at, vsize
+
+    def get(self, bucket: int, key: bytes) -> Optional[bytes]:
+        for item_key, value_at, vsize in self.items(bucket):
+            if item_key == key:
+                return self.mm[value_at:value_at + vsize]
+        return None
+
+
+def _varint(buf, pos: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7f) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+
+
+# mvccpb.KeyValue 필드 번호
+_KV_FIELDS = {1: 'key', 2: 'create_revision', 3: 'mod_revision', 4: 'version', 5: 'value', 6: 'lease'}
+
+
+def decode_key_value(buf: bytes) -> Dict[str, Any]:
+    """'key' bucket 값 (mvccpb.KeyValue protobuf) 디코딩"""
+    kv = {'key': b'', 'value': b'', 'create_revision': 0, 'mod_revision': 0, 'version': 0, 'lease': 0}
+    pos = 0
+    while pos < len(buf):
+        tag, pos = _varint(buf, pos)
+        field, wire_type = tag >> 3, tag & 0x07
+        if wire_type == 0:
+            value, pos = _varint(buf, pos)
+        elif wire_type == 2:
+            size, pos = _varint(buf, pos)
+            value, pos = buf[pos:pos + size], pos + size
+        else:
+            raise SnapshotFormatError(f'Unexpected protobuf wire type {wire_type}')
+        if field in _KV_FIELDS:
+            kv[_KV_FIELDS[field]] = value
+    return kv
+
+
+def _revision_main(rev_key: bytes) -> int:
+    """revision key (main 8바이트 + '_' + sub 8바이트 [+ 't']) 의 main revision"""
+    return int.from_bytes(rev_key[:8], 'big')
+
+
+class SnapshotKeyspace:
+    """스냅샷의 마지막 revision 기준 키 → 값 위치 인덱스
+
+    etcd 의 'key' bucket 은 revision 순서로 모든 버전을 담고 있으므로 한 번
+    순회하며 키마다 가장 최근 버전의 위치만 남긴다 (tombstone 이면 제거).
+    키 목록만 메모리에 두고 값은 조회할 때 mmap 에서 읽는다.
+    """
+
+    def __init__(self, bolt: BoltFile):
+        self.bolt = bolt
+        key_bucket = bolt.bucket(b'key')
+        if key_bucket is None:
+            raise SnapshotFormatError("Not an etcd snapshot (no 'key' bucket)")
+
+        latest: Dict[bytes, Tuple[int, int]] = {}
+        revision = 0
+        for rev_key, value_at, vsize in bolt.items(key_bucket):
+            key = decode_key_value(bolt.mm[value_at:value_at + vsize])['key']
+            if len(rev_key) > 17 and rev_key[17:18] == b't':
+                latest.pop(key, None)
+            else:
+                latest[key] = (value_at, vsize)
+            revision = _revision_main(rev_key)
+
+        self.compact_revision = 0
+        meta_bucket = bolt.bucket(b'meta')
+        if meta_bucket is not None:
+            finished = bolt.get(meta_bucket, b'finishedCompactRev')
+            if finished:
+                self.compact_revision = _revision_main(finished)
+
+        # 마지막 revision 의 키가 compact 되었으면 etcd 도 compact revision 을 현재 revision 으로 본다
+        self.revision = max(revision, self.compact_revision)
+        self.keys: List[bytes] = sorted(latest)
+        self._locations = [latest[key] for key in self.keys]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def bounds(self, start: bytes, end: Optional[bytes]) -> Tuple[int, int]:
+        lo = bisect.bisect_left(self.keys, start)
+        if end is None:
+            hi = lo + 1 if lo < len(self.keys) and self.keys[lo] == start else lo
+        elif end == b'\0':
+            hi = len(self.keys)
+        else:
+            hi = max(lo, bisect.bisect_left(self.keys, end))
+        return lo, hi
+
+    def key_value(self, i: int) -> Dict[str, Any]:
+        value_at, vsize = self._locations[i]
+        return decode_key_value(self.bolt.mm[value_at:value_at + vsize])
+
+
+class SnapshotBackend(BaseEtcdBackend):
+    """저장된 스냅샷 파일을 읽는 읽기 전용 backend (마지막 revision 만 조회 가능)"""
+
+    name = 'snapshot'
+
+    def __init__(self, path: str):
+        self.path = path
+        self.bolt = BoltFile(path)
+        try:
+            self.keyspace = SnapshotKeyspace(self.bolt)
+        except Exception:
+            self.bolt.close()
+            raise
+
+    @property
+    def revision(self) -> int:
+        return self.keyspace.revision
+
+    def range(
+        self,
+        key: bytes,
+        range_end: Optional[bytes] = None,
+        limit: int = 0,
+        revision: int = 0,
+        keys_only: bool = False,
+        count_only: bool = False,
+        serializable: bool = False
+    ) -> Dict[str, Any]:
+        if revision and revision != self.revision:
+            raise EtcdBackendError(f'Snapshot only holds revision {self.revision}')
+
+        lo, hi = self.keyspace.bounds(key, range_end)
+        stop = min(hi, lo + limit) if limit else hi
+        kvs = []
+        if not count_only:
+            for i in range(lo, stop):
+                if keys_only:
+                    kvs.append({
+                        'key': self.keyspace.keys[i],
+                        'value': b'',
+                        'create_revision': 0,
+                        'mod_revision': 0,
+                        'version': 0,
+                    })
+                    continue
+                kv = self.keyspace.key_value(i)
+                kvs.append({
+                    'key': kv['key'],
+                    'value': kv['value'],
+                    'create_revision': kv['create_revision'],
+                    'mod_revision': kv['mod_revision'],
+                    'version': kv['version'],
+                })
+        return {
+            'header': {'revision': self.revision},
+            'kvs': kvs,
+            'more': stop < hi,
+            'count': hi - lo,
+        }
+
+    def _read_only(self, *args, **kwargs):
+        raise EtcdBackendError('Snapshots are read-only')
+
+    put = delete_range = txn = _read_only
+
+    def watch(self, key: bytes, range_end: Optional[bytes] = None, start_revision: int = 0) -> WatchStream:
+        raise EtcdBackendError('Snapshots cannot be watched')
+
+    def endpoint_health(self, timeout: Optional[float] = None) -> Any:
+        raise EtcdBackendError('Snapshots have no endpoint')
+
+    endpoint_status = member_list = snapshot = endpoint_health
+
+    def close(self):
+        if hasattr(self, 'bolt'):
+            self.bolt.close()
+
+    def __del__(self):
+        self.close()
@@ -0,0 +1,97 @@
+import bisect
+import heapq
+from typing import Any, Callable, Dict, List, Tuple
+
+
+# 값 크기 분포 구간 상한 (bytes), 마지막 구간은 상한 없음
+SIZE_BUCKETS = [64, 256, 1024, 4096, 16384, 65536, 262144, 1048576]
+
+GROUP_TOP = 3
+
+OTHER_GROUP = b'(other)'
+
+
+class _Aggregate:
+    """키 수 / 크기 합계 / 분포 / 큰 키 top-N (키 수와 무관한 고정 메모리)"""
+
+    __slots__ = ('count', 'key_bytes', 'value_bytes', 'histogram', 'top', '_largest')
+
+    def __init__(self, top: int):
+        self.count = 0
+        self.key_bytes = 0
+        self.value_bytes = 0
+        self.histogram = [0] * (len(SIZE_BUCKETS) + 1)
+        self.top = top
+        self._largest: List[Tuple[int, bytes]] = []
+
+    def add(self, key: bytes, size: int) -> None:
+        self.count += 1
+        self.key_bytes += len(key)
+        self.value_bytes += size
+        self.histogram[bisect.bisect_left(SIZE_BUCKETS, size)] += 1
+        if len(self._largest) < self.top:
+            heapq.heappush(self._largest, (size, key))
+        elif size > self._largest[0][0]:
+            heapq.heapreplace(self._largest, (size, key))
+
+    def to_dict(self, decode: Callable[[bytes], str]) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'key_bytes': self.key_bytes,
+            'value_bytes': self.value_bytes,
+            'histogram': [
+                {'max': bound, 'count': count}
+                for bound, count in zip(SIZE_BUCKETS + [None], self.histogram)
+            ],
+            'largest': [
+                {'key': decode(key), 'size': size}
+                for size, key in sorted(self._largest, reverse=True)
+            ],
+        }
+
+
+class KeyspaceStats:
+    """prefix 아래 키를 depth 단계 경로별로 묶어 집계
+
+    키를 한 번씩만 보고 바로 버리므로 메모리는 그룹 수에 비례하며,
+    그룹이 max_groups 를 넘으면 나머지는 ``(other)`` 로 합친다.
+    """
+
+    def __init__(self, prefix: bytes, depth: int = 1, top: int = 10, max_groups: int = 1000):
+        self.prefix = prefix
+        self.depth = depth
+        self.max_groups = max_groups
+        self.total = _Aggregate(top)
+        self.groups: Dict[bytes, _Aggregate] = {}
+
+    def group_of(self, key: bytes) -> bytes:
+        parts = key[len(self.prefix):].split(b'/', self.depth)
+        if len(parts) <= self.depth:
+            return key
+        return self.prefix + b'/'.join(parts[:self.depth])
+
+    def add(self, key: bytes, size: int) -> None:
+        self.total.add(key, size)
+        group = self.group_of(key)
+        aggregate = self.groups.get(group)
+        if aggregate is None:
+            if len(self.groups) >= self.max_groups:
+                group = OTHER_GROUP
+                aggregate = self.groups.get(group)
+            if aggregate is None:
+                aggregate = self.groups[group] = _Aggregate(GROUP_TOP)
+        aggregate.add(key, size)
+
+    def result(self, decode: Callable[[bytes], str]) -> Dict[str, Any]:
+        total = self.total.to_dict(decode)
+        groups = [
+            dict(path=decode(path), **aggregate.to_dict(decode))
+            for path, aggregate in self.groups.items()
+        ]
+        groups.sort(key=lambda g: (g['value_bytes'] + g['key_bytes'], g['count']), reverse=True)
+        return {
+            'total': total,
+            'largest': total.pop('largest'),
+            'groups': groups,
+            'truncated_groups': OTHER_GROUP in self.groups,
+        }
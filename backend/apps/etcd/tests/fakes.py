@@ -0,0 +1,394 @@
+"""테스트용 in-memory etcd backend 와 서비스 / view 준비 도우미
+
+``MemoryBackend`` 는 revision 별 변경 기록을 남겨 ``revision`` 지정 조회, txn
+compare, prefix 범위를 etcd 와 같은 규칙으로 처리한다. 키 수가 적은 테스트용이라
+조회할 때마다 기록을 다시 재생한다.
+"""
+import ast
+import base64
+import json
+import re
+import threading
+from typing import Any, Dict, List, Optional
+from unittest import mock
+
+from django.contrib.auth.models import User
+
+from apps.clusters.models import Cluster
+from apps.etcd.backends import BaseEtcdBackend, EtcdBackendError, ExecBackend, WatchStream
+from apps.etcd.cache import response_cache, stats_cache
+from apps.etcd.pool import service_pool
+from apps.etcd.services import EtcdService
+
+
+class MemoryBackend(BaseEtcdBackend):
+    name = 'memory'
+
+    def __init__(self, data: Optional[Dict[bytes, bytes]] = None):
+        self.revision = 1
+        self.log: List[tuple] = []
+        self.calls: List[str] = []
+        self.lock = threading.Lock()
+        # 설정하면 range 호출이 이 이벤트가 set 될 때까지 기다린다
+        self.gate: Optional[threading.Event] = None
+        # health / status / members 조회 결과 대신 발생시킬 오류 (이름별)
+        self.probe_errors: Dict[str, Exception] = {}
+        self.probe_timeouts: List[Optional[float]] = []
+        # 이 revision 이하에서 시작하는 watch 는 compacted 응답을 받는다
+        self.compact_revision = 0
+        for key, value in sorted((data or {}).items()):
+            self.put(key, value)
+        self.calls.clear()
+
+    def _state(self, revision: int = 0) -> Dict[bytes, Dict[str, Any]]:
+        state: Dict[bytes, Dict[str, Any]] = {}
+        for rev, key, value in self.log:
+            if revision and rev > revision:
+                break
+            if value is None:
+                state.pop(key, None)
+                continue
+            old = state.get(key)
+            state[key] = {
+                'key': key,
+                'value': value,
+                'create_revision': old['create_revision'] if old else rev,
+                'mod_revision': rev,
+                'version': old['version'] + 1 if old else 1,
+            }
+        return state
+
+    @staticmethod
+    def _in_range(key: bytes, start: bytes, range_end: Optional[bytes]) -> bool:
+        if not range_end:
+            return key == start
+        if range_end == b'\0':
+            return key >= start
+        return start <= key < range_end
+
+    def _select(self, state, key: bytes, range_end: Optional[bytes]) -> List[Dict[str, Any]]:
+        return [state[k] for k in sorted(state) if self._in_range(k, key, range_end)]
+
+    def range(self, key, range_end=None, limit=0, revision=0, keys_only=False,
+              count_only=False, serializable=False):
+        self.calls.append('range')
+        if self.gate is not None:
+            self.gate.wait(5)
+        with self.lock:
+            if revision > self.revision:
+                raise EtcdBackendError('etcdserver: mvcc: required revision is a future revision')
+            kvs = self._select(self._state(revision), key, range_end)
+            page = kvs[:limit] if limit else kvs
+            if keys_only:
+                page = [dict(kv, value=b'') for kv in page]
+            return {
+                'header': {'revision': self.revision},
+                'kvs': [] if count_only else page,
+                'more': len(page) < len(kvs),
+                'count': len(kvs),
+            }
+
+    def _write(self, ops: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """ops 를 한 revision 으로 적용 (lock 을 잡은 상태에서 호출)"""
+        state = self._state()
+        revision = self.revision + 1
+        changed = False
+        responses = []
+        for op in ops:
+            if op['type'] == 'get':
+                kvs = self._select(state, op['key'], op.get('range_end'))
+                responses.append({'type': 'get', 'header': {'revision': self.revision}, 'kvs': kvs,
+                                  'more': False, 'count': len(kvs)})
+            elif op['type'] == 'put':
+                self.log.append((revision, op['key'], op.get('value', b'')))
+                changed = True
+                responses.append({'type': 'put'})
+            else:
+                deleted = self._select(state, op['key'], op.get('range_end'))
+                for kv in deleted:
+                    self.log.append((revision, kv['key'], None))
+                changed = changed or bool(deleted)
+                responses.append({'type': 'delete', 'deleted': len(deleted)})
+        if changed:
+            self.revision = revision
+        return responses
+
+    def put(self, key, value):
+        self.calls.append('put')
+        with self.lock:
+            self._write([{'type': 'put', 'key': key, 'value': value}])
+            return {'header': {'revision': self.revision}}
+
+    def delete_range(self, key, range_end=None):
+        self.calls.append('delete_range')
+        with self.lock:
+            responses = self._write([{'type': 'delete', 'key': key, 'range_end': range_end}])
+            return {'header': {'revision': self.revision}, 'deleted': responses[0]['deleted']}
+
+    def txn(self, compare, success, failure=None):
+        self.calls.append('txn')
+        with self.lock:
+            state = self._state()
+            succeeded = all(self._compare(state, c) for c in compare)
+            responses = self._write(success if succeeded else failure or [])
+            return {'header': {'revision': self.revision}, 'succeeded': succeeded, 'responses': responses}
+
+    @staticmethod
+    def _compare(state, cmp: Dict[str, Any]) -> bool:
+        kv = state.get(cmp['key'])
+        field = {'MOD': 'mod_revision', 'VERSION': 'version', 'CREATE': 'create_revision', 'VALUE': 'value'}
+        current = kv[field[cmp['target']]] if kv else (b'' if cmp['target'] == 'VALUE' else 0)
+        expected = cmp['value']
+        return {
+            'EQUAL': current == expected,
+            'NOT_EQUAL': current != expected,
+            'GREATER': current > expected,
+            'LESS': current < expected,
+        }[cmp['result']]
+
+    def watch(self, key, range_end=None, start_revision=0):
+        self.calls.append('watch')
+        return MemoryWatchStream(self, key, range_end, start_revision or self.revision + 1)
+
+    def _probe(self, name: str, timeout: Optional[float], response: Any) -> Any:
+        self.calls.append(name)
+        self.probe_timeouts.append(timeout)
+        if name in self.probe_errors:
+            raise self.probe_errors[name]
+        return response
+
+    def endpoint_health(self, timeout=None):
+        return self._probe('endpoint_health', timeout, [{'endpoint': 'memory', 'health': True}])
+
+    def endpoint_status(self, timeout=None):
+        return self._probe('endpoint_status', timeout, [{'Endpoint': 'memory', 'Status': {'header': {'revision': self.revision}}}])
+
+    def member_list(self, timeout=None):
+        return self._probe('member_list', timeout, {'members': [{'name': 'memory'}]})
+
+
+class MemoryWatchStream(WatchStream):
+    """MemoryBackend 의 변경 기록을 start_revision 부터 따라가는 watch"""
+
+    def __init__(self, backend: MemoryBackend, key: bytes, range_end: Optional[bytes], start_revision: int):
+        self.backend = backend
+        self.key = key
+        self.range_end = range_end
+        self.next_revision = start_revision
+        self._closed = threading.Event()
+
+    def __iter__(self):
+        backend = self.backend
+        while not self._closed.is_set():
+            with backend.lock:
+                if self.next_revision <= backend.compact_revision:
+                    yield {'header': {'revision': backend.revision}, 'events': [],
+                           'compact_revision': backend.compact_revision, 'canceled': True}
+                    return
+                events = [
+                    self._event(backend, rev, key, value) for rev, key, value in backend.log
+                    if rev >= self.next_revision and backend._in_range(key, self.key, self.range_end)
+                ]
+                revision = backend.revision
+            if not events:
+                self._closed.wait(0.01)
+                continue
+            self.next_revision = revision + 1
+            yield {'header': {'revision': revision}, 'events': events, 'compact_revision': 0, 'canceled': False}
+
+    @staticmethod
+    def _event(backend: MemoryBackend, rev: int, key: bytes, value: Optional[bytes]) -> Dict[str, Any]:
+        if value is None:
+            return {'type': 'DELETE', 'kv': {'key': key, 'value': b'', 'mod_revision': rev, 'version': 0}}
+        return {'type': 'PUT', 'kv': backend._state(rev)[key]}
+
+    def close(self):
+        self._closed.set()
+
+
+class EtcdctlError(Exception):
+    pass
+
+
+class FakeEtcdctl:
+    """``ExecBackend._exec_etcdctl`` 대역
+
+    etcdctl 인자와 표준 입력(txn, put 값)을 etcdctl 과 같은 규칙으로 해석해
+    MemoryBackend 에 적용하고 ``-w json`` 출력을 돌려준다. 실행한 명령은
+    ``commands`` 에 (command, input) 으로 남는다.
+    """
+
+    QUOTED = re.compile(r'"(?:[^"\\]|\\.)*"')
+    COMPARE = re.compile(r'^(\w+)\(("(?:[^"\\]|\\.)*")\) (=|!=|>|<) ("(?:[^"\\]|\\.)*")$')
+    TARGETS = {'mod': 'MOD', 'ver': 'VERSION', 'c': 'CREATE', 'val': 'VALUE'}
+    RESULTS = {'=': 'EQUAL', '!=': 'NOT_EQUAL', '>': 'GREATER', '<': 'LESS'}
+
+    def __init__(self, backend: MemoryBackend):
+        self.backend = backend
+        self.commands: List[tuple] = []
+
+    def __call__(self, command, namespace='kube-system', pod_name=None, input=None, write=False, timeout=None):
+        self.commands.append((command, input))
+        try:
+            return {'success': True, 'data': json.dumps(self.run(command, input))}
+        except (EtcdctlError, EtcdBackendError) as e:
+            return {'success': False, 'error': f'Error: {e}'}
+
+    @staticmethod
+    def _unquote(text: str) -> bytes:
+        # _go_quote 는 \\, \", \xNN 만 쓰므로 Python bytes 리터럴과 같다
+        return ast.literal_eval('b' + text)
+
+    @staticmethod
+    def _kv(kv):
+        return {
+            'key': base64.b64encode(kv['key']).decode(),
+            'value': base64.b64encode(kv['value']).decode(),
+            'create_revision': kv['create_revision'],
+            'mod_revision': kv['mod_revision'],
+            'version': kv['version'],
+        }
+
+    def _range_json(self, resp):
+        data = {'header': {'revision': resp['header']['revision']}, 'count': resp['count']}
+        if resp['kvs']:
+            data['kvs'] = [self._kv(kv) for kv in resp['kvs']]
+        if resp['more']:
+            data['more'] = True
+        return data
+
+    def run(self, command: List[str], input: Optional[bytes]) -> Any:
+        args: List[str] = []
+        flags: Dict[str, Any] = {}
+        items = iter(command)
+        for arg in items:
+            if arg in ('-w', '--limit', '--rev'):
+                flags[arg.lstrip('-')] = next(items)
+            elif arg.startswith('--'):
+                name, _, value = arg[2:].partition('=')
+                flags[name] = value or True
+            else:
+                args.append(arg)
+
+        name, args = args[0], [a.encode('utf-8', 'surrogateescape') for a in args[1:]]
+        if name == 'get':
+            range_end = b'\0' if flags.get('from-key') else (args[1] if len(args) > 1 else None)
+            return self._range_json(self.backend.range(
+                args[0], range_end,
+                limit=int(flags.get('limit', 0)),
+                revision=int(flags.get('rev', 0)),
+                keys_only=bool(flags.get('keys-only')),
+                count_only=bool(flags.get('count-only')),
+            ))
+        if name == 'put':
+            if len(args) > 1:
+                value = args[1]
+            elif input:
+                value = input
+            else:
+                raise EtcdctlError('put command needs 1 argument and input from stdin or 2 arguments')
+            return {'header': self.backend.put(args[0], value)['header']}
+        if name == 'del':
+            range_end = b'\0' if flags.get('from-key') else (args[1] if len(args) > 1 else None)
+            resp = self.backend.delete_range(args[0], range_end)
+            return {'header': resp['header'], 'deleted': resp['deleted']}
+        if name == 'txn':
+            return self._txn(input.decode())
+        raise EtcdctlError(f'unknown command {name!r}')
+
+    def _txn(self, text: str) -> Dict[str, Any]:
+        sections = text.split('\n')
+        blank = [i for i, line in enumerate(sections) if line == '']
+        compares = sections[:blank[0]]
+        success = sections[blank[0] + 1:blank[1]]
+        failure = sections[blank[1] + 1:blank[2]]
+
+        compare = []
+        for line in compares:
+            match = self.COMPARE.match(line)
+            if match is None:
+                raise EtcdctlError(f'malformed comparison: {line}')
+            target = self.TARGETS[match.group(1)]
+            value = self._unquote(match.group(4))
+            compare.append({
+                'key': self._unquote(match.group(2)),
+                'target': target,
+                'result': self.RESULTS[match.group(3)],
+                'value': value if target == 'VALUE' else int(value),
+            })
+        resp = self.backend.txn(compare, [self._op(l) for l in success], [self._op(l) for l in failure])
+
+        responses = []
+        for item in resp['responses']:
+            if item['type'] == 'get':
+                responses.append({'Response': {'response_range': self._range_json(item)}})
+            elif item['type'] == 'put':
+                responses.append({'Response': {'response_put': {'header': resp['header']}}})
+            else:
+                responses.append({'Response': {'response_delete_range': {'deleted': item['deleted']}}})
+        data = {'header': resp['header'], 'responses': responses}
+        if resp['succeeded']:
+            data['succeeded'] = True
+        return data
+
+    def _op(self, line: str) -> Dict[str, Any]:
+        name, _, rest = line.partition(' ')
+        quoted = [self._unquote(q) for q in self.QUOTED.findall(rest)]
+        if self.QUOTED.sub('', rest).strip() not in ('', '--from-key', '--keys-only'):
+            raise EtcdctlError(f'malformed operation: {line}')
+        op = {'type': {'get': 'get', 'put': 'put', 'del': 'delete'}[name], 'key': quoted[0]}
+        if name == 'put':
+            if len(quoted) != 2:
+                raise EtcdctlError(f'malformed put: {line}')
+            op['value'] = quoted[1]
+        elif '--from-key' in rest:
+            op['range_end'] = b'\0'
+        elif len(quoted) > 1:
+            op['range_end'] = quoted[1]
+        return op
+
+
+def make_cluster(name: str = 'test', **fields) -> Cluster:
+    return Cluster.objects.create(name=name, kubeconfig_encrypted=b'', **fields)
+
+
+def make_service(cluster: Cluster, backend: BaseEtcdBackend) -> EtcdService:
+    """kubeconfig / pod 조회 없이 backend 만 바꿔 끼운 EtcdService"""
+    service = EtcdService.__new__(EtcdService)
+    service.cluster = cluster
+    service.backend = service.exec_backend = backend
+    return service
+
+
+def make_exec_backend(cluster: Cluster, backend: MemoryBackend) -> ExecBackend:
+    """pod 조회 / kubectl 없이 FakeEtcdctl 로 etcdctl 을 실행하는 ExecBackend"""
+    exec_backend = ExecBackend.__new__(ExecBackend)
+    exec_backend.cluster = cluster
+    exec_backend._sessions = {}
+    exec_backend._exec_etcdctl = FakeEtcdctl(backend)
+    return exec_backend
+
+
+class EtcdViewTestMixin:
+    """로그인한 AsyncClient 와 MemoryBackend 를 쓰는 클러스터 (view 테스트용)"""
+
+    initial_data: Dict[bytes, bytes] = {}
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('tester', password='tester')
+        self.client.force_login(self.user)
+        self.async_client.force_login(self.user)
+        self.cluster = make_cluster()
+        # 테스트마다 DB 가 되돌아가 같은 cluster id 가 다시 쓰일 수 있다
+        response_cache.clear_cluster(self.cluster.pk)
+        stats_cache.clear_cluster(self.cluster.pk)
+        self.backend = MemoryBackend(self.initial_data)
+        self.service = make_service(self.cluster, self.backend)
+        for name, value in (('acquire', mock.Mock(return_value=self.service)), ('release', mock.Mock())):
+            patcher = mock.patch.object(service_pool, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def url(self, path: str) -> str:
+        return f'/api/etcd/{self.cluster.pk}/{path}'
@@ -0,0 +1,100 @@
+from django.test import TestCase
+
+from apps.etcd.backends import ExecBackend, _go_quote
+from apps.etcd.tests.fakes import MemoryBackend, make_cluster, make_exec_backend
+
+
+class ExecBackendTests(TestCase):
+    def setUp(self):
+        self.memory = MemoryBackend()
+        self.backend = make_exec_backend(make_cluster(), self.memory)
+        self.etcdctl = self.backend._exec_etcdctl
+
+    def test_put_sends_value_on_stdin(self):
+        self.backend.put(b'/app/flag', b'--not-a-flag')
+        command, input = self.etcdctl.commands[-1]
+        self.assertEqual(command[:2], ['put', '/app/flag'])
+        self.assertEqual(input, b'--not-a-flag')
+        self.assertEqual(self.memory.range(b'/app/flag')['kvs'][0]['value'], b'--not-a-flag')
+
+    def test_put_empty_value(self):
+        # etcdctl put 은 빈 stdin 을 거절하므로 txn 으로 저장해야 한다
+        resp = self.backend.put(b'/app/empty', b'')
+        self.assertEqual(resp['header']['revision'], self.memory.revision)
+        kvs = self.memory.range(b'/app/empty')['kvs']
+        self.assertEqual(len(kvs), 1)
+        self.assertEqual(kvs[0]['value'], b'')
+        self.assertEqual(self.etcdctl.commands[-1][0][0], 'txn')
+
+    def test_range_from_key_and_limit(self):
+        for i in range(5):
+            self.memory.put(b'/k/%d' % i, b'v')
+        resp = self.backend.range(b'/k/2', b'\0', limit=2)
+        self.assertEqual([kv['key'] for kv in resp['kvs']], [b'/k/2', b'/k/3'])
+        self.assertTrue(resp['more'])
+        self.assertEqual(resp['count'], 3)
+
+
+class TxnQuotingTests(TestCase):
+    """etcdctl txn 표준 입력은 Go 문자열 리터럴이므로 어떤 바이트든 그대로 전달되어야 한다"""
+
+    TRICKY = [
+        b'plain',
+        b'with "quotes" and \\backslash\\',
+        b'line\nbreak\ttab',
+        b'\x00\x01\xff binary',
+        '한글 값'.encode(),
+        b'',
+    ]
+
+    def setUp(self):
+        self.memory = MemoryBackend()
+        self.backend = make_exec_backend(make_cluster(), self.memory)
+
+    def test_go_quote(self):
+        self.assertEqual(_go_quote(b'a"b\\c'), '"a\\"b\\\\c"')
+        self.assertEqual(_go_quote(b'\n\x00\xff'), '"\\x0a\\x00\\xff"')
+        self.assertNotIn('\n', _go_quote(b'multi\nline'))
+
+    def test_put_and_get_round_trip(self):
+        ops = [{'type': 'put', 'key': b'/t/' + value, 'value': value} for value in self.TRICKY]
+        resp = self.backend.txn([], ops)
+        self.assertTrue(resp['succeeded'])
+
+        resp = self.backend.txn([], [{'type': 'get', 'key': b'/t/' + value} for value in self.TRICKY])
+        self.assertEqual([r['kvs'][0]['value'] for r in resp['responses']], self.TRICKY)
+
+    def test_compare_value_and_mod_revision(self):
+        self.memory.put(b'/cas', b'a "b"\n')
+        mod_revision = self.memory.revision
+        compare = [
+            {'key': b'/cas', 'target': 'VALUE', 'result': 'EQUAL', 'value': b'a "b"\n'},
+            {'key': b'/cas', 'target': 'MOD', 'result': 'EQUAL', 'value': mod_revision},
+        ]
+        resp = self.backend.txn(compare, [{'type': 'put', 'key': b'/cas', 'value': b'next'}])
+        self.assertTrue(resp['succeeded'])
+
+        resp = self.backend.txn(compare, [{'type': 'put', 'key': b'/cas', 'value': b'again'}],
+                                [{'type': 'get', 'key': b'/cas'}])
+        self.assertFalse(resp['succeeded'])
+        self.assertEqual(resp['responses'][0]['kvs'][0]['value'], b'next')
+
+    def test_delete_range_ops(self):
+        for key in (b'/d/a', b'/d/b', b'/d/c', b'/e'):
+            self.memory.put(key, b'v')
+        resp = self.backend.txn([], [
+            {'type': 'delete', 'key': b'/d/a', 'range_end': b'/d/b\0'},
+            {'type': 'delete', 'key': b'/d/c', 'range_end': b'\0'},
+        ])
+        self.assertEqual([r['deleted'] for r in resp['responses']], [2, 2])
+        self.assertEqual(self.memory.range(b'', b'\0')['count'], 0)
+
+    def test_op_lines(self):
+        self.assertEqual(
+            ExecBackend._txn_op_line({'type': 'get', 'key': b'/a', 'range_end': b'\0', 'keys_only': True}),
+            'get "/a" --from-key --keys-only'
+        )
+        self.assertEqual(
+            ExecBackend._txn_compare_line({'key': b'/a', 'target': 'VERSION', 'result': 'GREATER', 'value': 0}),
+            'ver("/a") > "0"'
+        )
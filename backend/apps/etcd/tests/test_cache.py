@@ -0,0 +1,75 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.etcd import views
+from apps.etcd.cache import DjangoResponseCache, LocalResponseCache, scope_overlaps
+from apps.etcd.tests.fakes import EtcdViewTestMixin
+
+
+class ScopeTests(TestCase):
+    def test_overlaps(self):
+        self.assertTrue(scope_overlaps(('prefix', '/app/'), '/app/a', False))
+        self.assertTrue(scope_overlaps(('key', '/app/a'), '/app/', True))
+        self.assertTrue(scope_overlaps(('prefix', '/app/a/'), '/app/', True))
+        self.assertFalse(scope_overlaps(('key', '/app/a'), '/app/b', False))
+        self.assertFalse(scope_overlaps(('prefix', '/app/'), '/other', True))
+        self.assertFalse(scope_overlaps(None, '/app/a', True))
+
+
+class LocalResponseCacheTests(TestCase):
+    async def test_write_invalidates_only_overlapping_entries(self):
+        cache = LocalResponseCache(ttl=60)
+        await cache.set(1, 'keys', {'prefix': '/app/'}, ('prefix', '/app/'), 'list')
+        await cache.set(1, 'kv', {'key': '/app/a'}, ('key', '/app/a'), 'a')
+        await cache.set(1, 'kv', {'key': '/other'}, ('key', '/other'), 'other')
+        await cache.set(2, 'keys', {'prefix': '/app/'}, ('prefix', '/app/'), 'other cluster')
+
+        await cache.invalidate(1, '/app/a')
+        self.assertIsNone(await cache.get(1, 'keys', {'prefix': '/app/'}))
+        self.assertIsNone(await cache.get(1, 'kv', {'key': '/app/a'}))
+        self.assertEqual((await cache.get(1, 'kv', {'key': '/other'}))[0], 'other')
+        self.assertEqual((await cache.get(2, 'keys', {'prefix': '/app/'}))[0], 'other cluster')
+
+
+class ResponseCacheViewTests(EtcdViewTestMixin, TestCase):
+    initial_data = {b'/app/a': b'1', b'/other': b'2'}
+
+    def use_caches(self, reader, writer):
+        """reader 로 조회를 캐시하고 writer 로 무효화 (worker 두 개를 흉내)"""
+        for target, name, value in ((views.BaseEtcdView, 'response_cache', reader),
+                                    (views, 'response_cache', writer)):
+            patcher = mock.patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def keys(self):
+        response = self.client.get(self.url('keys/'), {'prefix': '/app/'})
+        return response['X-Cache'], response.json()['keys']
+
+    def write(self):
+        response = self.client.post(self.url('kv/'), {'key': '/app/b', 'value': 'x'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_write_invalidates_overlapping_entries(self):
+        local = LocalResponseCache(ttl=60)
+        self.use_caches(local, local)
+        self.assertEqual(self.keys(), ('MISS', ['/app/a']))
+        self.assertEqual(self.keys()[0], 'HIT')
+        other = self.client.get(self.url('kv/'), {'key': '/other'})
+        self.assertEqual(other['X-Cache'], 'MISS')
+
+        self.write()
+        self.assertEqual(self.keys(), ('MISS', ['/app/a', '/app/b']))
+        self.assertEqual(self.client.get(self.url('kv/'), {'key': '/other'})['X-Cache'], 'HIT')
+
+    def test_shared_cache_invalidates_across_workers(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.use_caches(DjangoResponseCache(ttl=60), DjangoResponseCache(ttl=60))
+        self.assertEqual(self.keys()[0], 'MISS')
+        self.assertEqual(self.keys()[0], 'HIT')
+
+        self.write()
+        self.assertEqual(self.keys(), ('MISS', ['/app/a', '/app/b']))
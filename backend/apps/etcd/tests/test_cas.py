@@ -0,0 +1,84 @@
+import base64
+
+from django.test import TestCase
+
+from apps.etcd.tests.fakes import EtcdViewTestMixin, make_exec_backend
+
+
+class CompareAndSwapViewTests(EtcdViewTestMixin, TestCase):
+    initial_data = {b'/cfg': b'v1', b'/bin': b'\xff\x00'}
+
+    def setUp(self):
+        super().setUp()
+        # compare / 실패 시 조회가 etcdctl txn 입력으로 만들어지는 경로
+        self.service.backend = self.service.exec_backend = make_exec_backend(self.cluster, self.backend)
+
+    def mod_revision(self, key):
+        return self.backend.range(key)['kvs'][0]['mod_revision']
+
+    def put(self, key, value, expected_mod_revision):
+        return self.client.post(
+            self.url('kv/'),
+            {'key': key, 'value': value, 'expected_mod_revision': expected_mod_revision},
+            content_type='application/json'
+        )
+
+    def delete(self, key, expected_mod_revision):
+        return self.client.delete(
+            self.url('kv/'),
+            {'key': key, 'expected_mod_revision': expected_mod_revision},
+            content_type='application/json'
+        )
+
+    def test_put_with_current_revision(self):
+        response = self.put('/cfg', 'v2', self.mod_revision(b'/cfg'))
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()['revision'], self.backend.revision)
+        self.assertEqual(self.backend.range(b'/cfg')['kvs'][0]['value'], b'v2')
+
+    def test_put_with_stale_revision_returns_current_value(self):
+        stale = self.mod_revision(b'/cfg')
+        self.backend.put(b'/cfg', b'changed "elsewhere"')
+
+        response = self.put('/cfg', 'v2', stale)
+        self.assertEqual(response.status_code, 409)
+        body = response.json()
+        self.assertTrue(body['conflict'])
+        self.assertEqual(body['current']['value'], 'changed "elsewhere"')
+        self.assertEqual(body['current']['mod_revision'], self.mod_revision(b'/cfg'))
+        self.assertEqual(self.backend.range(b'/cfg')['kvs'][0]['value'], b'changed "elsewhere"')
+
+    def test_conflict_with_binary_current_value(self):
+        response = self.put('/bin', 'x', 1)
+        self.assertEqual(response.status_code, 409)
+        current = response.json()['current']
+        self.assertEqual(current['encoding'], 'base64')
+        self.assertEqual(base64.b64decode(current['value']), b'\xff\x00')
+
+    def test_create_only_with_zero(self):
+        self.assertEqual(self.put('/new', 'a', 0).status_code, 200)
+        response = self.put('/new', 'b', 0)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['current']['value'], 'a')
+
+    def test_delete_with_revision(self):
+        self.assertEqual(self.delete('/cfg', self.mod_revision(b'/cfg') + 1).status_code, 409)
+        self.assertEqual(self.backend.range(b'/cfg')['count'], 1)
+
+        response = self.delete('/cfg', self.mod_revision(b'/cfg'))
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()['deleted'], 1)
+        self.assertEqual(self.backend.range(b'/cfg')['count'], 0)
+
+    def test_deleted_key_conflict_reports_not_found(self):
+        stale = self.mod_revision(b'/cfg')
+        self.backend.delete_range(b'/cfg')
+        response = self.put('/cfg', 'v2', stale)
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(response.json()['current']['found'])
+
+    def test_prefix_delete_rejects_expected_revision(self):
+        response = self.client.delete(
+            self.url('kv/'), {'key': '/c', 'prefix': True, 'expected_mod_revision': 1}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
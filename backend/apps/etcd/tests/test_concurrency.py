@@ -0,0 +1,158 @@
+import asyncio
+import threading
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from apps.etcd.concurrency import ClusterBusy, ClusterCallLimiter, SingleFlight
+from apps.etcd.tests.fakes import EtcdViewTestMixin
+from apps.etcd.views import BaseEtcdView
+
+
+class SingleFlightTests(TestCase):
+    async def test_concurrent_calls_share_one_result(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def load():
+            calls.append(1)
+            await release.wait()
+            return {'keys': ['/a']}
+
+        first = asyncio.ensure_future(flight.do(('c', 'get_keys'), load))
+        second = asyncio.ensure_future(flight.do(('c', 'get_keys'), load))
+        other = asyncio.ensure_future(flight.do(('c', 'get_tree'), load))
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(first, second, other)
+        self.assertIs(results[0], results[1])
+        self.assertEqual(len(calls), 2)
+
+        # 끝난 호출은 공유하지 않는다
+        await flight.do(('c', 'get_keys'), load)
+        self.assertEqual(len(calls), 3)
+
+    async def test_error_is_shared(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fail():
+            await release.wait()
+            raise ValueError('boom')
+
+        waiters = [asyncio.ensure_future(flight.do('k', fail)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        for result in await asyncio.gather(*waiters, return_exceptions=True):
+            self.assertIsInstance(result, ValueError)
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def load():
+            await release.wait()
+            return 'done'
+
+        first = asyncio.ensure_future(flight.do('k', load))
+        second = asyncio.ensure_future(flight.do('k', load))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        self.assertEqual(await second, 'done')
+
+
+class ClusterCallLimiterTests(TestCase):
+    def setUp(self):
+        self.limiter = ClusterCallLimiter(per_cluster=1, workers=4, max_queue=1, queue_timeout=0.2)
+        self.addCleanup(self.limiter.executor.shutdown, wait=False)
+        self.gate = threading.Event()
+        self.addCleanup(self.gate.set)
+
+    async def occupy(self):
+        task = asyncio.ensure_future(self.limiter.run(1, self.gate.wait, 5))
+        await asyncio.sleep(0.01)
+        return task
+
+    async def test_rejects_when_queue_is_full(self):
+        running = await self.occupy()
+        queued = asyncio.ensure_future(self.limiter.run(1, lambda: 'queued'))
+        await asyncio.sleep(0.01)
+
+        with self.assertRaises(ClusterBusy):
+            await self.limiter.run(1, lambda: 'rejected')
+        # 다른 클러스터는 영향을 받지 않는다
+        self.assertEqual(await self.limiter.run(2, lambda: 'other'), 'other')
+
+        self.gate.set()
+        self.assertTrue(await running)
+        self.assertEqual(await queued, 'queued')
+
+    async def test_queue_timeout(self):
+        running = await self.occupy()
+        with self.assertRaises(ClusterBusy):
+            await self.limiter.run(1, lambda: 'late')
+        self.gate.set()
+        await running
+
+    async def test_admitted_calls_wait_instead_of_failing(self):
+        running = await self.occupy()
+        queued = asyncio.ensure_future(self.limiter.run(1, lambda: 'queued'))
+        admitted = asyncio.ensure_future(self.limiter.run_admitted(1, lambda: 'admitted'))
+        await asyncio.sleep(0.3)
+        self.assertFalse(admitted.done())
+
+        self.gate.set()
+        await running
+        self.assertEqual(await admitted, 'admitted')
+        with self.assertRaises(ClusterBusy):
+            # queue_timeout 이 지나 먼저 거절됨
+            await queued
+
+
+@override_settings(ETCD_COALESCE_READS=True)
+class AdmissionViewTests(EtcdViewTestMixin, TestCase):
+    initial_data = {b'/app/a': b'1', b'/other/b': b'2'}
+
+    def setUp(self):
+        super().setUp()
+        limiter = ClusterCallLimiter(per_cluster=1, workers=4, max_queue=0, queue_timeout=0.1)
+        self.addCleanup(limiter.executor.shutdown, wait=False)
+        patcher = mock.patch.object(BaseEtcdView, 'limiter', limiter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.backend.gate = threading.Event()
+        self.addCleanup(self.backend.gate.set)
+
+    async def wait_for_range(self):
+        for _ in range(100):
+            if 'range' in self.backend.calls:
+                return
+            await asyncio.sleep(0.01)
+        self.fail('range was not called')
+
+    async def test_identical_reads_are_coalesced(self):
+        requests = [
+            asyncio.ensure_future(self.async_client.get(self.url('keys/'), {'prefix': '/app/'}))
+            for _ in range(3)
+        ]
+        await self.wait_for_range()
+        await asyncio.sleep(0.05)
+        self.backend.gate.set()
+
+        responses = await asyncio.gather(*requests)
+        self.assertEqual([r.status_code for r in responses], [200, 200, 200])
+        self.assertEqual(self.backend.calls.count('range'), 1)
+
+    async def test_busy_cluster_returns_429(self):
+        first = asyncio.ensure_future(self.async_client.get(self.url('keys/'), {'prefix': '/app/'}))
+        await self.wait_for_range()
+
+        response = await self.async_client.get(self.url('keys/'), {'prefix': '/other/'})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '1')
+
+        self.backend.gate.set()
+        self.assertEqual((await first).status_code, 200)
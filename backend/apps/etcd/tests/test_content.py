@@ -0,0 +1,96 @@
+import base64
+
+from django.test import TestCase
+
+from apps.etcd.content import (
+    K8S_PROTOBUF_MAGIC, DecodeError, decode_k8s_protobuf, decode_value, sniff_content_type, to_text,
+)
+from apps.etcd.tests.fakes import EtcdViewTestMixin, make_exec_backend
+
+
+def field(no: int, data: bytes) -> bytes:
+    """length-delimited protobuf 필드 (짧은 값만)"""
+    return bytes([no << 3 | 2, len(data)]) + data
+
+
+POD = K8S_PROTOBUF_MAGIC + field(1, field(1, b'v1') + field(2, b'Pod')) + field(2, field(1, field(1, b'coredns')))
+
+BINARY = bytes(range(256))
+
+
+class ContentTypeTests(TestCase):
+    def test_to_text(self):
+        self.assertEqual(to_text('한글 값\n'.encode()), '한글 값\n')
+        self.assertIsNone(to_text(b'\xff\xfe'))
+        self.assertIsNone(to_text(b'nul\x00inside'))
+
+    def test_sniff(self):
+        cases = {
+            b'': 'empty',
+            POD: 'protobuf',
+            b'  {"a": 1}': 'json',
+            b'# comment\nkind: Pod\n': 'yaml',
+            b'plain text': 'text',
+            BINARY: 'binary',
+        }
+        for value, content_type in cases.items():
+            with self.subTest(value=value[:10]):
+                self.assertEqual(sniff_content_type(value), content_type)
+
+    def test_decode_k8s_protobuf(self):
+        decoded = decode_k8s_protobuf(POD)
+        self.assertEqual((decoded['api_version'], decoded['kind']), ('v1', 'Pod'))
+        self.assertEqual(decoded['object'], [{'field': 1, 'message': [{'field': 1, 'string': 'coredns'}]}])
+
+    def test_decode_limits(self):
+        with self.assertRaises(DecodeError):
+            decode_value(b'{"a": 1}', 'json', max_size=4)
+        with self.assertRaises(DecodeError):
+            decode_value(b'{"a": ', 'json', max_size=1024)
+
+
+class BinaryValueViewTests(EtcdViewTestMixin, TestCase):
+    initial_data = {b'/bin': BINARY, b'/pod': POD, b'/text': '값'.encode()}
+
+    def setUp(self):
+        super().setUp()
+        # etcdctl 을 거치는 경로 (stdin 으로 값 전달, -w json 의 base64 값)
+        self.service.backend = self.service.exec_backend = make_exec_backend(self.cluster, self.backend)
+
+    def get(self, key, **params):
+        response = self.client.get(self.url('kv/'), {'key': key, **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_binary_value_is_base64(self):
+        result = self.get('/bin')
+        self.assertEqual(result['encoding'], 'base64')
+        self.assertEqual(result['content_type'], 'binary')
+        self.assertEqual(result['size'], 256)
+        self.assertEqual(base64.b64decode(result['value']), BINARY)
+
+    def test_text_value_is_utf8(self):
+        result = self.get('/text')
+        self.assertEqual((result['encoding'], result['value']), ('utf-8', '값'))
+
+    def test_decode_protobuf(self):
+        result = self.get('/pod', decode='true')
+        self.assertEqual(result['content_type'], 'protobuf')
+        self.assertEqual(result['decoded']['kind'], 'Pod')
+
+    def test_put_base64_round_trip(self):
+        value = b'\x00\xff-not-a-flag\n\x80'
+        response = self.client.post(
+            self.url('kv/'),
+            {'key': '/new', 'value': base64.b64encode(value).decode(), 'encoding': 'base64'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.backend.range(b'/new')['kvs'][0]['value'], value)
+        self.assertEqual(base64.b64decode(self.get('/new')['value']), value)
+
+    def test_put_invalid_base64(self):
+        response = self.client.post(
+            self.url('kv/'), {'key': '/new', 'value': '@@@', 'encoding': 'base64'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,210 @@
+import time
+from unittest import mock
+
+from django.test import TestCase
+
+from apps.etcd.backends import EtcdBackendError
+from apps.etcd.index import KeyIndex, KeyIndexWatcher, key_indexes
+from apps.etcd.tests.fakes import MemoryBackend, make_cluster, make_service
+
+
+KEYS = [
+    b'/registry/pods/a/1',
+    b'/registry/pods/a/2',
+    b'/registry/pods/b/1',
+    b'/registry/services/x',
+    b'/registry/version',
+]
+
+
+def put(key):
+    return {'type': 'PUT', 'kv': {'key': key}}
+
+
+def delete(key):
+    return {'type': 'DELETE', 'kv': {'key': key}}
+
+
+def wait_until(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('condition not met')
+        time.sleep(0.01)
+
+
+class KeyIndexTests(TestCase):
+    def setUp(self):
+        self.index = KeyIndex(b'/')
+        self.index.load(list(KEYS), 10)
+
+    def test_range(self):
+        keys, more, revision = self.index.range(b'/registry/pods/', b'/registry/pods0', limit=2)
+        self.assertEqual(keys, KEYS[:2])
+        self.assertTrue(more)
+        self.assertEqual(revision, 10)
+        self.assertEqual(self.index.range(b'/registry/s', b'\0')[0], KEYS[3:])
+        self.assertEqual(self.index.count(b'/registry/pods/a/', b'/registry/pods/a0'), 2)
+
+    def test_apply(self):
+        self.index.apply([
+            put(b'/registry/pods/a/0'),
+            put(b'/registry/pods/a/1'),
+            delete(b'/registry/version'),
+            delete(b'/registry/missing'),
+        ], 12)
+        self.assertEqual(self.index.range(b'/', b'0')[0], [b'/registry/pods/a/0'] + KEYS[:4])
+        self.assertEqual(self.index.revision, 12)
+
+        # 이미 반영한 것보다 오래된 응답이 revision 을 되돌리지 않는다
+        self.index.apply([], 11)
+        self.assertEqual(self.index.revision, 12)
+
+    def test_children(self):
+        children, more, _ = self.index.children(b'/registry/', b'/registry/', limit=10)
+        self.assertFalse(more)
+        self.assertEqual(children, {
+            b'pods': {'is_dir': True, 'count': 3},
+            b'services': {'is_dir': True, 'count': 1},
+            b'version': {'is_dir': False, 'count': 0},
+        })
+
+        children, more, _ = self.index.children(b'/registry/', b'/registry/', limit=1)
+        self.assertEqual(list(children), [b'pods'])
+        self.assertTrue(more)
+        # 다음 페이지는 건너뛴 디렉터리 다음부터
+        children, _, _ = self.index.children(b'/registry/', b'/registry/pods0', limit=10)
+        self.assertEqual(list(children), [b'services', b'version'])
+
+    def test_covers(self):
+        self.assertTrue(self.index.covers(b'/registry/'))
+        self.assertTrue(self.index.covers(b'/'))
+        self.assertFalse(self.index.covers(b''))
+        self.assertFalse(self.index.covers(b'compact_rev_key'))
+        self.assertTrue(KeyIndex().covers(b''))
+
+
+class KeyIndexWatcherTests(TestCase):
+    def setUp(self):
+        self.backend = MemoryBackend({key: b'' for key in KEYS})
+        self.service = make_service(make_cluster(), self.backend)
+        self.watch_starts = []
+        self.on_first_watch = None
+        watch = self.backend.watch
+
+        def record(key, range_end=None, start_revision=0):
+            self.watch_starts.append(start_revision)
+            if len(self.watch_starts) == 1 and self.on_first_watch:
+                self.on_first_watch()
+            return watch(key, range_end, start_revision)
+
+        self.backend.watch = record
+
+    def start(self):
+        watcher = KeyIndexWatcher(self.service, retry_interval=0.01)
+        self.addCleanup(watcher.join, 2)
+        self.addCleanup(watcher.stop)
+        watcher.start()
+        wait_until(lambda: watcher.ready and len(self.watch_starts) >= 1)
+        return watcher
+
+    def test_follows_changes(self):
+        watcher = self.start()
+        self.assertEqual(len(watcher.index), len(KEYS))
+        self.assertEqual(self.watch_starts, [self.backend.revision + 1])
+
+        self.backend.put(b'/registry/pods/c/1', b'')
+        self.backend.delete_range(b'/registry/version')
+        wait_until(lambda: watcher.index.revision == self.backend.revision)
+        self.assertEqual(watcher.index.count(b'/', b'0'), len(KEYS))
+        self.assertEqual(watcher.index.count(b'/registry/pods/c/', b'/registry/pods/c0'), 1)
+
+    def test_resumes_after_watch_error(self):
+        def fail():
+            self.backend.put(b'/registry/while-down', b'')
+            raise EtcdBackendError('connection reset')
+
+        self.on_first_watch = fail
+        with self.assertLogs('apps.etcd.index', 'WARNING'):
+            watcher = self.start()
+            wait_until(lambda: len(self.watch_starts) == 2)
+        # 끊긴 동안의 변경은 다시 읽은 snapshot 에 들어 있고, 그 다음 revision 부터 watch
+        self.assertEqual(self.watch_starts[1], self.backend.revision + 1)
+        self.assertEqual(watcher.index.count(b'/registry/while-down', b'/registry/while-down\0'), 1)
+
+        self.backend.put(b'/registry/new', b'')
+        wait_until(lambda: watcher.index.revision == self.backend.revision)
+        self.assertEqual(watcher.index.count(b'/registry/new', b'/registry/new\0'), 1)
+
+    def test_compaction_triggers_new_snapshot(self):
+        def compact():
+            self.backend.put(b'/registry/compacted', b'')
+            self.backend.compact_revision = self.backend.revision
+
+        self.on_first_watch = compact
+        watcher = self.start()
+        wait_until(lambda: len(self.watch_starts) == 2 and watcher.ready)
+        self.assertEqual(self.watch_starts[1], self.backend.revision + 1)
+        self.assertEqual(watcher.index.count(b'/registry/compacted', b'/registry/compacted\0'), 1)
+
+    def test_stop_on_quiet_prefix(self):
+        watcher = self.start()
+        watcher.stop()
+        watcher.join(2)
+        self.assertFalse(watcher.is_alive())
+
+    def test_stop_while_opening_watch(self):
+        watcher = KeyIndexWatcher(self.service, retry_interval=0.01)
+        # watch 를 여는 도중 stop() 되면 스트림이 열려 있어도 바로 닫고 끝난다
+        self.on_first_watch = watcher.stop
+        watcher.start()
+        watcher.join(2)
+        self.assertFalse(watcher.is_alive())
+
+
+class ServiceIndexPathTests(TestCase):
+    def setUp(self):
+        self.backend = MemoryBackend({
+            **{key: b'' for key in KEYS},
+            b'compact_rev_key': b'',
+            b'health': b'',
+        })
+        self.cluster = make_cluster()
+        self.service = make_service(self.cluster, self.backend)
+        patcher = mock.patch.object(key_indexes, 'enabled', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(key_indexes.stop, self.cluster.pk)
+        key_indexes.get(self.service)
+        wait_until(lambda: key_indexes.get(self.service) is not None)
+
+    def test_keys_under_index_prefix(self):
+        result = self.service.get_keys('/registry/pods/', limit=2)
+        self.assertEqual(result['source'], 'index')
+        self.assertEqual(result['keys'], ['/registry/pods/a/1', '/registry/pods/a/2'])
+        self.assertTrue(result['has_more'])
+
+    def test_keys_outside_index_prefix_come_from_etcd(self):
+        result = self.service.get_keys('', limit=100)
+        self.assertNotEqual(result.get('source'), 'index')
+        self.assertEqual(result['count'], len(KEYS) + 2)
+        self.assertIn('health', result['keys'])
+
+    def test_children(self):
+        result = self.service.list_children('/registry/pods', limit=10)
+        self.assertEqual(result['source'], 'index')
+        self.assertEqual([child['name'] for child in result['children']], ['a', 'b'])
+
+        # 자식 목록은 항상 '/' 로 끝나는 경로 아래라 인덱스 범위 안이다
+        result = self.service.list_children('', limit=10)
+        self.assertEqual(result['source'], 'index')
+        self.assertEqual([child['name'] for child in result['children']], ['registry'])
+
+    def test_search(self):
+        result = self.service.search_keys('/registry/', '*pods*', 'glob', limit=10)
+        self.assertEqual(result['source'], 'index')
+        self.assertEqual(len([r for r in result['results'] if r['type'] == 'match']), 3)
+
+        result = self.service.search_keys('', 'h*', 'glob', limit=10)
+        self.assertEqual(result['source'], 'etcd')
+        self.assertEqual([r['key'] for r in result['results'] if r['type'] == 'match'], ['health'])
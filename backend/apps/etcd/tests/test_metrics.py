@@ -0,0 +1,28 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from apps.etcd import views
+
+
+@override_settings(ETCD_METRICS_ALLOWED_IPS=['10.0.0.0/8'], ETCD_METRICS_TOKEN='secret')
+class MetricsAccessTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(views, 'render_latest', return_value=(b'etcd_calls 1\n', 'text/plain'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_rejects_other_addresses(self):
+        response = self.client.get('/metrics', REMOTE_ADDR='192.168.0.5')
+        self.assertEqual(response.status_code, 403)
+
+    def test_allows_listed_network(self):
+        response = self.client.get('/metrics', REMOTE_ADDR='10.1.2.3')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'etcd_calls 1\n')
+
+    def test_token(self):
+        response = self.client.get('/metrics', REMOTE_ADDR='192.168.0.5', headers={'Authorization': 'Bearer secret'})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get('/metrics', REMOTE_ADDR='10.1.2.3', headers={'Authorization': 'Bearer wrong'})
+        self.assertEqual(response.status_code, 403)
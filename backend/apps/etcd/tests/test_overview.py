@@ -0,0 +1,70 @@
+import time
+from unittest import mock
+
+from django.test import TestCase
+
+from apps.etcd.backends import EtcdBackendError, ExecBackend
+from apps.etcd.members import EtcdPodSelector
+from apps.etcd.tests.fakes import EtcdViewTestMixin, MemoryBackend, make_cluster, make_service
+
+
+class ClusterOverviewTests(TestCase):
+    def setUp(self):
+        self.backend = MemoryBackend()
+        self.service = make_service(make_cluster(), self.backend)
+
+    def test_timeout_is_passed_to_each_probe(self):
+        result = self.service.get_cluster_overview(timeout=2)
+        self.assertTrue(result['success'])
+        self.assertEqual(result['errors'], {})
+        self.assertEqual(self.backend.probe_timeouts, [2, 2, 2])
+
+    def test_partial_failure_is_success(self):
+        self.backend.probe_errors['member_list'] = EtcdBackendError('Command timeout')
+        result = self.service.get_cluster_overview(timeout=2)
+        self.assertTrue(result['success'])
+        self.assertIsNone(result['members'])
+        self.assertEqual(result['errors'], {'members': 'Command timeout'})
+
+    def test_all_probes_failing_is_not_success(self):
+        for name in ('endpoint_health', 'endpoint_status', 'member_list'):
+            self.backend.probe_errors[name] = EtcdBackendError('No etcd pod found')
+        result = self.service.get_cluster_overview(timeout=2)
+        self.assertFalse(result['success'])
+        self.assertIn('health: No etcd pod found', result['error'])
+
+
+class ExecProbeTimeoutTests(TestCase):
+    def setUp(self):
+        backend = ExecBackend.__new__(ExecBackend)
+        backend.cluster = make_cluster()
+        backend.pods = EtcdPodSelector(lambda namespace: ['etcd-0', 'etcd-1'])
+        self.backend = backend
+
+    def test_retry_shares_one_deadline(self):
+        timeouts = []
+
+        def slow_pod(command, namespace, pod_name, input=None, timeout=30):
+            timeouts.append(timeout)
+            time.sleep(timeout)
+            return {'success': False, 'error': 'Command timeout'}
+
+        with mock.patch.object(self.backend, '_exec_etcdctl_on', side_effect=slow_pod):
+            with self.assertRaisesMessage(EtcdBackendError, 'Command timeout'):
+                self.backend.endpoint_health(timeout=0.2)
+
+        # 첫 pod 에서 제한 시간을 다 썼으므로 다른 pod 로 다시 시도하지 않는다
+        self.assertEqual(len(timeouts), 1)
+        self.assertLessEqual(timeouts[0], 0.2)
+
+
+class ClusterHealthViewTests(EtcdViewTestMixin, TestCase):
+    def test_unreachable_cluster_is_unhealthy_and_not_cached(self):
+        for name in ('endpoint_health', 'endpoint_status', 'member_list'):
+            self.backend.probe_errors[name] = EtcdBackendError('No etcd pod found')
+
+        for _ in range(2):
+            response = self.client.get(self.url('health/'))
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(response.json()['success'])
+            self.assertEqual(response['X-Cache'], 'MISS')
@@ -0,0 +1,125 @@
+from django.test import TestCase
+
+from apps.etcd.pagination import InvalidCursor, decode_cursor, encode_cursor
+from apps.etcd.tests.fakes import (
+    EtcdViewTestMixin, MemoryBackend, make_cluster, make_exec_backend, make_service,
+)
+
+
+KEYS = {b'/app/%02d' % i: b'v%d' % i for i in range(25)}
+
+TREE = {
+    b'/tree/a/1': b'',
+    b'/tree/a/2': b'',
+    b'/tree/a/3': b'',
+    b'/tree/b': b'',
+    b'/tree/c/1': b'',
+    b'/tree/d/x/1': b'',
+    b'/tree/d/x/2': b'',
+    b'/tree/e': b'',
+}
+
+
+class CursorTests(TestCase):
+    def test_round_trip(self):
+        token = encode_cursor(b'/bin\xff\x00key', 42)
+        self.assertNotIn('=', token)
+        self.assertEqual(decode_cursor(token), (b'/bin\xff\x00key', 42))
+
+    def test_invalid(self):
+        for token in ('', 'garbage!', encode_cursor(b'/a', 0)):
+            with self.subTest(token=token):
+                with self.assertRaises(InvalidCursor):
+                    decode_cursor(token)
+
+
+class GetKeysPaginationTests(TestCase):
+    def setUp(self):
+        self.memory = MemoryBackend(KEYS)
+        self.cluster = make_cluster()
+
+    def pages(self, service, limit, between_pages=None):
+        pages = []
+        cursor = None
+        while True:
+            result = service.get_keys('/app/', limit=limit, cursor=cursor)
+            self.assertTrue(result['success'], result)
+            pages.append(result)
+            if between_pages:
+                between_pages()
+                between_pages = None
+            if not result['has_more']:
+                self.assertIsNone(result['next_cursor'])
+                return pages
+            cursor = result['next_cursor']
+
+    def check_all_pages(self, service):
+        pages = self.pages(service, limit=10)
+        self.assertEqual([page['count'] for page in pages], [10, 10, 5])
+        keys = [key for page in pages for key in page['keys']]
+        self.assertEqual(keys, [k.decode() for k in sorted(KEYS)])
+
+    def test_memory_backend(self):
+        self.check_all_pages(make_service(self.cluster, self.memory))
+
+    def test_exec_backend(self):
+        # etcdctl 에는 NUL 을 넘길 수 없어 마지막 키부터 한 개 더 읽고 건너뛰는 경로
+        self.check_all_pages(make_service(self.cluster, make_exec_backend(self.cluster, self.memory)))
+
+    def test_pages_are_pinned_to_first_revision(self):
+        def change():
+            self.memory.put(b'/app/10a', b'new')
+            self.memory.delete_range(b'/app/20')
+
+        pages = self.pages(make_service(self.cluster, self.memory), limit=10, between_pages=change)
+        keys = [key for page in pages for key in page['keys']]
+        self.assertEqual(keys, [k.decode() for k in sorted(KEYS)])
+        self.assertEqual({page['revision'] for page in pages}, {pages[0]['revision']})
+
+    def test_cursor_from_other_prefix(self):
+        service = make_service(self.cluster, self.memory)
+        result = service.get_keys('/other/', limit=10, cursor=encode_cursor(b'/app/05', self.memory.revision))
+        self.assertFalse(result['success'])
+
+
+class ListChildrenPaginationTests(TestCase):
+    def setUp(self):
+        self.service = make_service(make_cluster(), MemoryBackend(TREE))
+
+    def test_children_pages(self):
+        names = []
+        cursor = None
+        while True:
+            result = self.service.list_children('/tree', limit=2, cursor=cursor, batch_size=2)
+            self.assertTrue(result['success'], result)
+            names.extend((child['name'], child['is_dir']) for child in result['children'])
+            if not result['has_more']:
+                break
+            cursor = result['next_cursor']
+
+        self.assertEqual(names, [
+            ('a', True), ('b', False), ('c', True), ('d', True), ('e', False),
+        ])
+
+    def test_skipped_directory_count_is_approximate(self):
+        result = self.service.list_children('/tree', limit=10, batch_size=2)
+        children = {child['name']: child for child in result['children']}
+        self.assertTrue(children['a']['approximate'])
+        self.assertLessEqual(children['a']['count'], 3)
+        self.assertEqual(children['c']['count'], 1)
+
+
+class KeyListViewTests(EtcdViewTestMixin, TestCase):
+    initial_data = KEYS
+
+    def test_next_cursor(self):
+        first = self.client.get(self.url('keys/'), {'prefix': '/app/', 'limit': 20}).json()
+        self.assertTrue(first['has_more'])
+        second = self.client.get(
+            self.url('keys/'), {'prefix': '/app/', 'limit': 20, 'cursor': first['next_cursor']}
+        ).json()
+        self.assertEqual(first['keys'] + second['keys'], [k.decode() for k in sorted(KEYS)])
+
+    def test_invalid_cursor_is_bad_request(self):
+        response = self.client.get(self.url('keys/'), {'prefix': '/app/', 'cursor': 'garbage!'})
+        self.assertEqual(response.status_code, 400)
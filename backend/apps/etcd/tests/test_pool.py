@@ -0,0 +1,141 @@
+import asyncio
+import time
+from unittest import mock
+
+from django.test import TestCase
+
+from apps.etcd.index import KeyIndexWatcher, key_indexes
+from apps.etcd.pool import EtcdServicePool, service_pool
+from apps.etcd.tests.fakes import EtcdViewTestMixin, MemoryBackend, make_cluster, make_service
+from apps.etcd.watch import WatchChannel, watch_hub
+
+
+class ServicePoolTests(TestCase):
+    def setUp(self):
+        self.clusters = [make_cluster(f'c{i}') for i in range(3)]
+
+    def make_pool(self, **kwargs):
+        return EtcdServicePool(factory=lambda cluster: mock.Mock(cluster=cluster), **kwargs)
+
+    def checkout(self, pool, cluster):
+        """빌렸다가 바로 반납"""
+        service = pool.acquire(cluster)
+        pool.release(service)
+        return service
+
+    def test_reuses_service(self):
+        pool = self.make_pool()
+        self.assertIs(self.checkout(pool, self.clusters[0]), self.checkout(pool, self.clusters[0]))
+
+    def test_evicted_service_is_closed(self):
+        pool = self.make_pool(max_size=2)
+        first, second, third = [self.checkout(pool, cluster) for cluster in self.clusters]
+        first.close.assert_called_once_with()
+        second.close.assert_not_called()
+        third.close.assert_not_called()
+        self.assertEqual(len(pool), 2)
+
+    def test_expired_service_is_closed(self):
+        pool = self.make_pool(ttl=0.01)
+        first = self.checkout(pool, self.clusters[0])
+        time.sleep(0.02)
+        second = self.checkout(pool, self.clusters[0])
+        self.assertIsNot(first, second)
+        first.close.assert_called_once_with()
+
+    def test_invalidated_and_replaced_services_are_closed(self):
+        pool = self.make_pool()
+        first = self.checkout(pool, self.clusters[0])
+        pool.invalidate(self.clusters[0].pk)
+        first.close.assert_called_once_with()
+
+        second = self.checkout(pool, self.clusters[0])
+        # 클러스터가 수정되면 이전 키의 서비스는 새 서비스로 교체되며 닫힌다
+        self.clusters[0].save()
+        self.checkout(pool, self.clusters[0])
+        second.close.assert_called_once_with()
+
+    def test_evicted_service_is_closed_after_last_release(self):
+        pool = self.make_pool(max_size=1)
+        first = pool.acquire(self.clusters[0])
+        again = pool.acquire(self.clusters[0])
+        self.checkout(pool, self.clusters[1])
+        # 다른 요청이 쓰는 동안에는 풀에서 빠져도 닫지 않는다
+        first.close.assert_not_called()
+
+        pool.release(first)
+        first.close.assert_not_called()
+        pool.release(again)
+        first.close.assert_called_once_with()
+        # 풀에서 빠진 뒤에는 새 서비스를 만든다
+        self.assertIsNot(self.checkout(pool, self.clusters[0]), first)
+
+    def test_invalidated_service_is_closed_after_release(self):
+        pool = self.make_pool()
+        service = pool.acquire(self.clusters[0])
+        pool.invalidate(self.clusters[0].pk)
+        service.close.assert_not_called()
+        pool.release(service)
+        service.close.assert_called_once_with()
+
+    def test_close_failure_does_not_break_pool(self):
+        pool = self.make_pool(max_size=1)
+        self.checkout(pool, self.clusters[0]).close.side_effect = RuntimeError('boom')
+        with self.assertLogs('apps.etcd.pool', 'WARNING'):
+            self.checkout(pool, self.clusters[1])
+        self.assertEqual(len(pool), 1)
+
+
+class ViewServiceLeaseTests(EtcdViewTestMixin, TestCase):
+    initial_data = {b'/app/a': b'1'}
+
+    def test_service_is_released_after_response(self):
+        response = self.client.get(self.url('keys/'), {'prefix': '/app/'})
+        self.assertEqual(response.status_code, 200)
+        service_pool.release.assert_called_once_with(self.service)
+
+    async def test_streamed_service_is_released_after_stream(self):
+        response = await self.async_client.get(self.url('export/'), {'prefix': '/app/'})
+        self.assertEqual(response.status_code, 200)
+        service_pool.release.assert_not_called()
+        async for _ in response.streaming_content:
+            pass
+        service_pool.release.assert_called_once_with(self.service)
+
+
+class ServiceCloseTests(TestCase):
+    """EtcdService.close() 가 그 서비스로 시작한 백그라운드 스레드만 멈추는지"""
+
+    def setUp(self):
+        self.cluster = make_cluster()
+        self.service = make_service(self.cluster, MemoryBackend())
+        self.other = make_service(self.cluster, MemoryBackend())
+
+    def add_index_watcher(self, service):
+        watcher = KeyIndexWatcher(service)
+        key_indexes._watchers[self.cluster.pk] = watcher
+        self.addCleanup(key_indexes._watchers.pop, self.cluster.pk, None)
+        return watcher
+
+    def test_stops_own_index_watcher(self):
+        watcher = self.add_index_watcher(self.service)
+        self.other.close()
+        self.assertFalse(watcher._stopped.is_set())
+
+        self.service.close()
+        self.assertTrue(watcher._stopped.is_set())
+        self.assertNotIn(self.cluster.pk, key_indexes._watchers)
+
+    async def test_stops_own_watch_channel_and_notifies_subscribers(self):
+        key = (self.cluster.pk, b'/app/')
+        channel = WatchChannel(watch_hub, key, self.service, b'/app/')
+        watch_hub._channels[key] = channel
+        self.addCleanup(watch_hub._channels.pop, key, None)
+        subscription = channel.subscribe(asyncio.get_running_loop(), maxsize=10)
+
+        self.other.close()
+        self.assertIn(key, watch_hub._channels)
+
+        self.service.close()
+        self.assertNotIn(key, watch_hub._channels)
+        self.assertEqual(await subscription.get(timeout=1), {'type': 'closed'})
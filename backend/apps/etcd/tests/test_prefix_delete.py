@@ -0,0 +1,137 @@
+import json
+
+from django.test import TestCase
+
+from apps.etcd.backends import prefix_range_end
+from apps.etcd.models import PrefixDeleteJob
+from apps.etcd.tests.fakes import EtcdViewTestMixin, MemoryBackend, make_cluster, make_service
+
+
+KEYS = {b'/app/%02d' % i: b'value-%d' % i for i in range(12)}
+KEYS[b'/apple'] = b'not under /app/'
+
+
+class PrefixRangeEndTests(TestCase):
+    def test_increments_last_byte(self):
+        self.assertEqual(prefix_range_end(b'/registry/'), b'/registry0')
+
+    def test_drops_trailing_ff(self):
+        self.assertEqual(prefix_range_end(b'a\xff\xff'), b'b')
+
+    def test_whole_keyspace(self):
+        self.assertEqual(prefix_range_end(b''), b'\0')
+        self.assertEqual(prefix_range_end(b'\xff'), b'\0')
+
+
+class PrefixDeleteServiceTests(TestCase):
+    def setUp(self):
+        self.backend = MemoryBackend(KEYS)
+        self.service = make_service(make_cluster(), self.backend)
+
+    def test_estimate_does_not_delete(self):
+        result = self.service.estimate_prefix_delete('/app/', batch_size=5, scan_batch_size=4)
+        self.assertTrue(result['success'], result)
+        self.assertEqual((result['count'], result['batches']), (12, 3))
+        self.assertEqual(result['key_bytes'], 12 * len(b'/app/00'))
+        self.assertEqual(result['value_bytes'], sum(len(KEYS[b'/app/%02d' % i]) for i in range(12)))
+        self.assertEqual(result['revision'], self.backend.revision)
+        self.assertEqual(self.backend.range(b'/app/', b'/app0')['count'], 12)
+
+    def test_deletes_in_batches(self):
+        batches = list(self.service.delete_prefix_batches('/app/', batch_size=5))
+        self.assertEqual([b['deleted'] for b in batches], [5, 5, 2])
+        self.assertEqual([b['last_key'] for b in batches], ['/app/04', '/app/09', '/app/11'])
+        # batch 하나가 txn(= raft proposal) 하나
+        self.assertEqual(self.backend.calls.count('txn'), 3)
+        self.assertEqual(self.backend.calls.count('delete_range'), 0)
+        self.assertEqual(batches[-1]['revision'], self.backend.revision)
+
+        self.assertEqual(self.backend.range(b'/app/', b'/app0')['count'], 0)
+        self.assertEqual(self.backend.range(b'/apple')['count'], 1)
+
+    def test_keys_added_during_delete_are_included(self):
+        batches = self.service.delete_prefix_batches('/app/', batch_size=5)
+        next(batches)
+        self.backend.put(b'/app/99', b'late')
+        self.assertEqual(sum(b['deleted'] for b in batches), 8)
+        self.assertEqual(self.backend.range(b'/app/', b'/app0')['count'], 0)
+
+
+class PrefixDeleteViewTests(EtcdViewTestMixin, TestCase):
+    initial_data = KEYS
+
+    def remaining(self):
+        return self.backend.range(b'/app/', b'/app0')['count']
+
+    async def post(self, **data):
+        return await self.async_client.post(
+            self.url('delete-prefix/'), {'prefix': '/app/', 'pause': 0, **data}, content_type='application/json'
+        )
+
+    @staticmethod
+    async def lines(response):
+        async for chunk in response.streaming_content:
+            yield json.loads(chunk)
+
+    async def test_dry_run(self):
+        response = await self.post(dry_run=True, batch_size=5)
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertTrue(body['dry_run'])
+        self.assertEqual((body['count'], body['batches']), (12, 3))
+        self.assertEqual(self.remaining(), 12)
+        self.assertFalse(await PrefixDeleteJob.objects.aexists())
+
+    async def test_streams_progress_per_batch(self):
+        response = await self.post(batch_size=5)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        lines = [line async for line in self.lines(response)]
+        self.assertEqual(
+            [line['type'] for line in lines], ['started', 'progress', 'progress', 'progress', 'done']
+        )
+        self.assertEqual([line['deleted'] for line in lines[1:4]], [5, 10, 12])
+        self.assertEqual(lines[-1]['status'], 'completed')
+        self.assertEqual(self.remaining(), 0)
+
+        job = await PrefixDeleteJob.objects.aget(pk=response['X-Delete-Job'])
+        self.assertEqual((job.status, job.deleted, job.batches), ('completed', 12, 3))
+        self.assertIsNotNone(job.finished_at)
+
+    async def test_cancel_stops_after_current_batch(self):
+        response = await self.post(batch_size=5)
+        job_id = response['X-Delete-Job']
+        lines = self.lines(response)
+        self.assertEqual((await lines.__anext__())['type'], 'started')
+        self.assertEqual((await lines.__anext__())['deleted'], 5)
+
+        cancel = await self.async_client.delete(self.url(f'delete-prefix/{job_id}/'))
+        self.assertEqual(cancel.status_code, 200)
+        self.assertTrue(cancel.json()['cancelled'])
+
+        rest = [line async for line in lines]
+        self.assertEqual([line['type'] for line in rest], ['done'])
+        self.assertEqual(rest[0]['status'], 'cancelled')
+        self.assertEqual(self.remaining(), 7)
+
+        status = (await self.async_client.get(self.url(f'delete-prefix/{job_id}/'))).json()
+        self.assertEqual((status['status'], status['deleted'], status['batches']), ('cancelled', 5, 1))
+
+    async def test_overlapping_delete_is_rejected(self):
+        first = await self.post(batch_size=5)
+        lines = self.lines(first)
+        await lines.__anext__()
+
+        response = await self.post(prefix='/app/0')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['job']['job_id'], first['X-Delete-Job'])
+        # 겹치지 않는 prefix 는 따로 지울 수 있다
+        self.assertEqual((await self.post(prefix='/other/', dry_run=True)).status_code, 200)
+
+        async for _ in lines:
+            pass
+
+    async def test_unknown_job(self):
+        response = await self.async_client.get(self.url('delete-prefix/missing/'))
+        self.assertEqual(response.status_code, 404)
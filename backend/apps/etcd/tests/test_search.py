@@ -0,0 +1,64 @@
+import time
+from unittest import mock
+
+from django.test import TestCase
+
+from apps.etcd.search import MAX_PATTERN_LENGTH, InvalidPattern, compile_key_matcher
+from apps.etcd.tests.fakes import EtcdViewTestMixin, MemoryBackend, make_cluster, make_service
+
+
+class KeyMatcherTests(TestCase):
+    def test_glob_and_regex(self):
+        self.assertTrue(compile_key_matcher('/app/*/flag', 'glob')('/app/a/b/flag'))
+        self.assertFalse(compile_key_matcher('/app/*', 'glob')('/other/app/x'))
+        self.assertTrue(compile_key_matcher('coredns-[0-9]+$', 'regex')('/pods/coredns-12'))
+        self.assertTrue(compile_key_matcher('(foo|bar)-[0-9]+', 'regex', ignore_case=True)('/FOO-1'))
+        # 한 글자 alternation 과 반복 밖의 ? 는 허용
+        self.assertTrue(compile_key_matcher('/(a|b)+(-x)?$', 'regex')('/abba-x'))
+
+    def test_rejects_nested_quantifiers(self):
+        for pattern in ('(a+)+$', '(a*)*b', '(?:x|y+)*', '((ab)*)+', '(a{2,})+', '(ab?)+'):
+            with self.subTest(pattern=pattern):
+                with self.assertRaises(InvalidPattern):
+                    compile_key_matcher(pattern, 'regex')
+
+    def test_rejects_alternation_inside_repeat(self):
+        for pattern in ('(a|aa)*c', '(foo|bar)+', '(?:x|xy){2,}z', '((a|ab)c)*'):
+            with self.subTest(pattern=pattern):
+                with self.assertRaises(InvalidPattern):
+                    compile_key_matcher(pattern, 'regex')
+
+    def test_rejects_long_pattern(self):
+        with self.assertRaises(InvalidPattern):
+            compile_key_matcher('a' * (MAX_PATTERN_LENGTH + 1), 'regex')
+        with self.assertRaises(InvalidPattern):
+            compile_key_matcher('*' * (MAX_PATTERN_LENGTH + 1), 'glob')
+
+
+class SearchKeysTests(TestCase):
+    def setUp(self):
+        self.service = make_service(
+            make_cluster(), MemoryBackend({b'/app/%03d' % i: b'v' for i in range(50)})
+        )
+
+    def test_deadline_checked_per_key(self):
+        def slow_match(key):
+            time.sleep(0.01)
+            return True
+
+        with mock.patch('apps.etcd.services.compile_key_matcher', return_value=slow_match):
+            result = self.service.search_keys('/app/', pattern='*', time_budget=0.05, batch_size=1000)
+            items = list(result['results'])
+
+        done = items[-1]
+        self.assertEqual(done['reason'], 'time_budget')
+        self.assertTrue(done['truncated'])
+        # batch 하나(50개)를 다 훑기 전에 멈춘다
+        self.assertLess(done['scanned'], 20)
+
+
+class SearchViewTests(EtcdViewTestMixin, TestCase):
+    def test_nested_quantifier_is_bad_request(self):
+        response = self.client.get(self.url('search/'), {'pattern': '(a+)+$', 'mode': 'regex'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('pattern', response.json())
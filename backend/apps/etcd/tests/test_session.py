@@ -0,0 +1,106 @@
+import threading
+from unittest import mock
+
+from django.test import TestCase
+
+from apps.etcd.backends import ExecBackend
+from apps.etcd.members import EtcdPodSelector
+from apps.etcd.session import EtcdExecSession, ExecSessionError, ExecSessionLost
+from apps.etcd.tests.fakes import make_cluster
+
+
+class ClosingStream:
+    """stdin 을 받은 직후 끊기는 exec 스트림"""
+
+    def __init__(self):
+        self.written = []
+
+    def is_open(self):
+        return not self.written
+
+    def write_stdin(self, data):
+        self.written.append(data)
+
+    def close(self):
+        pass
+
+
+class ExecSessionTests(TestCase):
+    def test_open_failure_is_not_lost(self):
+        session = EtcdExecSession(mock.Mock(), 'kube-system', 'etcd-0')
+        with mock.patch('apps.etcd.session.stream', side_effect=RuntimeError('forbidden')):
+            with self.assertRaises(ExecSessionError) as ctx:
+                session.run(['etcdctl', 'put', 'k', 'v'])
+        self.assertNotIsInstance(ctx.exception, ExecSessionLost)
+
+    def test_disconnect_after_write_is_lost(self):
+        ws = ClosingStream()
+        session = EtcdExecSession(mock.Mock(), 'kube-system', 'etcd-0')
+        with mock.patch('apps.etcd.session.stream', return_value=ws):
+            with self.assertRaises(ExecSessionLost):
+                session.run(['etcdctl', 'put', 'k', 'v'], timeout=1)
+        self.assertEqual(len(ws.written), 1)
+
+
+class StubSession:
+    def __init__(self, error):
+        self.error = error
+        self.runs = 0
+
+    def run(self, argv, timeout=30, input=None):
+        self.runs += 1
+        raise self.error
+
+    def close(self):
+        pass
+
+
+class StreamFallbackTests(TestCase):
+    """세션 실패 시 kubectl 로 다시 실행하는 조건"""
+
+    def setUp(self):
+        backend = ExecBackend.__new__(ExecBackend)
+        backend.cluster = make_cluster()
+        backend.exec_mode = 'stream'
+        backend._sessions = {}
+        backend._sessions_lock = threading.Lock()
+        backend.pods = EtcdPodSelector(lambda namespace: ['etcd-0', 'etcd-1'])
+        self.backend = backend
+
+        proc = mock.Mock(returncode=0)
+        proc.communicate.return_value = (b'{}', b'')
+        patchers = [
+            mock.patch('apps.etcd.backends.subprocess.Popen', return_value=proc),
+            mock.patch.object(ExecBackend, 'kubeconfig_path', '/tmp/kubeconfig'),
+        ]
+        self.popen = patchers[0].start()
+        for patcher in patchers[1:]:
+            patcher.start()
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+
+    def use_session(self, error):
+        session = StubSession(error)
+        self.backend._get_session = lambda namespace, pod_name: session
+        return session
+
+    def test_falls_back_when_session_unavailable(self):
+        self.use_session(ExecSessionError('Failed to open exec stream'))
+        result = self.backend._exec_etcdctl(['put', 'k'], input=b'v', write=True)
+        self.assertTrue(result['success'])
+        self.assertEqual(self.popen.call_count, 1)
+
+    def test_write_is_not_rerun_after_command_was_sent(self):
+        session = self.use_session(ExecSessionLost('Exec stream closed'))
+        result = self.backend._exec_etcdctl(['txn'], input=b'\n\n\n', write=True)
+        self.assertFalse(result['success'])
+        self.assertIn('Exec stream lost', result['error'])
+        self.assertEqual(session.runs, 1)
+        self.popen.assert_not_called()
+
+    def test_read_is_retried_on_another_pod_only(self):
+        session = self.use_session(ExecSessionLost('Exec stream closed'))
+        result = self.backend._exec_etcdctl(['get', 'k'])
+        self.assertFalse(result['success'])
+        self.assertEqual(session.runs, 2)
+        self.popen.assert_not_called()
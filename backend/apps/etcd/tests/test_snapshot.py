@@ -0,0 +1,174 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.etcd.backends import EtcdBackendError, ExecBackend
+from apps.etcd.members import EtcdPodSelector
+from apps.etcd.models import EtcdSnapshot
+from apps.etcd.snapshot import SnapshotBackend, SnapshotFormatError, SnapshotWriter
+from apps.etcd.tests.fakes import EtcdViewTestMixin, make_cluster
+
+
+# etcd 스냅샷 형식(bbolt 'key' / 'meta' bucket + sha256 trailer)으로 만든 작은 파일
+# 키 12개를 넣고 3개를 수정, obj1 / obj11 을 삭제했으며 마지막 revision 은 18
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'snapshot.db')
+
+
+class SnapshotBackendTests(TestCase):
+    def setUp(self):
+        self.backend = SnapshotBackend(FIXTURE)
+        self.addCleanup(self.backend.close)
+
+    def test_keyspace_at_last_revision(self):
+        self.assertEqual(self.backend.revision, 18)
+        self.assertEqual(len(self.backend.keyspace), 10)
+        self.assertNotIn(b'/registry/secrets/ns1/obj1', self.backend.keyspace.keys)
+        self.assertEqual(self.backend.keyspace.keys, sorted(self.backend.keyspace.keys))
+
+    def test_range(self):
+        resp = self.backend.range(b'/registry/pods/', b'/registry/pods0', limit=3)
+        self.assertEqual(resp['count'], 4)
+        self.assertTrue(resp['more'])
+        self.assertEqual(resp['header']['revision'], 18)
+        self.assertEqual(
+            [kv['key'] for kv in resp['kvs']],
+            [b'/registry/pods/ns0/obj0', b'/registry/pods/ns2/obj9', b'/registry/pods/ns3/obj3']
+        )
+
+    def test_key_value_fields(self):
+        kv = self.backend.range(b'/registry/pods/ns0/obj0')['kvs'][0]
+        self.assertEqual(kv['value'], b'updated')
+        self.assertEqual((kv['create_revision'], kv['mod_revision'], kv['version']), (2, 14, 2))
+
+        binary = self.backend.range(b'/registry/secrets/ns5/obj5')['kvs'][0]['value']
+        self.assertEqual(binary, bytes(range(256)) * 3)
+
+    def test_is_read_only(self):
+        with self.assertRaises(EtcdBackendError):
+            self.backend.put(b'/a', b'b')
+        with self.assertRaises(EtcdBackendError):
+            self.backend.range(b'/a', revision=5)
+
+    def test_rejects_non_bolt_file(self):
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(b'not a snapshot' * 1000)
+            f.flush()
+            with self.assertRaises(SnapshotFormatError):
+                SnapshotBackend(f.name)
+
+
+class SnapshotWriterTests(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.path = os.path.join(self.dir, 'snapshot.db')
+        with open(FIXTURE, 'rb') as f:
+            self.data = f.read()
+
+    def write(self, data, sizes=(1000, 7, 31, 4096)):
+        writer = SnapshotWriter(self.path)
+        pos = 0
+        i = 0
+        # trailer 경계가 chunk 중간에 걸리도록 여러 크기로 나눠 쓴다
+        while pos < len(data):
+            size = sizes[i % len(sizes)]
+            writer.write(data[pos:pos + size])
+            pos += size
+            i += 1
+        return writer.finish()
+
+    def test_verifies_sha256_trailer(self):
+        result = self.write(self.data)
+        self.assertTrue(result['etcd_checksum'])
+        self.assertEqual(result['size'], len(self.data))
+        self.assertEqual(result['sha256'], hashlib.sha256(self.data).hexdigest())
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), self.data)
+
+    def test_detects_corruption(self):
+        corrupted = bytearray(self.data)
+        corrupted[5000] ^= 0xff
+        with self.assertRaises(SnapshotFormatError):
+            self.write(bytes(corrupted))
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(self.path + '.part'))
+
+    def test_without_trailer(self):
+        result = self.write(self.data[:-32])
+        self.assertIsNone(result['etcd_checksum'])
+
+
+class ExecSnapshotTests(TestCase):
+    def setUp(self):
+        backend = ExecBackend.__new__(ExecBackend)
+        backend.cluster = make_cluster()
+        backend.pods = EtcdPodSelector(lambda namespace: ['etcd-0'])
+        self.backend = backend
+        patcher = mock.patch.object(ExecBackend, 'kubeconfig_path', '/tmp/kubeconfig')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_snapshot(self, returncode, stderr_text):
+        def popen(argv, stdout, stderr):
+            stderr.write(stderr_text)
+            return mock.Mock(
+                stdout=mock.Mock(read=mock.Mock(return_value=b'')),
+                returncode=returncode,
+                poll=mock.Mock(return_value=returncode),
+            )
+
+        with mock.patch('apps.etcd.backends.subprocess.Popen', side_effect=popen) as popen_mock:
+            with self.assertRaises(EtcdBackendError) as ctx:
+                list(self.backend.snapshot(timeout=10))
+        return popen_mock.call_args[0][0], str(ctx.exception)
+
+    def test_checks_tools_before_saving(self):
+        argv, _ = self.run_snapshot(1, b'Error: context deadline exceeded\n')
+        # cat / rm 이 없는 셸에서는 etcdctl 을 실행하기 전에 멈춘다
+        proc = subprocess.run(['/bin/sh', '-c', argv[-1]], env={'PATH': '/nonexistent'}, capture_output=True)
+        self.assertEqual(proc.returncode, 127)
+        self.assertEqual(proc.stderr.strip().decode(), ExecBackend.SNAPSHOT_TOOLS_MISSING)
+
+    def test_distroless_pod_without_shell(self):
+        _, error = self.run_snapshot(
+            126,
+            b'OCI runtime exec failed: exec failed: unable to start container process: '
+            b'exec: "sh": executable file not found in $PATH: unknown\n'
+            b'command terminated with exit code 126\n'
+        )
+        self.assertIn('gateway backend', error)
+
+    def test_pod_without_cat(self):
+        _, error = self.run_snapshot(127, ExecBackend.SNAPSHOT_TOOLS_MISSING.encode() + b'\n')
+        self.assertIn('distroless', error)
+
+    def test_other_errors_are_passed_through(self):
+        _, error = self.run_snapshot(1, b'{"level":"info"}\nError: context deadline exceeded\n')
+        self.assertEqual(error, 'Error: context deadline exceeded')
+
+
+class SnapshotStartTests(EtcdViewTestMixin, TestCase):
+    def post(self):
+        return self.async_client.post(self.url('snapshots/'))
+
+    async def test_concurrent_posts_start_one_snapshot(self):
+        responses = await asyncio.gather(self.post(), self.post())
+        self.assertEqual(sorted(r.status_code for r in responses), [200, 409])
+        self.assertEqual(await EtcdSnapshot.objects.filter(cluster=self.cluster).acount(), 1)
+
+    def test_stale_running_snapshot_does_not_block(self):
+        stale, _ = EtcdSnapshot.start(self.cluster.pk, self.user)
+        EtcdSnapshot.objects.filter(pk=stale.pk).update(
+            updated_at=timezone.now() - EtcdSnapshot.STALE_AFTER * 2
+        )
+        snapshot, running = EtcdSnapshot.start(self.cluster.pk, self.user)
+        self.assertIsNone(running)
+        self.assertNotEqual(snapshot.pk, stale.pk)
+        self.assertEqual(EtcdSnapshot.start(self.cluster.pk, self.user), (None, snapshot))
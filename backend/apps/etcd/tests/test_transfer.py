@@ -0,0 +1,55 @@
+import base64
+import gzip
+import json
+
+from django.test import TestCase, override_settings
+
+from apps.etcd.tests.fakes import EtcdViewTestMixin
+
+
+KEYS = {b'/app/%03d' % i: b'value-%d' % i for i in range(50)}
+
+
+@override_settings(ETCD_EXPORT_BATCH_SIZE=10)
+class ExportViewTests(EtcdViewTestMixin, TestCase):
+    initial_data = KEYS
+
+    async def test_export_streams_batch_by_batch(self):
+        response = await self.async_client.get(self.url('export/'), {'prefix': '/app/'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+
+        chunks = response.__aiter__()
+        first = await chunks.__anext__()
+        # 첫 batch 를 보낼 때까지 나머지 batch 는 읽지 않는다
+        self.assertEqual(len(first.splitlines()), 10)
+        self.assertLessEqual(self.backend.calls.count('range'), 2)
+
+        rest = [chunk async for chunk in chunks]
+        records = [json.loads(line) for line in b''.join([first] + rest).splitlines()]
+        self.assertEqual(len(records), 50)
+        self.assertEqual(self.backend.calls.count('range'), 5)
+        self.assertEqual(base64.b64decode(records[-1]['value']), b'value-49')
+
+    async def test_export_gzip(self):
+        response = await self.async_client.get(self.url('export/'), {'prefix': '/app/', 'compression': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        data = b''.join([chunk async for chunk in response])
+        self.assertEqual(len(gzip.decompress(data).splitlines()), 50)
+
+
+class ImportViewTests(EtcdViewTestMixin, TestCase):
+    def test_import_round_trip(self):
+        lines = b''.join(
+            json.dumps({'key': base64.b64encode(k).decode(), 'value': base64.b64encode(v).decode()}).encode() + b'\n'
+            for k, v in sorted(KEYS.items())
+        )
+        response = self.client.post(self.url('import/'), lines, content_type='application/octet-stream')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()['imported'], 50)
+        self.assertEqual(self.backend.range(b'/app/', b'/app0')['count'], 50)
+
+    def test_import_rejects_invalid_line(self):
+        response = self.client.post(self.url('import/'), b'{"key": 1}\n', content_type='application/octet-stream')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Line 1', response.json()['error'])
@@ -0,0 +1,147 @@
+import asyncio
+import json
+
+from django.test import TestCase, override_settings
+
+from apps.etcd.tests.fakes import EtcdViewTestMixin, MemoryBackend, make_cluster, make_service
+from apps.etcd.watch import WatchHub, watch_hub
+
+
+class WatchHubResumeTests(TestCase):
+    def setUp(self):
+        self.backend = MemoryBackend({b'/app/a': b'1'})
+        self.cluster = make_cluster()
+        self.service = make_service(self.cluster, self.backend)
+        self.hub = WatchHub()
+        self.addCleanup(self.hub.stop, self.cluster.pk)
+
+    def subscribe(self, last_revision=0):
+        return self.hub.subscribe(self.service, b'/app/', asyncio.get_running_loop(), last_revision=last_revision)
+
+    async def next_item(self, subscription):
+        item = await subscription.get(timeout=2)
+        self.assertIsNotNone(item, 'no watch event')
+        return item
+
+    async def test_new_channel_resumes_after_last_revision(self):
+        last = self.backend.revision
+        self.backend.put(b'/app/b', b'2')
+        self.backend.put(b'/app/a', b'3')
+
+        subscription = self.subscribe(last)
+        first = await self.next_item(subscription)
+        second = await self.next_item(subscription)
+        self.assertEqual((first['type'], first['key'], first['revision']), ('put', b'/app/b', last + 1))
+        self.assertEqual((second['key'], second['value'], second['version']), (b'/app/a', b'3', 2))
+        self.assertEqual(self.backend.calls.count('range'), 0)
+
+    async def test_joining_channel_that_moved_past_sends_resync(self):
+        first = self.subscribe()
+        while not first.channel.position:
+            await asyncio.sleep(0.01)
+        last = first.channel.position
+        self.backend.put(b'/app/b', b'2')
+        self.assertEqual((await self.next_item(first))['revision'], last + 1)
+
+        behind = self.subscribe(last)
+        self.assertEqual(await self.next_item(behind), {'type': 'resync', 'revision': last + 1})
+
+        # 이미 받은 위치에서 재연결하면 이어서 받는다
+        current = self.subscribe(last + 1)
+        self.backend.put(b'/app/c', b'3')
+        self.assertEqual((await self.next_item(current))['key'], b'/app/c')
+        self.assertEqual((await self.next_item(behind))['key'], b'/app/c')
+
+    async def test_compacted_revision_sends_resync(self):
+        last = self.backend.revision
+        self.backend.put(b'/app/b', b'2')
+        self.backend.compact_revision = self.backend.revision
+
+        subscription = self.subscribe(last)
+        item = await self.next_item(subscription)
+        self.assertEqual(item['type'], 'resync')
+
+        # 현재 revision 부터 다시 watch
+        while subscription.channel.revision != self.backend.revision:
+            await asyncio.sleep(0.01)
+        self.backend.put(b'/app/c', b'3')
+        self.assertEqual((await self.next_item(subscription))['key'], b'/app/c')
+
+
+class WatchChannelStopTests(TestCase):
+    def setUp(self):
+        self.backend = MemoryBackend({b'/app/a': b'1'})
+        self.service = make_service(make_cluster(), self.backend)
+        self.hub = WatchHub()
+
+    async def test_stop_on_quiet_prefix(self):
+        subscription = self.hub.subscribe(self.service, b'/app/', asyncio.get_running_loop())
+        channel = subscription.channel
+        while 'watch' not in self.backend.calls:
+            await asyncio.sleep(0.01)
+
+        self.hub.stop(self.service.cluster.pk)
+        channel.join(2)
+        self.assertFalse(channel.is_alive())
+        self.assertEqual(await subscription.get(timeout=1), {'type': 'closed'})
+
+    async def test_stop_while_opening_watch(self):
+        watch = self.backend.watch
+        streams = []
+
+        def stop_then_open(*args, **kwargs):
+            # watch 를 여는 사이에 stop() 이 먼저 끝난 경우
+            self.hub.stop(self.service.cluster.pk)
+            streams.append(watch(*args, **kwargs))
+            return streams[-1]
+
+        self.backend.watch = stop_then_open
+        channel = self.hub.subscribe(self.service, b'/app/', asyncio.get_running_loop()).channel
+        channel.join(2)
+        self.assertFalse(channel.is_alive())
+        self.assertTrue(streams[0]._closed.is_set())
+
+
+@override_settings(ETCD_WATCH_KEEPALIVE=2)
+class KeyWatchViewTests(EtcdViewTestMixin, TestCase):
+    initial_data = {b'/app/a': b'1'}
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(watch_hub.stop, self.cluster.pk)
+
+    async def events(self, count, last_event_id):
+        response = await self.async_client.get(
+            self.url('watch/'), {'prefix': '/app/'}, headers={'Last-Event-ID': last_event_id}
+        )
+        self.assertEqual(response.status_code, 200)
+        events = []
+        async for chunk in response.streaming_content:
+            lines = dict(line.split(': ', 1) for line in chunk.decode().strip().split('\n'))
+            events.append((lines['event'], lines.get('id'), json.loads(lines['data'])))
+            if len(events) == count:
+                break
+        return events
+
+    async def test_resumes_from_last_event_id(self):
+        last = self.backend.revision
+        self.backend.put(b'/app/b', b'2')
+
+        events = await self.events(2, str(last))
+        self.assertEqual(events[0][0], 'ready')
+        self.assertEqual(events[1][:2], ('put', str(last + 1)))
+        self.assertEqual(events[1][2]['key'], '/app/b')
+
+    async def test_resync_when_events_were_missed(self):
+        other = watch_hub.subscribe(self.service, b'/app/', asyncio.get_running_loop())
+        self.addCleanup(other.close)
+        last = self.backend.revision
+        self.backend.put(b'/app/b', b'2')
+        await other.get(timeout=2)
+
+        events = await self.events(2, str(last))
+        self.assertEqual(events[1][0], 'resync')
+
+    async def test_invalid_last_event_id_is_ignored(self):
+        events = await self.events(1, 'garbage')
+        self.assertEqual(events[0][0], 'ready')
@@ -0,0 +1,112 @@
+import base64
+import binascii
+import gzip
+import io
+import json
+import zlib
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Tuple
+
+try:
+    import zstandard
+except ImportError:  # zstd 압축은 선택 사항
+    zstandard = None
+
+
+COMPRESSIONS = ('none', 'gzip', 'zstd')
+
+CONTENT_TYPES = {
+    'none': 'application/x-ndjson',
+    'gzip': 'application/gzip',
+    'zstd': 'application/zstd',
+}
+
+FILE_EXTENSIONS = {
+    'none': 'ndjson',
+    'gzip': 'ndjson.gz',
+    'zstd': 'ndjson.zst',
+}
+
+
+class InvalidRecord(ValueError):
+    """import 할 수 없는 NDJSON 레코드"""
+
+
+def check_compression(compression: str) -> None:
+    if compression not in COMPRESSIONS:
+        raise ValueError(f'Unsupported compression: {compression}')
+    if compression == 'zstd' and zstandard is None:
+        raise ValueError('zstd compression requires the zstandard package')
+
+
+def encode_record(kv: Dict[str, Any]) -> bytes:
+    """kv 하나를 NDJSON 한 줄로 인코딩 (key/value 는 base64, etcdctl -w json 과 동일)"""
+    return json.dumps({
+        'key': base64.b64encode(kv['key']).decode(),
+        'value': base64.b64encode(kv['value']).decode(),
+        'create_revision': kv['create_revision'],
+        'mod_revision': kv['mod_revision'],
+        'version': kv['version'],
+    }, separators=(',', ':')).encode() + b'\n'
+
+
+def decode_record(line: bytes) -> Tuple[bytes, bytes]:
+    """NDJSON 한 줄 → (key, value)"""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        raise InvalidRecord('Invalid JSON')
+    if not isinstance(record, dict):
+        raise InvalidRecord('Record must be an object')
+    if 'error' in record:
+        # export 도중 실패한 스트림의 마지막 줄
+        raise InvalidRecord(f"Export stream contains an error: {record['error']}")
+    try:
+        key = base64.b64decode(record['key'], validate=True)
+        value = base64.b64decode(record.get('value') or '', validate=True)
+    except (KeyError, TypeError, binascii.Error):
+        raise InvalidRecord('key and value must be base64 strings')
+    if not key:
+        raise InvalidRecord('Empty key')
+    return key, value
+
+
+def compress_stream(chunks: Iterable[bytes], compression: str) -> Iterator[bytes]:
+    """chunk 단위로 압축해서 바로 내보내므로 전체 출력을 메모리에 모으지 않는다"""
+    if compression == 'none':
+        yield from chunks
+        return
+
+    if compression == 'gzip':
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    else:
+        compressor = zstandard.ZstdCompressor().compressobj()
+
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def open_stream(stream: BinaryIO, compression: str) -> BinaryIO:
+    """압축 해제 reader, ``readline`` 으로 한 줄씩 읽을 수 있다"""
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=stream, mode='rb')
+    if compression == 'zstd':
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(stream))
+    return stream
+
+
+def iter_lines(stream: BinaryIO, max_line_size: int) -> Iterator[Tuple[int, bytes]]:
+    """빈 줄을 제외한 (line_no, line), 한 줄이 max_line_size 를 넘으면 InvalidRecord"""
+    line_no = 0
+    while True:
+        line = stream.readline(max_line_size + 1)
+        if not line:
+            return
+        line_no += 1
+        if len(line) > max_line_size and not line.endswith(b'\n'):
+            raise InvalidRecord(f'Line {line_no} exceeds {max_line_size} bytes')
+        line = line.strip()
+        if line:
+            yield line_no, line
@@ -2,13 +2,53 @@ from django.urls import path
 from .views import (
     KeyListView,
     KeyTreeView,
+    KeyChildrenView,
+    KeySearchView,
+    KeyspaceStatsView,
     KeyValueView,
-    ClusterHealthView
+    PrefixDeleteView,
+    PrefixDeleteJobView,
+    KeyHistoryView,
+    KeyDiffView,
+    KeyBatchView,
+    KeyExportView,
+    KeyImportView,
+    KeyWatchView,
+    ClusterHealthView,
+    SnapshotListView,
+    SnapshotDetailView,
+    SnapshotDownloadView,
+    SnapshotKeyListView,
+    SnapshotKeyTreeView,
+    SnapshotKeyChildrenView,
+    SnapshotKeySearchView,
+    SnapshotKeyspaceStatsView,
+    SnapshotKeyValueView
 )
 
 urlpatterns = [
     path('<int:cluster_id>/keys/', KeyListView.as_view(), name='etcd-keys'),
     path('<int:cluster_id>/tree/', KeyTreeView.as_view(), name='etcd-tree'),
+    path('<int:cluster_id>/children/', KeyChildrenView.as_view(), name='etcd-children'),
+    path('<int:cluster_id>/search/', KeySearchView.as_view(), name='etcd-search'),
+    path('<int:cluster_id>/stats/', KeyspaceStatsView.as_view(), name='etcd-stats'),
     path('<int:cluster_id>/kv/', KeyValueView.as_view(), name='etcd-kv'),
+    path('<int:cluster_id>/delete-prefix/', PrefixDeleteView.as_view(), name='etcd-delete-prefix'),
+    path('<int:cluster_id>/delete-prefix/<str:job_id>/', PrefixDeleteJobView.as_view(), name='etcd-delete-prefix-job'),
+    path('<int:cluster_id>/kv/history/', KeyHistoryView.as_view(), name='etcd-kv-history'),
+    path('<int:cluster_id>/kv/diff/', KeyDiffView.as_view(), name='etcd-kv-diff'),
+    path('<int:cluster_id>/batch/', KeyBatchView.as_view(), name='etcd-batch'),
+    path('<int:cluster_id>/export/', KeyExportView.as_view(), name='etcd-export'),
+    path('<int:cluster_id>/import/', KeyImportView.as_view(), name='etcd-import'),
+    path('<int:cluster_id>/watch/', KeyWatchView.as_view(), name='etcd-watch'),
     path('<int:cluster_id>/health/', ClusterHealthView.as_view(), name='etcd-health'),
+    path('<int:cluster_id>/snapshots/', SnapshotListView.as_view(), name='etcd-snapshots'),
+    path('<int:cluster_id>/snapshots/<int:snapshot_id>/', SnapshotDetailView.as_view(), name='etcd-snapshot'),
+    path('<int:cluster_id>/snapshots/<int:snapshot_id>/download/', SnapshotDownloadView.as_view(), name='etcd-snapshot-download'),
+    path('<int:cluster_id>/snapshots/<int:snapshot_id>/keys/', SnapshotKeyListView.as_view(), name='etcd-snapshot-keys'),
+    path('<int:cluster_id>/snapshots/<int:snapshot_id>/tree/', SnapshotKeyTreeView.as_view(), name='etcd-snapshot-tree'),
+    path('<int:cluster_id>/snapshots/<int:snapshot_id>/children/', SnapshotKeyChildrenView.as_view(), name='etcd-snapshot-children'),
+    path('<int:cluster_id>/snapshots/<int:snapshot_id>/search/', SnapshotKeySearchView.as_view(), name='etcd-snapshot-search'),
+    path('<int:cluster_id>/snapshots/<int:snapshot_id>/stats/', SnapshotKeyspaceStatsView.as_view(), name='etcd-snapshot-stats'),
+    path('<int:cluster_id>/snapshots/<int:snapshot_id>/kv/', SnapshotKeyValueView.as_view(), name='etcd-snapshot-kv'),
 ]
@@ -1,37 +1,151 @@
-from rest_framework.views import APIView
+import asyncio
+import base64
+import json
+import time
+
+from adrf.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.views import View
 
 from apps.clusters.models import Cluster
+from .models import PrefixDeleteJob, EtcdSnapshot
 from .services import EtcdService
+from .pool import service_pool, snapshot_pool
+from .cache import BaseResponseCache, response_cache, stats_cache, make_params_key
+from .concurrency import etcd_calls, snapshot_calls, etcd_reads, ClusterBusy
+from .content import to_text
+from .metrics import timed, render_latest, metrics_allowed
+from .watch import watch_hub
+from .transfer import CONTENT_TYPES, FILE_EXTENSIONS, compress_stream, open_stream, iter_lines
 from .serializers import (
     KeyListRequestSerializer,
+    KeyTreeRequestSerializer,
+    KeyChildrenRequestSerializer,
+    KeySearchRequestSerializer,
+    KeyspaceStatsRequestSerializer,
+    KeyValueRequestSerializer,
+    KeyHistoryRequestSerializer,
+    KeyDiffRequestSerializer,
     KeyValueSerializer,
-    KeyDeleteSerializer
+    KeyDeleteSerializer,
+    PrefixDeleteRequestSerializer,
+    BatchRequestSerializer,
+    ExportRequestSerializer,
+    ImportRequestSerializer,
+    KeyWatchRequestSerializer
 )
 
 
 class BaseEtcdView(APIView):
+    """etcd API 공통 (async)
+
+    blocking etcd 호출은 ``run_etcd`` 로 ``limiter`` 의 스레드 풀에서 실행하며, 클러스터별
+    동시 실행 수는 ETCD_CLUSTER_CONCURRENCY 로 제한된다. 대기열
+    (ETCD_CLUSTER_QUEUE_SIZE)이 가득 차면 429 로 거절한다. 읽기 조회는
+    ``read_etcd`` 로 같은 인자의 진행 중인 호출과 결과를 공유한다.
+    풀에서 빌린 서비스는 응답을 다 보낸 뒤(스트리밍이면 스트림이 끝난 뒤) 반납한다.
+    """
+
     permission_classes = [IsAuthenticated]
+    response_cache = response_cache
+    limiter = etcd_calls
+
+    async def async_dispatch(self, request, *args, **kwargs):
+        self._leases = []
+        try:
+            response = await super().async_dispatch(request, *args, **kwargs)
+        except BaseException:
+            self._release_services()
+            raise
+        # response.close() 는 응답(스트리밍 포함)을 다 보낸 뒤 handler 가 호출한다
+        response._resource_closers.append(self._release_services)
+        return response
+
+    async def get_etcd_service(self, cluster_id: int) -> EtcdService:
+        cluster = await sync_to_async(get_object_or_404)(Cluster, pk=cluster_id, is_active=True)
+        return await self.lease_service(service_pool, cluster)
+
+    async def lease_service(self, pool, obj):
+        # 풀 조회는 etcd 를 호출하지 않으므로 클러스터 대기열을 거치지 않는다
+        service = await sync_to_async(pool.acquire, thread_sensitive=False)(obj)
+        self._leases.append((pool, service))
+        return service
+
+    def _release_services(self):
+        while self._leases:
+            pool, service = self._leases.pop()
+            pool.release(service)
+
+    async def run_etcd(self, cluster_id: int, func, *args, **kwargs):
+        return await self.limiter.run(cluster_id, func, *args, **kwargs)
 
-    def get_etcd_service(self, cluster_id: int) -> EtcdService:
-        cluster = get_object_or_404(Cluster, pk=cluster_id, is_active=True)
-        return EtcdService(cluster)
+    async def read_etcd(self, cluster_id: int, func, *args, **kwargs):
+        """읽기 전용 호출, 같은 서비스 / 메서드 / 인자로 진행 중인 호출이 있으면 결과를 공유"""
+        if not settings.ETCD_COALESCE_READS:
+            return await self.run_etcd(cluster_id, func, *args, **kwargs)
+        key = (
+            cluster_id,
+            func.__name__,
+            id(getattr(func, '__self__', None)),
+            make_params_key(func.__name__, {'args': args, 'kwargs': kwargs}),
+        )
+        return await etcd_reads.do(key, lambda: self.run_etcd(cluster_id, func, *args, **kwargs))
+
+    @staticmethod
+    def busy_response(error: ClusterBusy):
+        response = Response({'success': False, 'error': str(error)}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+        response['Retry-After'] = str(error.retry_after)
+        return response
+
+    async def cached_response(self, cluster_id: int, endpoint: str, params: dict):
+        """캐시된 응답이 있으면 Response, 없으면 None"""
+        hit = await self.response_cache.get(cluster_id, endpoint, params)
+        if hit is None:
+            return None
+        data, age = hit
+        return self._with_cache_headers(Response(data), 'HIT', age)
+
+    async def cache_response(self, cluster_id: int, endpoint: str, params: dict, scope, response,
+                             cacheable: bool = True):
+        """성공한 응답만 캐시에 저장 (scope 와 겹치는 쓰기가 있으면 무효화됨)"""
+        if cacheable and response.status_code == status.HTTP_200_OK and response.data.get('success'):
+            await self.response_cache.set(cluster_id, endpoint, params, scope, response.data)
+        return self._with_cache_headers(response, 'MISS', 0)
+
+    @staticmethod
+    def _with_cache_headers(response, state: str, age: float):
+        response['X-Cache'] = state
+        response['Age'] = str(int(age))
+        if response.data.get('revision'):
+            response['X-Etcd-Revision'] = str(response.data['revision'])
+        return response
 
 
 class KeyListView(BaseEtcdView):
     """키 목록 조회"""
 
-    def get(self, request, cluster_id):
+    async def get(self, request, cluster_id):
         serializer = KeyListRequestSerializer(data=request.query_params)
         serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        cached = await self.cached_response(cluster_id, 'keys', params)
+        if cached is not None:
+            return cached
 
         try:
-            service = self.get_etcd_service(cluster_id)
-            result = service.get_keys(**serializer.validated_data)
-            return Response(result)
+            service = await self.get_etcd_service(cluster_id)
+            result = await self.read_etcd(cluster_id, service.get_keys, **params)
+            return await self.cache_response(cluster_id, 'keys', params, ('prefix', params['prefix']), Response(result))
+        except ClusterBusy as e:
+            return self.busy_response(e)
         except Exception as e:
             return Response(
                 {'success': False, 'error': str(e)},
@@ -42,23 +156,39 @@ class KeyListView(BaseEtcdView):
 class KeyTreeView(BaseEtcdView):
     """트리 구조로 키 조회"""
 
-    def get(self, request, cluster_id):
-        prefix = request.query_params.get('prefix', '/')
-        limit = int(request.query_params.get('limit', 500))
+    async def get(self, request, cluster_id):
+        serializer = KeyTreeRequestSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        cached = await self.cached_response(cluster_id, 'tree', params)
+        if cached is not None:
+            return cached
 
         try:
-            service = self.get_etcd_service(cluster_id)
-            result = service.get_keys(prefix=prefix, keys_only=True, limit=limit)
+            service = await self.get_etcd_service(cluster_id)
+            result = await self.read_etcd(
+                cluster_id,
+                service.get_keys,
+                keys_only=True,
+                **params
+            )
 
             if not result['success']:
                 return Response(result, status=status.HTTP_400_BAD_REQUEST)
 
-            tree = self._build_tree(result.get('keys', []))
-            return Response({
+            with timed(cluster_id, 'tree', 'build_tree'):
+                tree = self._build_tree(result.get('keys', []))
+            return await self.cache_response(cluster_id, 'tree', params, ('prefix', params['prefix']), Response({
                 'success': True,
                 'tree': tree,
-                'count': result.get('count', 0)
-            })
+                'count': result.get('count', 0),
+                'revision': result.get('revision'),
+                'has_more': result.get('has_more', False),
+                'next_cursor': result.get('next_cursor')
+            }))
+        except ClusterBusy as e:
+            return self.busy_response(e)
         except Exception as e:
             return Response(
                 {'success': False, 'error': str(e)},
@@ -103,55 +233,501 @@ class KeyTreeView(BaseEtcdView):
         return result
 
 
-class KeyValueView(BaseEtcdView):
-    """키-값 조회/저장"""
+class KeyChildrenView(BaseEtcdView):
+    """path 바로 아래 자식만 조회 (트리 lazy 확장용)"""
+
+    async def get(self, request, cluster_id):
+        serializer = KeyChildrenRequestSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
 
-    def get(self, request, cluster_id):
-        key = request.query_params.get('key')
-        if not key:
+        cached = await self.cached_response(cluster_id, 'children', params)
+        if cached is not None:
+            return cached
+
+        try:
+            service = await self.get_etcd_service(cluster_id)
+            result = await self.read_etcd(cluster_id, service.list_children, **params)
+
+            if not result['success']:
+                return Response(result, status=status.HTTP_400_BAD_REQUEST)
+
+            scope = ('prefix', params['path'].rstrip('/') + '/')
+            return await self.cache_response(cluster_id, 'children', params, scope, Response(result))
+        except ClusterBusy as e:
+            return self.busy_response(e)
+        except Exception as e:
             return Response(
-                {'success': False, 'error': 'Key is required'},
-                status=status.HTTP_400_BAD_REQUEST
+                {'success': False, 'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class KeySearchView(BaseEtcdView):
+    """키 이름(glob/regex)과 값으로 검색, 결과를 NDJSON 으로 스트리밍
+
+    일치하는 키를 찾는 대로 한 줄씩 보내고, 마지막 줄은 ``type: done`` 요약이다.
+    """
+
+    async def get(self, request, cluster_id):
+        serializer = KeySearchRequestSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = dict(serializer.validated_data)
+        params.setdefault('time_budget', settings.ETCD_SEARCH_TIME_BUDGET)
+
+        try:
+            service = await self.get_etcd_service(cluster_id)
+            result = await self.run_etcd(
+                cluster_id,
+                service.search_keys,
+                batch_size=settings.ETCD_SEARCH_BATCH_SIZE,
+                **params
             )
 
+            if not result['success']:
+                return Response(result, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+            response = StreamingHttpResponse(
+                self._lines(cluster_id, result['results']),
+                content_type='application/x-ndjson'
+            )
+            response['X-Etcd-Revision'] = str(result['revision'])
+            response['X-Search-Source'] = result['source']
+            response['X-Accel-Buffering'] = 'no'
+            return response
+        except ClusterBusy as e:
+            return self.busy_response(e)
+        except Exception as e:
+            return Response(
+                {'success': False, 'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    async def _lines(self, cluster_id, results):
+        """sync 결과 iterator 를 스레드 풀에서 하나씩 꺼내 event loop 를 막지 않는다"""
+        while True:
+            item = await self.limiter.run_admitted(cluster_id, next, results, None)
+            if item is None:
+                return
+            yield json.dumps(item, separators=(',', ':')).encode() + b'\n'
+
+
+class KeyspaceStatsView(BaseEtcdView):
+    """prefix 아래 경로별 키 수 / 크기 / 분포 통계 (ETCD_STATS_CACHE_TTL 동안 캐시)"""
+
+    response_cache = stats_cache
+
+    async def get(self, request, cluster_id):
+        serializer = KeyspaceStatsRequestSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = dict(serializer.validated_data)
+        refresh = params.pop('refresh')
+
+        if not refresh:
+            cached = await self.cached_response(cluster_id, 'stats', params)
+            if cached is not None:
+                return cached
+
         try:
-            service = self.get_etcd_service(cluster_id)
-            result = service.get_value(key)
-            return Response(result)
+            service = await self.get_etcd_service(cluster_id)
+            result = await self.read_etcd(
+                cluster_id,
+                service.keyspace_stats,
+                max_groups=settings.ETCD_STATS_MAX_GROUPS,
+                batch_size=settings.ETCD_STATS_BATCH_SIZE,
+                **params
+            )
+            return await self.cache_response(cluster_id, 'stats', params, None, Response(result))
+        except ClusterBusy as e:
+            return self.busy_response(e)
         except Exception as e:
             return Response(
                 {'success': False, 'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    def post(self, request, cluster_id):
+
+class KeyValueView(BaseEtcdView):
+    """키-값 조회/저장"""
+
+    async def get(self, request, cluster_id):
+        serializer = KeyValueRequestSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        cached = await self.cached_response(cluster_id, 'kv', params)
+        if cached is not None:
+            return cached
+
+        try:
+            service = await self.get_etcd_service(cluster_id)
+            result = await self.read_etcd(
+                cluster_id,
+                service.get_value,
+                params['key'],
+                decode=params['decode'],
+                max_decode_size=settings.ETCD_VALUE_DECODE_MAX_SIZE,
+                revision=params['revision']
+            )
+            return await self.cache_response(cluster_id, 'kv', params, ('key', params['key']), Response(result))
+        except ClusterBusy as e:
+            return self.busy_response(e)
+        except Exception as e:
+            return Response(
+                {'success': False, 'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    async def post(self, request, cluster_id):
         serializer = KeyValueSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         try:
-            service = self.get_etcd_service(cluster_id)
-            result = service.put_value(
+            service = await self.get_etcd_service(cluster_id)
+            result = await self.run_etcd(
+                cluster_id,
+                service.put_value,
                 serializer.validated_data['key'],
-                serializer.validated_data.get('value', '')
+                serializer.validated_data.get('value', ''),
+                encoding=serializer.validated_data['encoding'],
+                expected_mod_revision=serializer.validated_data.get('expected_mod_revision')
             )
+            await response_cache.invalidate(cluster_id, serializer.validated_data['key'])
+            if result.get('conflict'):
+                return Response(result, status=status.HTTP_409_CONFLICT)
             return Response(result)
+        except ClusterBusy as e:
+            return self.busy_response(e)
         except Exception as e:
             return Response(
                 {'success': False, 'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    def delete(self, request, cluster_id):
+    async def delete(self, request, cluster_id):
         serializer = KeyDeleteSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         try:
-            service = self.get_etcd_service(cluster_id)
-            result = service.delete_key(
+            service = await self.get_etcd_service(cluster_id)
+            result = await self.run_etcd(
+                cluster_id,
+                service.delete_key,
+                serializer.validated_data['key'],
+                prefix=serializer.validated_data.get('prefix', False),
+                expected_mod_revision=serializer.validated_data.get('expected_mod_revision')
+            )
+            await response_cache.invalidate(
+                cluster_id,
                 serializer.validated_data['key'],
                 prefix=serializer.validated_data.get('prefix', False)
             )
+            if result.get('conflict'):
+                return Response(result, status=status.HTTP_409_CONFLICT)
+            return Response(result)
+        except ClusterBusy as e:
+            return self.busy_response(e)
+        except Exception as e:
+            return Response(
+                {'success': False, 'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class PrefixDeleteView(BaseEtcdView):
+    """prefix 아래 키를 batch 단위로 나눠 삭제 (dry_run 이면 개수와 크기만 반환)
+
+    ``etcdctl del --prefix`` 한 번으로 큰 범위를 지우면 raft proposal 하나가 커져
+    클러스터 전체 지연이 튀므로 batch_size 개씩 지우고 batch 사이에 pause 초 쉰다.
+    진행 상황은 NDJSON 으로 batch 마다 한 줄씩 보내며, ``job_id`` 로 취소하면
+    진행 중인 batch 까지만 지우고 멈춘다.
+    """
+
+    async def post(self, request, cluster_id):
+        serializer = PrefixDeleteRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        batch_size = params.get('batch_size', settings.ETCD_PREFIX_DELETE_BATCH_SIZE)
+
+        try:
+            service = await self.get_etcd_service(cluster_id)
+            if params['dry_run']:
+                result = await self.run_etcd(
+                    cluster_id,
+                    service.estimate_prefix_delete,
+                    params['prefix'],
+                    batch_size=batch_size,
+                    scan_batch_size=settings.ETCD_STATS_BATCH_SIZE
+                )
+                return Response(result)
+
+            running = await PrefixDeleteJob.aoverlapping(cluster_id, params['prefix'])
+            if running is not None:
+                return Response(
+                    {
+                        'success': False,
+                        'error': f'A delete is already running for {running.prefix}',
+                        'job': running.progress(),
+                    },
+                    status=status.HTTP_409_CONFLICT
+                )
+            job = await PrefixDeleteJob.objects.acreate(
+                cluster_id=cluster_id,
+                prefix=params['prefix'],
+                batch_size=batch_size,
+                pause=params.get('pause', settings.ETCD_PREFIX_DELETE_PAUSE),
+                started_by=request.user
+            )
+            response = StreamingHttpResponse(
+                self._lines(cluster_id, job, service.delete_prefix_batches(job.prefix, batch_size)),
+                content_type='application/x-ndjson'
+            )
+            response['X-Delete-Job'] = job.id
+            response['X-Accel-Buffering'] = 'no'
+            return response
+        except ClusterBusy as e:
+            return self.busy_response(e)
+        except Exception as e:
+            return Response(
+                {'success': False, 'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    async def _lines(self, cluster_id, job, batches):
+        """batch 를 하나씩 스레드 풀에서 지우고, 사이에는 event loop 에서 pause 초 대기"""
+        try:
+            yield self._line('started', job)
+            while True:
+                # 취소는 다른 worker 가 받을 수 있으므로 batch 마다 DB 에서 확인
+                await job.arefresh_from_db(fields=['cancel_requested'])
+                if job.cancel_requested:
+                    job.status = 'cancelled'
+                    break
+                try:
+                    batch = await self.limiter.run_admitted(cluster_id, next, batches, None)
+                except Exception as e:
+                    job.status = 'failed'
+                    job.error_message = str(e)
+                    break
+                if batch is None:
+                    job.status = 'completed'
+                    break
+
+                job.deleted += batch['deleted']
+                job.batches += 1
+                job.revision = batch['revision']
+                job.last_key = batch['last_key']
+                await job.asave(update_fields=['deleted', 'batches', 'revision', 'last_key', 'updated_at'])
+                await response_cache.invalidate(cluster_id, job.prefix, prefix=True)
+                yield self._line('progress', job)
+                if job.pause:
+                    await asyncio.sleep(job.pause)
+
+            await self._finish(job)
+            yield self._line('error' if job.status == 'failed' else 'done', job)
+        finally:
+            batches.close()
+            if job.status == 'running':
+                # 응답 도중 종료(서버 종료 등)
+                job.status = 'failed'
+                job.error_message = 'Interrupted'
+                await self._finish(job)
+
+    @staticmethod
+    async def _finish(job):
+        job.finished_at = timezone.now()
+        await job.asave(update_fields=['status', 'error_message', 'finished_at', 'updated_at'])
+
+    @staticmethod
+    def _line(kind, job):
+        return json.dumps({'type': kind, **job.progress()}, separators=(',', ':')).encode() + b'\n'
+
+
+class PrefixDeleteJobView(BaseEtcdView):
+    """prefix 삭제 작업 조회 / 취소"""
+
+    async def get(self, request, cluster_id, job_id):
+        try:
+            job = await PrefixDeleteJob.objects.aget(pk=job_id, cluster_id=cluster_id)
+        except PrefixDeleteJob.DoesNotExist:
+            return Response({'success': False, 'error': 'Delete job not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'success': True, **job.progress()})
+
+    async def delete(self, request, cluster_id, job_id):
+        await PrefixDeleteJob.objects.filter(
+            pk=job_id, cluster_id=cluster_id, status='running'
+        ).aupdate(cancel_requested=True)
+        return await self.get(request, cluster_id, job_id)
+
+
+class KeyHistoryView(BaseEtcdView):
+    """키의 변경 이력 (compaction 이후 남아 있는 revision 목록)"""
+
+    async def get(self, request, cluster_id):
+        serializer = KeyHistoryRequestSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        cached = await self.cached_response(cluster_id, 'history', params)
+        if cached is not None:
+            return cached
+
+        try:
+            service = await self.get_etcd_service(cluster_id)
+            result = await self.read_etcd(
+                cluster_id,
+                service.key_history,
+                timeout=settings.ETCD_HISTORY_TIMEOUT,
+                idle_timeout=settings.ETCD_HISTORY_IDLE_TIMEOUT,
+                **params
+            )
+            # 시간 안에 다 읽지 못한 결과는 캐시하지 않는다
+            return await self.cache_response(
+                cluster_id, 'history', params, ('key', params['key']), Response(result),
+                cacheable=not result.get('timed_out')
+            )
+        except ClusterBusy as e:
+            return self.busy_response(e)
+        except Exception as e:
+            return Response(
+                {'success': False, 'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class KeyDiffView(BaseEtcdView):
+    """키의 두 revision 값 diff"""
+
+    async def get(self, request, cluster_id):
+        serializer = KeyDiffRequestSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        try:
+            service = await self.get_etcd_service(cluster_id)
+            result = await self.read_etcd(
+                cluster_id,
+                service.diff_revisions,
+                max_size=settings.ETCD_VALUE_DECODE_MAX_SIZE,
+                **params
+            )
+            return Response(result)
+        except ClusterBusy as e:
+            return self.busy_response(e)
+        except Exception as e:
+            return Response(
+                {'success': False, 'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class KeyBatchView(BaseEtcdView):
+    """여러 키 get/put/delete 를 하나의 트랜잭션으로 실행"""
+
+    async def post(self, request, cluster_id):
+        serializer = BatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            service = await self.get_etcd_service(cluster_id)
+            result = await self.run_etcd(cluster_id, service.batch, serializer.validated_data['operations'])
+            for op in serializer.validated_data['operations']:
+                if op['op'] != 'get':
+                    await response_cache.invalidate(cluster_id, op['key'], prefix=op.get('prefix', False))
+            return Response(result)
+        except ClusterBusy as e:
+            return self.busy_response(e)
+        except Exception as e:
+            return Response(
+                {'success': False, 'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class KeyExportView(BaseEtcdView):
+    """prefix 아래 키/값을 NDJSON 으로 스트리밍 export"""
+
+    async def get(self, request, cluster_id):
+        serializer = ExportRequestSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        compression = serializer.validated_data['compression']
+
+        try:
+            service = await self.get_etcd_service(cluster_id)
+            result = await self.run_etcd(
+                cluster_id,
+                service.export_prefix,
+                serializer.validated_data['prefix'],
+                batch_size=settings.ETCD_EXPORT_BATCH_SIZE
+            )
+
+            if not result['success']:
+                return Response(result, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+            response = StreamingHttpResponse(
+                self._chunks(cluster_id, compress_stream(result['records'], compression)),
+                content_type=CONTENT_TYPES[compression]
+            )
+            filename = f"etcd-{cluster_id}-{result['revision']}.{FILE_EXTENSIONS[compression]}"
+            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+            response['X-Etcd-Revision'] = str(result['revision'])
+            return response
+        except ClusterBusy as e:
+            return self.busy_response(e)
+        except Exception as e:
+            return Response(
+                {'success': False, 'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    async def _chunks(self, cluster_id, chunks):
+        """batch 를 하나씩 스레드 풀에서 읽어 보낸다
+
+        ASGI 에서 sync iterator 를 그대로 넘기면 Django 가 전체를 list 로 모은 뒤
+        보내므로 export 크기만큼 메모리를 쓰게 된다.
+        """
+        try:
+            while True:
+                chunk = await self.limiter.run_admitted(cluster_id, next, chunks, None)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            chunks.close()
+
+
+class KeyImportView(BaseEtcdView):
+    """export 한 NDJSON 을 batch txn 으로 import (요청 본문을 스트리밍으로 읽음)"""
+
+    async def post(self, request, cluster_id):
+        serializer = ImportRequestSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        if request.stream is None:
+            return Response(
+                {'success': False, 'error': 'Request body is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            service = await self.get_etcd_service(cluster_id)
+            stream = open_stream(request.stream, serializer.validated_data['compression'])
+            result = await self.run_etcd(
+                cluster_id,
+                service.import_records,
+                iter_lines(stream, settings.ETCD_IMPORT_MAX_LINE_SIZE),
+                batch_ops=settings.ETCD_IMPORT_BATCH_OPS,
+                batch_bytes=settings.ETCD_IMPORT_BATCH_BYTES
+            )
+            # 일부 batch 만 적용되고 실패했을 수도 있으므로 결과와 관계없이 비운다
+            await response_cache.invalidate(cluster_id)
+
+            if not result['success']:
+                return Response(result, status=status.HTTP_400_BAD_REQUEST)
+
             return Response(result)
+        except ClusterBusy as e:
+            return self.busy_response(e)
         except Exception as e:
             return Response(
                 {'success': False, 'error': str(e)},
@@ -159,24 +735,373 @@ class KeyValueView(BaseEtcdView):
             )
 
 
+class KeyWatchView(View):
+    """prefix 아래 변경 이벤트를 Server-Sent Events 로 전달
+
+    클러스터 + prefix 당 upstream watch 하나를 모든 구독자가 공유한다.
+    연결 하나가 worker 를 점유하지 않도록 ASGI(config.asgi) 에서 실행해야 하며,
+    ETCD_WATCH_MAX_DURATION 이 지나면 스트림을 닫고 EventSource 가 다시 연결한다.
+    재연결 시 EventSource 가 보내는 ``Last-Event-ID`` 다음 revision 부터 이어서
+    보내고, 이어받을 수 없으면 먼저 ``resync`` 를 보내 클라이언트가 다시 읽게 한다.
+    """
+
+    async def get(self, request, cluster_id):
+        is_authenticated = await sync_to_async(lambda: request.user.is_authenticated)()
+        if not is_authenticated:
+            return JsonResponse(
+                {'detail': 'Authentication credentials were not provided.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        serializer = KeyWatchRequestSerializer(data=request.GET)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        cluster = await sync_to_async(get_object_or_404)(Cluster, pk=cluster_id, is_active=True)
+        try:
+            service = await sync_to_async(service_pool.acquire)(cluster)
+        except Exception as e:
+            return JsonResponse(
+                {'success': False, 'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        last_revision = self._last_event_id(request)
+        try:
+            subscription = watch_hub.subscribe(
+                service,
+                service._encode(serializer.validated_data['prefix']),
+                asyncio.get_running_loop(),
+                maxsize=settings.ETCD_WATCH_QUEUE_SIZE,
+                last_revision=last_revision
+            )
+        except BaseException:
+            service_pool.release(service)
+            raise
+        response = StreamingHttpResponse(
+            self._events(subscription, last_revision),
+            content_type='text/event-stream'
+        )
+        # 스트림이 끝나 response.close() 가 불리면 반납
+        response._resource_closers.append(lambda: service_pool.release(service))
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    @staticmethod
+    def _last_event_id(request) -> int:
+        """재연결 요청의 Last-Event-ID (마지막으로 받은 revision, 없거나 잘못되면 0)"""
+        try:
+            return max(int(request.META.get('HTTP_LAST_EVENT_ID', '0')), 0)
+        except ValueError:
+            return 0
+
+    async def _events(self, subscription, last_revision=0):
+        deadline = time.monotonic() + settings.ETCD_WATCH_MAX_DURATION
+        try:
+            yield self._format('ready', {'revision': subscription.channel.revision}, retry=3000)
+            while time.monotonic() < deadline:
+                item = await subscription.get(timeout=settings.ETCD_WATCH_KEEPALIVE)
+                if item is None:
+                    yield b': keepalive\n\n'
+                    continue
+                if item['type'] == 'closed':
+                    # upstream watch 가 종료됨, 스트림을 닫아 EventSource 가 다시 연결하게 한다
+                    return
+                if 'key' in item and item['revision'] <= last_revision:
+                    # 이전 연결에서 이미 보낸 이벤트
+                    continue
+                yield self._format(item['type'], self._event_data(item), event_id=item.get('revision'))
+        finally:
+            subscription.close()
+
+    @staticmethod
+    def _event_data(item):
+        if 'key' not in item:
+            return item
+        text = to_text(item['value'])
+        data = {
+            'type': item['type'],
+            'key': item['key'].decode('utf-8', 'replace'),
+            'revision': item['revision'],
+        }
+        if item['type'] == 'put':
+            data['value'] = text if text is not None else base64.b64encode(item['value']).decode()
+            data['encoding'] = 'utf-8' if text is not None else 'base64'
+            data['version'] = item['version']
+        return data
+
+    @staticmethod
+    def _format(event, data, event_id=None, retry=None):
+        lines = [f'event: {event}']
+        if event_id:
+            lines.append(f'id: {event_id}')
+        if retry:
+            lines.append(f'retry: {retry}')
+        lines.append('data: ' + json.dumps(data, separators=(',', ':')))
+        return ('\n'.join(lines) + '\n\n').encode()
+
+
 class ClusterHealthView(BaseEtcdView):
     """etcd 클러스터 상태"""
 
-    def get(self, request, cluster_id):
+    async def get(self, request, cluster_id):
+        cached = await self.cached_response(cluster_id, 'health', {})
+        if cached is not None:
+            return cached
+
         try:
-            service = self.get_etcd_service(cluster_id)
-            health = service.get_cluster_health()
-            cluster_status = service.get_cluster_status()
-            members = service.get_members()
+            service = await self.get_etcd_service(cluster_id)
+            result = await self.read_etcd(
+                cluster_id,
+                service.get_cluster_overview,
+                timeout=settings.ETCD_HEALTH_TIMEOUT
+            )
+            # 일부 조회가 실패/timeout 된 결과는 캐시하지 않는다
+            return await self.cache_response(
+                cluster_id, 'health', {}, None, Response(result), cacheable=not result['errors']
+            )
+        except ClusterBusy as e:
+            return self.busy_response(e)
+        except Exception as e:
+            return Response(
+                {'success': False, 'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
 
-            return Response({
-                'success': True,
-                'health': health.get('health'),
-                'status': cluster_status.get('status'),
-                'members': members.get('members')
-            })
+
+class SnapshotListView(BaseEtcdView):
+    """클러스터의 스냅샷 목록 / 새 스냅샷 저장
+
+    저장은 etcd 가 보내는 스냅샷을 chunk 단위로 파일에 쓰면서 진행 상황을 NDJSON
+    으로 한 줄씩 보낸다 (started / progress / done / error). 클러스터마다 한 번에
+    하나씩만 저장한다.
+    """
+
+    async def get(self, request, cluster_id):
+        snapshots = [snapshot.summary() async for snapshot in EtcdSnapshot.objects.filter(cluster_id=cluster_id)]
+        return Response({'success': True, 'snapshots': snapshots, 'count': len(snapshots)})
+
+    async def post(self, request, cluster_id):
+        try:
+            service = await self.get_etcd_service(cluster_id)
+            snapshot, running = await sync_to_async(EtcdSnapshot.start)(cluster_id, request.user)
+            if running is not None:
+                return Response(
+                    {
+                        'success': False,
+                        'error': 'A snapshot is already running for this cluster',
+                        'snapshot': running.summary(),
+                    },
+                    status=status.HTTP_409_CONFLICT
+                )
+            response = StreamingHttpResponse(
+                self._lines(
+                    cluster_id,
+                    snapshot,
+                    service.save_snapshot(snapshot.path, timeout=settings.ETCD_SNAPSHOT_TIMEOUT)
+                ),
+                content_type='application/x-ndjson'
+            )
+            response['X-Snapshot-Id'] = str(snapshot.pk)
+            response['X-Accel-Buffering'] = 'no'
+            return response
+        except ClusterBusy as e:
+            return self.busy_response(e)
         except Exception as e:
             return Response(
                 {'success': False, 'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+    async def _lines(self, cluster_id, snapshot, steps):
+        """저장 단계를 하나씩 스레드 풀에서 실행하고 진행 상황을 한 줄씩 보낸다"""
+        try:
+            yield self._line('started', snapshot)
+            while snapshot.status == 'running':
+                try:
+                    step = await self.limiter.run_admitted(cluster_id, next, steps, None)
+                except Exception as e:
+                    snapshot.status = 'failed'
+                    snapshot.error_message = str(e)
+                    break
+                if step is None:
+                    snapshot.status = 'failed'
+                    snapshot.error_message = 'Snapshot stream ended unexpectedly'
+                    break
+
+                snapshot.size = step['size']
+                if step['done']:
+                    snapshot.status = 'completed'
+                    snapshot.sha256 = step['sha256']
+                    snapshot.etcd_checksum = step['etcd_checksum']
+                    snapshot.revision = step['revision']
+                    snapshot.keys = step['keys']
+                    break
+                await snapshot.asave(update_fields=['size', 'updated_at'])
+                yield self._line('progress', snapshot)
+
+            await self._finish(snapshot)
+            yield self._line('error' if snapshot.status == 'failed' else 'done', snapshot)
+        finally:
+            steps.close()
+            if snapshot.status == 'running':
+                # 응답 도중 종료(서버 종료 등)
+                snapshot.status = 'failed'
+                snapshot.error_message = 'Interrupted'
+                await self._finish(snapshot)
+
+    @staticmethod
+    async def _finish(snapshot):
+        if snapshot.status == 'failed':
+            await sync_to_async(snapshot.remove_file)()
+        snapshot.finished_at = timezone.now()
+        await snapshot.asave()
+
+    @staticmethod
+    def _line(kind, snapshot):
+        return json.dumps({'type': kind, **snapshot.summary()}, separators=(',', ':')).encode() + b'\n'
+
+
+class SnapshotDetailView(BaseEtcdView):
+    """스냅샷 조회 / 삭제 (파일도 함께 삭제)"""
+
+    async def get(self, request, cluster_id, snapshot_id):
+        try:
+            snapshot = await EtcdSnapshot.objects.aget(pk=snapshot_id, cluster_id=cluster_id)
+        except EtcdSnapshot.DoesNotExist:
+            return Response({'success': False, 'error': 'Snapshot not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'success': True, **snapshot.summary()})
+
+    async def delete(self, request, cluster_id, snapshot_id):
+        try:
+            snapshot = await EtcdSnapshot.objects.aget(pk=snapshot_id, cluster_id=cluster_id)
+        except EtcdSnapshot.DoesNotExist:
+            return Response({'success': False, 'error': 'Snapshot not found'}, status=status.HTTP_404_NOT_FOUND)
+        if snapshot.status == 'running' and snapshot.updated_at >= timezone.now() - EtcdSnapshot.STALE_AFTER:
+            return Response(
+                {'success': False, 'error': 'Snapshot is still running', 'snapshot': snapshot.summary()},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        # 다른 worker 가 열어 둔 mmap 은 ETCD_SNAPSHOT_OPEN_TTL 이 지나면 닫힌다
+        snapshot_pool.invalidate(snapshot.pk)
+        await sync_to_async(snapshot.remove_file)()
+        await snapshot.adelete()
+        return Response({'success': True, 'id': snapshot_id})
+
+
+class SnapshotDownloadView(BaseEtcdView):
+    """스냅샷 파일 다운로드 (``etcdutl snapshot restore`` 로 복구 가능한 원본 그대로)"""
+
+    CHUNK_SIZE = 1024 * 1024
+
+    async def get(self, request, cluster_id, snapshot_id):
+        try:
+            snapshot = await EtcdSnapshot.objects.aget(pk=snapshot_id, cluster_id=cluster_id, status='completed')
+        except EtcdSnapshot.DoesNotExist:
+            return Response({'success': False, 'error': 'Snapshot not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            file = await sync_to_async(open)(snapshot.path, 'rb')
+        except OSError as e:
+            return Response(
+                {'success': False, 'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        response = StreamingHttpResponse(self._chunks(file), content_type='application/octet-stream')
+        response['Content-Length'] = str(snapshot.size)
+        response['Content-Disposition'] = (
+            f'attachment; filename="etcd-{cluster_id}-{snapshot.revision}.db"'
+        )
+        response['X-Etcd-Revision'] = str(snapshot.revision)
+        response['X-Snapshot-Sha256'] = snapshot.sha256
+        return response
+
+    async def _chunks(self, file):
+        try:
+            while True:
+                chunk = await asyncio.to_thread(file.read, self.CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            file.close()
+
+
+class SnapshotBrowseMixin:
+    """저장된 스냅샷을 live 조회 API 와 같은 형식으로 제공 (읽기 전용)
+
+    etcd 대신 mmap 으로 연 스냅샷 파일을 읽고, 호출은 클러스터 etcd 대기열과 따로
+    제한하므로 큰 검색 / 통계도 실제 control plane 에 부하를 주지 않는다. 응답 캐시는
+    클러스터 단위라 live 응답과 섞이지 않도록 쓰지 않는다.
+    """
+
+    http_method_names = ['get', 'head', 'options']
+    response_cache = BaseResponseCache()
+    limiter = snapshot_calls
+
+    async def get(self, request, cluster_id, snapshot_id):
+        self.snapshot_id = snapshot_id
+        response = await super().get(request, cluster_id)
+        response['X-Etcd-Snapshot'] = str(snapshot_id)
+        return response
+
+    async def get_etcd_service(self, cluster_id: int):
+        snapshot = await sync_to_async(get_object_or_404)(
+            EtcdSnapshot.objects.select_related('cluster'),
+            pk=self.snapshot_id,
+            cluster_id=cluster_id,
+            status='completed'
+        )
+        # 처음 열 때는 키 인덱스를 만드느라 오래 걸릴 수 있으므로 event loop 밖에서 연다
+        return await self.lease_service(snapshot_pool, snapshot)
+
+
+class SnapshotKeyListView(SnapshotBrowseMixin, KeyListView):
+    """스냅샷 키 목록"""
+
+
+class SnapshotKeyTreeView(SnapshotBrowseMixin, KeyTreeView):
+    """스냅샷 트리"""
+
+
+class SnapshotKeyChildrenView(SnapshotBrowseMixin, KeyChildrenView):
+    """스냅샷 path 바로 아래 자식"""
+
+
+class SnapshotKeySearchView(SnapshotBrowseMixin, KeySearchView):
+    """스냅샷 키 / 값 검색 (NDJSON)"""
+
+
+class SnapshotKeyspaceStatsView(SnapshotBrowseMixin, KeyspaceStatsView):
+    """스냅샷 keyspace 통계"""
+
+
+class SnapshotKeyValueView(SnapshotBrowseMixin, KeyValueView):
+    """스냅샷 키 값 조회"""
+
+
+class MetricsView(View):
+    """Prometheus metrics (/metrics, prometheus_client 가 설치된 경우)
+
+    scraper 는 세션 없이 가져가므로 ETCD_METRICS_ALLOWED_IPS 대역이나
+    ETCD_METRICS_TOKEN Bearer token 으로만 허용하고, nginx 로는 노출하지 않는다.
+    """
+
+    def get(self, request):
+        if not metrics_allowed(request):
+            return HttpResponse(
+                'forbidden (ETCD_METRICS_ALLOWED_IPS / ETCD_METRICS_TOKEN)\n',
+                status=status.HTTP_403_FORBIDDEN,
+                content_type='text/plain'
+            )
+        rendered = render_latest()
+        if rendered is None:
+            return HttpResponse(
+                'metrics are disabled (ETCD_METRICS_ENABLED or prometheus_client missing)\n',
+                status=status.HTTP_404_NOT_FOUND,
+                content_type='text/plain'
+            )
+        body, content_type = rendered
+        return HttpResponse(body, content_type=content_type)
@@ -0,0 +1,205 @@
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .backends import EtcdBackendError
+
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """구독자 하나의 이벤트 큐 (구독자의 event loop 에서만 읽고 쓴다)"""
+
+    def __init__(self, channel: 'WatchChannel', loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.channel = channel
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def offer(self, item: Dict[str, Any]) -> None:
+        """watch 스레드에서 호출, 큐에 넣는 작업은 구독자 loop 로 넘긴다"""
+        try:
+            self.loop.call_soon_threadsafe(self._put, item)
+        except RuntimeError:
+            # 구독자 loop 가 이미 닫힘
+            self.channel.unsubscribe(self)
+
+    def _put(self, item: Dict[str, Any]) -> None:
+        if self.queue.full():
+            # 느린 구독자: 쌓인 이벤트를 버리고 다시 읽어야 한다고 알린다
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            item = {'type': 'resync', 'revision': item.get('revision', 0)}
+        self.queue.put_nowait(item)
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """다음 이벤트, timeout 동안 없으면 None"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.channel.unsubscribe(self)
+
+
+class WatchChannel(threading.Thread):
+    """클러스터 + prefix 당 하나의 upstream watch 를 여러 구독자에게 fan-out"""
+
+    def __init__(self, hub: 'WatchHub', key: Tuple[int, bytes], service, prefix: bytes,
+                 retry_interval: float = 3.0, start_revision: int = 0):
+        super().__init__(daemon=True, name=f'etcd-watch-{key[0]}')
+        self.hub = hub
+        self.key = key
+        self.service = service
+        self.prefix = prefix
+        self.retry_interval = retry_interval
+        # start_revision 을 주면 그 다음 revision 부터 watch 한다 (재연결한 구독자 이어받기)
+        self.revision = start_revision
+        # 이 revision 이후 이벤트는 모두 구독자에게 보냈거나 보낼 예정 (0 이면 아직 모름)
+        self.position = start_revision
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._stream = None
+        self._stream_lock = threading.Lock()
+
+    def subscribe(self, loop: asyncio.AbstractEventLoop, maxsize: int,
+                  last_revision: int = 0) -> Subscription:
+        """구독 추가 (loop 에서 호출)
+
+        last_revision 은 재연결한 구독자가 마지막으로 받은 revision 이다. 그 뒤
+        이벤트가 이미 지나갔거나 channel 이 아직 시작 위치를 모르면 첫 이벤트로
+        ``resync`` 를 넣어 다시 읽게 한다.
+        """
+        subscription = Subscription(self, loop, maxsize)
+        with self._lock:
+            self._subscribers.add(subscription)
+            missed = last_revision and (not self.position or last_revision < self.position)
+        if missed:
+            subscription._put({'type': 'resync', 'revision': self.position})
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+            empty = not self._subscribers
+        if empty:
+            self.hub.release(self)
+
+    def has_subscribers(self) -> bool:
+        with self._lock:
+            return bool(self._subscribers)
+
+    def _publish(self, item: Dict[str, Any]) -> None:
+        with self._lock:
+            if 'key' in item:
+                self.position = max(self.position, item['revision'])
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.offer(item)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        with self._stream_lock:
+            stream = self._stream
+        if stream is not None:
+            stream.close()
+        # 남은 구독자는 연결을 끊고 새 channel 로 다시 연결해야 한다
+        self._publish({'type': 'closed'})
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                if not self.revision:
+                    revision = self.service.get_revision(self.prefix)
+                    with self._lock:
+                        self.revision = self.position = revision
+                self._follow()
+            except EtcdBackendError as e:
+                if self._stopped.is_set():
+                    break
+                logger.warning('watch %r for cluster %s failed: %s', self.prefix, self.key[0], e)
+                self._publish({'type': 'watch_error', 'error': str(e), 'revision': self.revision})
+                self._stopped.wait(self.retry_interval)
+
+    def _follow(self) -> None:
+        stream = self.service.watch(self.prefix, start_revision=self.revision + 1)
+        with self._stream_lock:
+            if self._stopped.is_set():
+                # 여는 동안 stop() 됨, 조용한 prefix 면 이벤트가 없어 영영 깨어나지 못한다
+                stream.close()
+                return
+            self._stream = stream
+        try:
+            for resp in stream:
+                if self._stopped.is_set():
+                    return
+                if resp['compact_revision'] or resp['canceled']:
+                    # 놓친 이벤트를 복구할 수 없으므로 현재 revision 부터 다시 시작
+                    self.revision = 0
+                    self._publish({'type': 'resync', 'revision': resp['compact_revision']})
+                    return
+                for event in resp['events']:
+                    kv = event['kv']
+                    self._publish({
+                        'type': event['type'].lower(),
+                        'key': kv['key'],
+                        'value': kv['value'],
+                        'revision': kv['mod_revision'],
+                        'version': kv['version'],
+                    })
+                self.revision = max(self.revision, resp['header']['revision'])
+        finally:
+            stream.close()
+            with self._stream_lock:
+                self._stream = None
+
+
+class WatchHub:
+    """(cluster, prefix) 별 WatchChannel 관리 (첫 구독 시 시작, 마지막 구독 해제 시 종료)"""
+
+    def __init__(self):
+        self._channels: Dict[Tuple[int, bytes], WatchChannel] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, service, prefix: bytes, loop: asyncio.AbstractEventLoop,
+                  maxsize: int = 1000, last_revision: int = 0) -> Subscription:
+        """구독 추가, last_revision 을 주고 새 channel 을 시작하면 그 다음 revision 부터 watch"""
+        key = (service.cluster.pk, prefix)
+        with self._lock:
+            channel = self._channels.get(key)
+            if channel is not None and channel.is_alive():
+                return channel.subscribe(loop, maxsize, last_revision)
+            channel = WatchChannel(self, key, service, prefix, start_revision=last_revision)
+            self._channels[key] = channel
+            # 시작하기 전에 구독해야 이어받은 첫 이벤트를 놓치지 않는다
+            subscription = channel.subscribe(loop, maxsize, last_revision)
+            channel.start()
+            return subscription
+
+    def release(self, channel: WatchChannel) -> None:
+        with self._lock:
+            if channel.has_subscribers() or self._channels.get(channel.key) is not channel:
+                return
+            del self._channels[channel.key]
+        channel.stop()
+
+    def stop(self, cluster_id: int, service=None) -> None:
+        """클러스터의 channel 종료 (service 를 주면 그 서비스로 시작한 channel 만)"""
+        with self._lock:
+            channels = [
+                c for key, c in self._channels.items()
+                if key[0] == cluster_id and (service is None or c.service is service)
+            ]
+            for channel in channels:
+                del self._channels[channel.key]
+        for channel in channels:
+            channel.stop()
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+
+watch_hub = WatchHub()
@@ -0,0 +1,81 @@
+"""두 벤치마크 결과(JSON) 비교
+
+    python -m benchmarks.compare baseline.json current.json --threshold 10
+
+같은 (keys, backend, view, concurrency) 항목끼리 p50/p99 latency, 처리량, peak RSS
+변화율을 보여 주고, p99 나 처리량이 threshold(%) 이상 나빠지면 종료 코드 1 을 반환한다.
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional, TextIO
+
+
+def _key(result: Dict[str, Any]):
+    return (result['keys'], result['backend'], result['view'], result['concurrency'])
+
+
+def _change(old: float, new: float) -> Optional[float]:
+    if not old:
+        return None
+    return round((new - old) / old * 100, 1)
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 10.0) -> List[Dict[str, Any]]:
+    """양쪽에 모두 있는 항목의 변화율 (%) 목록"""
+    previous = {_key(r): r for r in baseline.get('results', [])}
+    rows = []
+    for result in current.get('results', []):
+        old = previous.get(_key(result))
+        if old is None:
+            continue
+        row = {
+            'keys': result['keys'],
+            'backend': result['backend'],
+            'view': result['view'],
+            'concurrency': result['concurrency'],
+            'p50': _change(old['latency_ms']['p50'], result['latency_ms']['p50']),
+            'p99': _change(old['latency_ms']['p99'], result['latency_ms']['p99']),
+            'throughput': _change(old['throughput_rps'], result['throughput_rps']),
+            'peak_rss': _change(old['peak_rss_mb'], result['peak_rss_mb']),
+        }
+        row['regression'] = (
+            (row['p99'] or 0) > threshold
+            or (row['throughput'] or 0) < -threshold
+            or result['errors'] > old['errors']
+        )
+        rows.append(row)
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]], out: TextIO = sys.stdout) -> None:
+    fmt = lambda value: '     n/a' if value is None else f'{value:+7.1f}%'  # noqa: E731
+    print(f"{'keys':>8} {'backend':<8} {'view':<7} {'conc':>4} {'p50':>8} {'p99':>8} {'req/s':>8} {'rss':>8}", file=out)
+    for row in rows:
+        print(
+            f"{row['keys']:>8} {row['backend']:<8} {row['view']:<7} {row['concurrency']:>4}"
+            f" {fmt(row['p50'])} {fmt(row['p99'])} {fmt(row['throughput'])} {fmt(row['peak_rss'])}"
+            f"{'  REGRESSION' if row['regression'] else ''}",
+            file=out
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files')
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=10.0, help='regression threshold in percent')
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows = compare_results(baseline, current, args.threshold)
+    print_comparison(rows)
+    return 1 if any(row['regression'] for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,275 @@
+"""벤치마크용 etcd v3 JSON gateway / K8s API 대역 서버
+
+    python -m benchmarks.etcd_stub --keys 100000
+
+합성 keyspace 를 메모리에 두고 ``/v3/kv/*`` 와 etcd pod 조회에 필요한 K8s API
+일부만 응답한다. 시작하면 첫 줄에 ``listening on <url>`` 을 출력한다.
+"""
+import argparse
+import base64
+import bisect
+import json
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+
+RESOURCES = [
+    'pods', 'services', 'configmaps', 'secrets',
+    'deployments', 'replicasets', 'events', 'leases',
+]
+
+# namespace 하나에 들어가는 키 수 (keyspace 크기에 따라 namespace 수가 늘어남)
+KEYS_PER_NAMESPACE = 1000
+
+MIN_VALUE_SIZE = 64
+MAX_VALUE_SIZE = 4096
+
+ETCD_PODS = ['etcd-bench-1', 'etcd-bench-2', 'etcd-bench-3']
+
+
+def parse_size(text: str) -> int:
+    """'1k', '100k', '1m' 같은 크기 표기를 정수로"""
+    text = text.strip().lower()
+    scale = {'k': 1000, 'm': 1000000}.get(text[-1:], 1)
+    return int(float(text.rstrip('km')) * scale)
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+
+def _unb64(data: Optional[str]) -> bytes:
+    return base64.b64decode(data) if data else b''
+
+
+def synthetic_key(index: int, size: int) -> bytes:
+    """keyspace 크기 size 에서 index 번째로 만들어지는 키"""
+    namespaces = max(1, size // KEYS_PER_NAMESPACE)
+    resource = RESOURCES[index % len(RESOURCES)]
+    namespace = (index // len(RESOURCES)) % namespaces
+    return f'/registry/{resource}/ns-{namespace:04d}/{resource[:-1]}-{index:07d}'.encode()
+
+
+class SyntheticKeyspace:
+    """``/registry/<resource>/<namespace>/<name>`` 형태의 키 size 개
+
+    값은 키에서 결정적으로 만들어 내므로 (크기 64B ~ 4KB) 키 수가 많아도
+    메모리에는 정렬된 키 목록과 변경된 값만 남는다.
+    """
+
+    def __init__(self, size: int):
+        self.keys: List[bytes] = sorted(synthetic_key(i, size) for i in range(size))
+        self.revision = size + 1
+        self._written: Dict[bytes, Tuple[bytes, int]] = {}
+        self._deleted = set()
+        self._lock = threading.Lock()
+
+    def _mod_revision(self, key: bytes) -> int:
+        return zlib.crc32(key) % (len(self.keys) or 1) + 1
+
+    def _value(self, key: bytes) -> bytes:
+        size = MIN_VALUE_SIZE + zlib.crc32(key) % (MAX_VALUE_SIZE - MIN_VALUE_SIZE)
+        head = b'{"key":"' + key + b'","data":"'
+        return head + b'x' * max(0, size - len(head) - 2) + b'"}'
+
+    def _kv(self, key: bytes, keys_only: bool) -> Dict[str, Any]:
+        written = self._written.get(key)
+        value, mod_revision = written if written else (None, self._mod_revision(key))
+        kv = {
+            'key': _b64(key),
+            'create_revision': str(self._mod_revision(key)),
+            'mod_revision': str(mod_revision),
+            'version': '1',
+        }
+        if not keys_only:
+            kv['value'] = _b64(value if value is not None else self._value(key))
+        return kv
+
+    def _bounds(self, key: bytes, range_end: bytes) -> Tuple[int, int]:
+        lo = bisect.bisect_left(self.keys, key)
+        if not range_end:
+            hi = lo + 1 if lo < len(self.keys) and self.keys[lo] == key else lo
+        elif range_end == b'\0':
+            hi = len(self.keys)
+        else:
+            hi = bisect.bisect_left(self.keys, range_end)
+        return lo, max(lo, hi)
+
+    def range(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        key = _unb64(body.get('key'))
+        range_end = _unb64(body.get('range_end'))
+        limit = int(body.get('limit') or 0)
+        keys_only = bool(body.get('keys_only'))
+
+        with self._lock:
+            if int(body.get('revision') or 0) > self.revision:
+                raise ValueError('etcdserver: mvcc: required revision is a future revision')
+            lo, hi = self._bounds(key, range_end)
+            if self._deleted:
+                selected = [k for k in self.keys[lo:hi] if k not in self._deleted]
+            else:
+                selected = self.keys[lo:hi]
+            response = {'header': {'revision': str(self.revision)}, 'count': str(len(selected))}
+            if body.get('count_only'):
+                return response
+            page = selected[:limit] if limit else selected
+            response['kvs'] = [self._kv(k, keys_only) for k in page]
+            response['more'] = len(page) < len(selected)
+            return response
+
+    def put(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        key = _unb64(body.get('key'))
+        with self._lock:
+            self.revision += 1
+            index = bisect.bisect_left(self.keys, key)
+            if index == len(self.keys) or self.keys[index] != key:
+                self.keys.insert(index, key)
+            self._deleted.discard(key)
+            self._written[key] = (_unb64(body.get('value')), self.revision)
+            return {'header': {'revision': str(self.revision)}}
+
+    def delete_range(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        key = _unb64(body.get('key'))
+        range_end = _unb64(body.get('range_end'))
+        with self._lock:
+            lo, hi = self._bounds(key, range_end)
+            deleted = [k for k in self.keys[lo:hi] if k not in self._deleted]
+            if deleted:
+                self.revision += 1
+                self._deleted.update(deleted)
+            return {'header': {'revision': str(self.revision)}, 'deleted': str(len(deleted))}
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'header': {'revision': str(self.revision), 'member_id': '1'},
+            'version': '3.5.0',
+            'dbSize': str(len(self.keys) * 1024),
+            'leader': '1',
+            'raftIndex': str(self.revision),
+            'raftTerm': '2',
+        }
+
+    def members(self) -> Dict[str, Any]:
+        return {
+            'header': {'revision': str(self.revision)},
+            'members': [
+                {'ID': str(i + 1), 'name': pod, 'clientURLs': [f'https://10.0.0.{i + 1}:2379']}
+                for i, pod in enumerate(ETCD_PODS)
+            ],
+        }
+
+
+def _pod_list() -> Dict[str, Any]:
+    return {
+        'kind': 'PodList',
+        'apiVersion': 'v1',
+        'metadata': {},
+        'items': [
+            {
+                'metadata': {'name': pod, 'namespace': 'kube-system', 'labels': {'component': 'etcd'}},
+                'status': {
+                    'phase': 'Running',
+                    'podIP': f'10.0.0.{i + 1}',
+                    'conditions': [{'type': 'Ready', 'status': 'True'}],
+                },
+            }
+            for i, pod in enumerate(ETCD_PODS)
+        ],
+    }
+
+
+K8S_VERSION = {
+    'major': '1', 'minor': '30', 'gitVersion': 'v1.30.0', 'gitCommit': 'bench',
+    'gitTreeState': 'clean', 'buildDate': '2024-01-01T00:00:00Z', 'goVersion': 'go1.22',
+    'compiler': 'gc', 'platform': 'linux/amd64',
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # 헤더와 본문을 따로 쓰므로 keep-alive 에서 Nagle + delayed ACK 지연(~40ms)이 생기지 않게 함
+    disable_nagle_algorithm = True
+    keyspace: SyntheticKeyspace = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, code: int, payload: Any):
+        data = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        path = self.path.split('?')[0].rstrip('/')
+        if path == '/health':
+            return self._send(200, {'health': 'true', 'reason': ''})
+        if path == '/version':
+            return self._send(200, K8S_VERSION)
+        if path.startswith('/api/v1/namespaces/') and path.endswith('/pods'):
+            return self._send(200, _pod_list())
+        if path == '/api/v1/nodes':
+            return self._send(200, {'kind': 'NodeList', 'apiVersion': 'v1', 'metadata': {}, 'items': []})
+        self._send(404, {'error': 'not found', 'message': 'not found', 'code': 5})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length) or b'{}')
+        handlers = {
+            '/v3/kv/range': self.keyspace.range,
+            '/v3/kv/put': self.keyspace.put,
+            '/v3/kv/deleterange': self.keyspace.delete_range,
+            '/v3/maintenance/status': lambda _: self.keyspace.status(),
+            '/v3/cluster/member/list': lambda _: self.keyspace.members(),
+        }
+        if self.path == '/v3/watch':
+            return self._watch()
+        handler = handlers.get(self.path)
+        if handler is None:
+            return self._send(404, {'error': 'not found', 'message': f'{self.path} is not supported', 'code': 12})
+        try:
+            self._send(200, handler(body))
+        except ValueError as e:
+            self._send(400, {'error': str(e), 'message': str(e), 'code': 11})
+
+    def _watch(self):
+        # 읽기 전용 벤치마크이므로 created 응답만 보내고 연결이 끊길 때까지 유지
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        created = {'result': {'header': {'revision': str(self.keyspace.revision)}, 'created': True}}
+        self.wfile.write(json.dumps(created).encode() + b'\n')
+        self.wfile.flush()
+        self.rfile.read()
+
+
+def serve(keyspace: SyntheticKeyspace, host: str = '127.0.0.1', port: int = 0) -> ThreadingHTTPServer:
+    handler = type('Handler', (StubHandler,), {'keyspace': keyspace})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='etcd gateway / K8s API stub for benchmarks')
+    parser.add_argument('--keys', default='1k', help='number of synthetic keys (e.g. 1k, 100k, 1m)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0)
+    args = parser.parse_args()
+
+    server = serve(SyntheticKeyspace(parse_size(args.keys)), args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f'listening on http://{host}:{port}', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""벤치마크용 kubectl 대역 (``benchmarks/bin/kubectl`` 에서 실행)
+
+``kubectl exec ... -- etcdctl <command>`` 를 ``$ETCD_STUB_URL`` 의 gateway 호출로
+바꿔 etcdctl ``-w json`` 과 같은 형태로 출력하고, ``port-forward`` 는 stub 주소를
+그대로 알려 준다. 프로세스를 매번 띄우는 비용은 실제 kubectl exec 와 비슷하게 남는다.
+"""
+import base64
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Dict, List
+
+
+STUB_URL = os.environ.get('ETCD_STUB_URL', 'http://127.0.0.1:2379')
+
+# etcdctl -w json 은 int64 를 숫자로 출력 (gateway 는 문자열)
+INT_FIELDS = {
+    'revision', 'create_revision', 'mod_revision', 'version', 'count', 'deleted',
+    'member_id', 'cluster_id', 'raft_term', 'ID', 'dbSize', 'leader', 'raftIndex', 'raftTerm',
+}
+
+
+class EtcdctlError(Exception):
+    pass
+
+
+def _ints(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return {
+            k: int(v) if k in INT_FIELDS and isinstance(v, str) and v.isdigit() else _ints(v)
+            for k, v in obj.items()
+        }
+    if isinstance(obj, list):
+        return [_ints(v) for v in obj]
+    return obj
+
+
+def _call(path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    request = urllib.request.Request(
+        STUB_URL + path,
+        data=json.dumps(body).encode(),
+        headers={'Content-Type': 'application/json'},
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        raise EtcdctlError(json.loads(e.read()).get('message', str(e)))
+
+
+def _prefix_end(key: bytes) -> bytes:
+    end = bytearray(key)
+    for i in range(len(end) - 1, -1, -1):
+        if end[i] < 0xff:
+            end[i] += 1
+            return bytes(end[:i + 1])
+    return b'\0'
+
+
+def _parse(argv: List[str]):
+    flags: Dict[str, Any] = {}
+    positional = []
+    args = iter(argv)
+    for arg in args:
+        if arg in ('-w', '--write-out', '--limit', '--rev'):
+            flags[arg.lstrip('-')] = next(args)
+        elif arg.startswith('--'):
+            name, _, value = arg[2:].partition('=')
+            flags[name] = value or True
+        else:
+            positional.append(arg)
+    return positional, flags
+
+
+def _range_body(positional: List[str], flags: Dict[str, Any]) -> Dict[str, Any]:
+    key = os.fsencode(positional[1])
+    range_end = os.fsencode(positional[2]) if len(positional) > 2 else b''
+    if flags.get('prefix'):
+        range_end = _prefix_end(key)
+    if flags.get('from-key'):
+        range_end = b'\0'
+    body = {'key': base64.b64encode(key).decode()}
+    if range_end:
+        body['range_end'] = base64.b64encode(range_end).decode()
+    return body
+
+
+def etcdctl(argv: List[str]) -> Any:
+    positional, flags = _parse(argv)
+    command = positional[0] if positional else ''
+
+    if command == 'get':
+        body = _range_body(positional, flags)
+        for name in ('limit', 'rev'):
+            if name in flags:
+                body['revision' if name == 'rev' else name] = int(flags[name])
+        for name in ('keys-only', 'count-only'):
+            if flags.get(name):
+                body[name.replace('-', '_')] = True
+        return _ints(_call('/v3/kv/range', body))
+    if command == 'put':
+        body = {
+            'key': base64.b64encode(os.fsencode(positional[1])).decode(),
+            'value': base64.b64encode(sys.stdin.buffer.read()).decode(),
+        }
+        return _ints(_call('/v3/kv/put', body))
+    if command == 'del':
+        return _ints(_call('/v3/kv/deleterange', _range_body(positional, flags)))
+    if command == 'endpoint' and positional[1:] == ['health']:
+        return [{'endpoint': STUB_URL, 'health': True, 'took': '1ms'}]
+    if command == 'endpoint' and positional[1:] == ['status']:
+        return [{'Endpoint': STUB_URL, 'Status': _ints(_call('/v3/maintenance/status', {}))}]
+    if command == 'member' and positional[1:] == ['list']:
+        return _ints(_call('/v3/cluster/member/list', {}))
+    if command == 'watch':
+        # 읽기 전용 벤치마크: 이벤트 없이 종료될 때까지 대기
+        while True:
+            time.sleep(3600)
+    raise EtcdctlError(f'{" ".join(positional) or "command"} is not supported by the benchmark stub')
+
+
+def main(argv: List[str]) -> int:
+    if '--kubeconfig' in argv:
+        i = argv.index('--kubeconfig')
+        del argv[i:i + 2]
+
+    if argv and argv[0] == 'port-forward':
+        port = STUB_URL.rsplit(':', 1)[1]
+        print(f'Forwarding from 127.0.0.1:{port} -> 2379', flush=True)
+        while True:
+            time.sleep(3600)
+
+    if not argv or argv[0] != 'exec' or '--' not in argv:
+        sys.stderr.write(f'error: unsupported kubectl command: {argv}\n')
+        return 1
+
+    command = argv[argv.index('--') + 1:]
+    if command[:1] != ['etcdctl']:
+        sys.stderr.write(f'error: unsupported exec command: {command}\n')
+        return 1
+    try:
+        result = etcdctl(command[1:])
+    except EtcdctlError as e:
+        sys.stderr.write(f'Error: {e}\n')
+        return 1
+    print(json.dumps(result))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
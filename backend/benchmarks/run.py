@@ -0,0 +1,336 @@
+"""etcd 조회 API 벤치마크
+
+    cd backend
+    python -m benchmarks.run --keys 1k,100k --concurrency 1,8,32 --output bench.json
+    python -m benchmarks.run --keys 1k --compare bench.json
+
+keyspace 크기마다 ``benchmarks.etcd_stub`` 를 띄우고, backend 마다 별도 worker
+프로세스에서 KeyListView / KeyTreeView / KeyValueView / ClusterHealthView 를
+Django AsyncClient 로 동시에 호출해 latency(p50/p90/p99), 처리량, peak RSS 를 잰다.
+exec backend 는 ``benchmarks/bin/kubectl`` 대역을 PATH 앞에 두고 실행한다.
+"""
+import argparse
+import asyncio
+import cProfile
+import itertools
+import json
+import os
+import platform
+import pstats
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+from .compare import compare_results, print_comparison
+from .etcd_stub import RESOURCES, parse_size, synthetic_key
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHIM_DIR = os.path.join(BACKEND_DIR, 'benchmarks', 'bin')
+
+VIEWS = ('list', 'tree', 'value', 'health')
+BACKENDS = ('exec', 'gateway')
+
+VALUE_SAMPLE = 200
+
+
+def _csv(text: str) -> List[str]:
+    return [item.strip() for item in text.split(',') if item.strip()]
+
+
+def _peak_rss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    # Linux 는 KB, macOS 는 bytes 단위
+    peak = resource.getrusage(who).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], errors: int, wall: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    ms = lambda seconds: round(seconds * 1000, 2)  # noqa: E731
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / wall, 1) if wall else 0.0,
+        'latency_ms': {
+            'p50': ms(_percentile(ordered, 0.50)),
+            'p90': ms(_percentile(ordered, 0.90)),
+            'p99': ms(_percentile(ordered, 0.99)),
+            'mean': ms(statistics.fmean(ordered)) if ordered else 0.0,
+            'max': ms(ordered[-1]) if ordered else 0.0,
+        },
+    }
+
+
+def view_paths(view: str, cluster_id: int, size: int) -> List[str]:
+    """view 별로 돌아가며 호출할 요청 경로"""
+    base = f'/api/etcd/{cluster_id}'
+    if view == 'list':
+        return [f'{base}/keys/?prefix=/registry/{r}/&limit=100' for r in RESOURCES]
+    if view == 'tree':
+        return [f'{base}/tree/?prefix=/registry/{r}/&limit=500' for r in RESOURCES]
+    if view == 'value':
+        step = max(1, size // VALUE_SAMPLE)
+        return [
+            f'{base}/kv/?key={synthetic_key(i, size).decode()}'
+            for i in range(0, size, step)
+        ][:VALUE_SAMPLE]
+    if view == 'health':
+        return [f'{base}/health/']
+    raise ValueError(f'Unknown view: {view}')
+
+
+async def drive(client, paths: List[str], total: int, concurrency: int) -> Dict[str, Any]:
+    """concurrency 개의 작업이 paths 를 번갈아 total 번 호출"""
+    latencies: List[float] = []
+    errors = 0
+    counter = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while True:
+            i = next(counter)
+            if i >= total:
+                return
+            started = time.perf_counter()
+            response = await client.get(paths[i % len(paths)])
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+def profile_call(path: str, func, *args):
+    """func 실행을 cProfile 로 기록 (etcd 호출을 실행하는 스레드 풀 스레드 포함)"""
+    profilers = []
+
+    def start_thread_profiler(frame, event, arg):
+        # 새 스레드에서 처음 불릴 때 cProfile 로 교체됨
+        profiler = cProfile.Profile()
+        profilers.append(profiler)
+        profiler.enable()
+
+    main_profiler = cProfile.Profile()
+    threading.setprofile(start_thread_profiler)
+    try:
+        result = main_profiler.runcall(func, *args)
+    finally:
+        threading.setprofile(None)
+
+    stats = pstats.Stats(main_profiler)
+    for profiler in profilers:
+        stats.add(profiler)
+    stats.dump_stats(path)
+    return result
+
+
+def run_worker(args) -> List[Dict[str, Any]]:
+    """Django 를 띄워 한 (keyspace, backend) 조합의 모든 view / 동시성 측정"""
+    os.environ['PATH'] = SHIM_DIR + os.pathsep + os.environ.get('PATH', '')
+    os.environ['ETCD_STUB_URL'] = args.stub_url
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    os.environ.setdefault('DEBUG', 'False')
+    os.environ.setdefault('ALLOWED_HOSTS', 'testserver')
+    # 지정하지 않으면 호출마다 키가 새로 만들어져 저장한 kubeconfig 를 복호화할 수 없음
+    os.environ.setdefault('ENCRYPTION_KEY', 'benchmark-encryption-key')
+    if not args.cache:
+        os.environ['ETCD_RESPONSE_CACHE'] = 'none'
+
+    import django
+    from django.conf import settings
+    django.setup()
+
+    from django.core.management import call_command
+    from django.test import AsyncClient
+    from django.contrib.auth.models import User
+    from apps.clusters.models import Cluster
+
+    db_file = tempfile.NamedTemporaryFile(suffix='.sqlite3', delete=False)
+    db_file.close()
+    settings.DATABASES['default']['NAME'] = db_file.name
+    try:
+        call_command('migrate', verbosity=0)
+        user = User.objects.create_user('bench', password='bench')
+        cluster = Cluster(name='bench', etcd_backend=args.backend)
+        if args.backend == 'gateway':
+            cluster.etcd_endpoint = args.stub_url
+        cluster.set_kubeconfig(
+            'apiVersion: v1\nkind: Config\n'
+            f'clusters: [{{name: bench, cluster: {{server: "{args.stub_url}"}}}}]\n'
+            'users: [{name: bench, user: {token: bench}}]\n'
+            'contexts: [{name: bench, context: {cluster: bench, user: bench}}]\n'
+            'current-context: bench\n'
+        )
+        cluster.save()
+
+        client = AsyncClient()
+        client.force_login(user)
+        size = parse_size(args.keys)
+
+        async def measure():
+            results = []
+            for view in _csv(args.views):
+                paths = view_paths(view, cluster.pk, size)
+                await drive(client, paths, args.warmup, 1)
+                for concurrency in (int(c) for c in _csv(args.concurrency)):
+                    result = await drive(client, paths, args.requests, concurrency)
+                    result.update(
+                        keys=size,
+                        backend=args.backend,
+                        view=view,
+                        concurrency=concurrency,
+                        peak_rss_mb=_peak_rss_mb(),
+                    )
+                    results.append(result)
+                    print(format_row(result), file=sys.stderr, flush=True)
+            return results
+
+        if args.profile:
+            results = profile_call(args.profile, asyncio.run, measure())
+        else:
+            results = asyncio.run(measure())
+
+        for result in results:
+            result['children_peak_rss_mb'] = _peak_rss_mb(resource.RUSAGE_CHILDREN)
+        return results
+    finally:
+        os.unlink(db_file.name)
+
+
+def format_row(result: Dict[str, Any]) -> str:
+    latency = result['latency_ms']
+    return (
+        f"{result['keys']:>8} {result['backend']:<8} {result['view']:<7} c={result['concurrency']:<4}"
+        f" p50={latency['p50']:>8.2f}ms p99={latency['p99']:>8.2f}ms"
+        f" {result['throughput_rps']:>8.1f} req/s rss={result['peak_rss_mb']}MB"
+        f"{' errors=%d' % result['errors'] if result['errors'] else ''}"
+    )
+
+
+def _start_stub(keys: str) -> Tuple[subprocess.Popen, str]:
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.etcd_stub', '--keys', keys],
+        cwd=BACKEND_DIR,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    line = proc.stdout.readline()
+    if not line.startswith('listening on '):
+        proc.kill()
+        raise RuntimeError(f'etcd stub failed to start: {line!r}')
+    return proc, line.split()[-1]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def run_suite(args) -> Dict[str, Any]:
+    """keyspace 크기별 stub 과 backend 별 worker 프로세스를 띄워 결과 수집"""
+    results = []
+    for keys in _csv(args.keys):
+        stub, stub_url = _start_stub(keys)
+        try:
+            for backend in _csv(args.backend):
+                command = [
+                    sys.executable, '-m', 'benchmarks.run', '--worker',
+                    '--stub-url', stub_url,
+                    '--keys', keys,
+                    '--backend', backend,
+                    '--views', args.views,
+                    '--concurrency', args.concurrency,
+                    '--requests', str(args.requests),
+                    '--warmup', str(args.warmup),
+                ]
+                if args.cache:
+                    command.append('--cache')
+                if args.profile:
+                    command += ['--profile', f'{args.profile}-{parse_size(keys)}-{backend}.prof']
+                output = subprocess.run(command, cwd=BACKEND_DIR, stdout=subprocess.PIPE, check=True).stdout
+                results.extend(json.loads(output))
+        finally:
+            stub.kill()
+            stub.wait()
+
+    return {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'options': {
+                'keys': _csv(args.keys),
+                'backend': _csv(args.backend),
+                'views': _csv(args.views),
+                'concurrency': [int(c) for c in _csv(args.concurrency)],
+                'requests': args.requests,
+                'warmup': args.warmup,
+                'cache': args.cache,
+            },
+        },
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark etcd browse APIs against an in-memory stub')
+    parser.add_argument('--keys', default='1k,100k', help='keyspace sizes, comma separated (e.g. 1k,100k,1m)')
+    parser.add_argument('--backend', default=','.join(BACKENDS), help='etcd backends to measure')
+    parser.add_argument('--views', default=','.join(VIEWS), help='views to measure')
+    parser.add_argument('--concurrency', default='1,8,32', help='concurrent requests, comma separated')
+    parser.add_argument('--requests', type=int, default=200, help='requests per view and concurrency')
+    parser.add_argument('--warmup', type=int, default=10, help='warmup requests per view')
+    parser.add_argument('--cache', action='store_true', help='keep the etcd response cache enabled')
+    parser.add_argument('--profile', help='write cProfile stats to <PROFILE>-<keys>-<backend>.prof')
+    parser.add_argument('--output', help='write JSON results to this file')
+    parser.add_argument('--compare', help='baseline JSON results to compare against')
+    parser.add_argument('--threshold', type=float, default=10.0, help='regression threshold in percent')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--stub-url', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        json.dump(run_worker(args), sys.stdout)
+        return 0
+
+    report = run_suite(args)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare_results(baseline, report, args.threshold)
+        print_comparison(rows, sys.stderr)
+        return 1 if any(row['regression'] for row in rows) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -29,6 +29,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.etcd.middleware.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -58,6 +59,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
 
 # Database
 DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
@@ -81,6 +83,27 @@ else:
         }
     }
 
+# uvicorn worker 수 (uvicorn 도 WEB_CONCURRENCY 를 --workers 기본값으로 읽는다)
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', '1'))
+
+# Cache: worker 가 여러 개면 응답 캐시 무효화가 모든 worker 에 보이도록 파일 캐시를 공유
+# (컨테이너가 여러 개면 CACHE_BACKEND / CACHE_LOCATION 으로 Redis 등 공용 캐시를 지정)
+CACHE_BACKEND = os.getenv(
+    'CACHE_BACKEND',
+    'django.core.cache.backends.filebased.FileBasedCache' if WEB_CONCURRENCY > 1
+    else 'django.core.cache.backends.locmem.LocMemCache'
+)
+CACHE_LOCATION = os.getenv(
+    'CACHE_LOCATION',
+    '/tmp/etcd-web-manager-cache' if 'FileBasedCache' in CACHE_BACKEND else ''
+)
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': CACHE_LOCATION,
+    }
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -134,3 +157,92 @@ SESSION_COOKIE_SAMESITE = 'Lax'
 
 # Encryption key for kubeconfig storage
 ENCRYPTION_KEY = os.getenv('ENCRYPTION_KEY', None)
+
+# etcd service pool (클러스터별 EtcdService 재사용)
+ETCD_SERVICE_POOL_SIZE = int(os.getenv('ETCD_SERVICE_POOL_SIZE', '32'))
+ETCD_SERVICE_POOL_TTL = int(os.getenv('ETCD_SERVICE_POOL_TTL', '300'))
+
+# etcdctl 실행 방식: kubectl (명령마다 kubectl exec) / stream (pod 당 exec 스트림 유지)
+ETCD_EXEC_MODE = os.getenv('ETCD_EXEC_MODE', 'kubectl')
+
+# 클러스터별 키 인덱스 (snapshot + watch 로 메모리에 유지, 목록/트리 조회에 사용)
+ETCD_KEY_INDEX_ENABLED = os.getenv('ETCD_KEY_INDEX_ENABLED', 'False').lower() == 'true'
+ETCD_KEY_INDEX_IDLE_TIMEOUT = int(os.getenv('ETCD_KEY_INDEX_IDLE_TIMEOUT', '600'))
+
+# prefix export / import (NDJSON 스트리밍, import 는 txn batch 단위로 적용)
+ETCD_EXPORT_BATCH_SIZE = int(os.getenv('ETCD_EXPORT_BATCH_SIZE', '500'))
+ETCD_IMPORT_BATCH_OPS = int(os.getenv('ETCD_IMPORT_BATCH_OPS', '128'))
+ETCD_IMPORT_BATCH_BYTES = int(os.getenv('ETCD_IMPORT_BATCH_BYTES', str(1024 * 1024)))
+ETCD_IMPORT_MAX_LINE_SIZE = int(os.getenv('ETCD_IMPORT_MAX_LINE_SIZE', str(4 * 1024 * 1024)))
+
+# 값 조회 시 decode=true 로 구조화(JSON/YAML/protobuf)할 수 있는 최대 크기
+ETCD_VALUE_DECODE_MAX_SIZE = int(os.getenv('ETCD_VALUE_DECODE_MAX_SIZE', str(256 * 1024)))
+
+# health 조회: health/status/members 를 동시에 실행하는 스레드 수와 항목별 제한 시간(초)
+ETCD_PROBE_WORKERS = int(os.getenv('ETCD_PROBE_WORKERS', '16'))
+ETCD_HEALTH_TIMEOUT = float(os.getenv('ETCD_HEALTH_TIMEOUT', '10'))
+
+# 변경 이벤트 SSE (/api/etcd/<id>/watch/): 구독자별 큐 크기, keepalive 주기, 최대 연결 시간(초)
+ETCD_WATCH_QUEUE_SIZE = int(os.getenv('ETCD_WATCH_QUEUE_SIZE', '1000'))
+ETCD_WATCH_KEEPALIVE = float(os.getenv('ETCD_WATCH_KEEPALIVE', '15'))
+ETCD_WATCH_MAX_DURATION = float(os.getenv('ETCD_WATCH_MAX_DURATION', '300'))
+
+# async etcd view: blocking etcd 호출을 실행하는 스레드 수와 클러스터별 동시 실행 수
+ETCD_ASYNC_WORKERS = int(os.getenv('ETCD_ASYNC_WORKERS', '128'))
+ETCD_CLUSTER_CONCURRENCY = int(os.getenv('ETCD_CLUSTER_CONCURRENCY', '8'))
+
+# 클러스터별 대기 가능한 etcd 호출 수와 최대 대기 시간(초), 넘으면 429 로 거절
+ETCD_CLUSTER_QUEUE_SIZE = int(os.getenv('ETCD_CLUSTER_QUEUE_SIZE', '32'))
+ETCD_CLUSTER_QUEUE_TIMEOUT = float(os.getenv('ETCD_CLUSTER_QUEUE_TIMEOUT', '10'))
+# 같은 인자로 동시에 들어온 읽기 조회(목록/트리/값/health 등)는 etcd 호출 하나를 공유
+ETCD_COALESCE_READS = os.getenv('ETCD_COALESCE_READS', 'True').lower() == 'true'
+
+# etcd pod 목록 캐시(초), 목록/트리 조회를 serializable read(--consistency=s)로 실행할지 여부
+ETCD_POD_CACHE_TTL = float(os.getenv('ETCD_POD_CACHE_TTL', '30'))
+ETCD_SERIALIZABLE_READS = os.getenv('ETCD_SERIALIZABLE_READS', 'False').lower() == 'true'
+
+# 읽기 전용 etcd 응답 캐시: local(프로세스 내 LRU) / django(CACHES 의 alias 사용) / none
+# local 은 쓰기를 받은 worker 의 캐시만 비우므로 worker 가 둘 이상이면 django 가 기본값
+ETCD_RESPONSE_CACHE = os.getenv('ETCD_RESPONSE_CACHE', 'django' if WEB_CONCURRENCY > 1 else 'local')
+ETCD_RESPONSE_CACHE_TTL = float(os.getenv('ETCD_RESPONSE_CACHE_TTL', '5'))
+ETCD_RESPONSE_CACHE_SIZE = int(os.getenv('ETCD_RESPONSE_CACHE_SIZE', '512'))
+ETCD_RESPONSE_CACHE_ALIAS = os.getenv('ETCD_RESPONSE_CACHE_ALIAS', 'default')
+
+# 키 검색: 한 번에 읽는 batch 크기, 요청에 time_budget 이 없을 때 최대 검색 시간(초)
+ETCD_SEARCH_BATCH_SIZE = int(os.getenv('ETCD_SEARCH_BATCH_SIZE', '1000'))
+ETCD_SEARCH_TIME_BUDGET = float(os.getenv('ETCD_SEARCH_TIME_BUDGET', '10'))
+
+# keyspace 통계: 캐시 유지 시간(초), 한 번에 읽는 키 수(값 포함), 최대 그룹 수(넘으면 (other) 로 합침)
+ETCD_STATS_CACHE_TTL = float(os.getenv('ETCD_STATS_CACHE_TTL', '300'))
+ETCD_STATS_BATCH_SIZE = int(os.getenv('ETCD_STATS_BATCH_SIZE', '200'))
+ETCD_STATS_MAX_GROUPS = int(os.getenv('ETCD_STATS_MAX_GROUPS', '1000'))
+
+# 키 변경 이력: 최대 조회 시간(초), watch 재생이 끝났다고 볼 무응답 시간(초)
+ETCD_HISTORY_TIMEOUT = float(os.getenv('ETCD_HISTORY_TIMEOUT', '10'))
+ETCD_HISTORY_IDLE_TIMEOUT = float(os.getenv('ETCD_HISTORY_IDLE_TIMEOUT', '1'))
+
+# prefix 삭제를 나누는 batch 당 키 수와 batch 사이 대기 시간(초)
+ETCD_PREFIX_DELETE_BATCH_SIZE = int(os.getenv('ETCD_PREFIX_DELETE_BATCH_SIZE', '500'))
+ETCD_PREFIX_DELETE_PAUSE = float(os.getenv('ETCD_PREFIX_DELETE_PAUSE', '0.2'))
+
+# 스냅샷 백업: 저장 디렉터리, etcd 에서 받아 오는 최대 시간(초)
+ETCD_SNAPSHOT_DIR = os.getenv('ETCD_SNAPSHOT_DIR', str(BASE_DIR / 'data' / 'snapshots'))
+ETCD_SNAPSHOT_TIMEOUT = float(os.getenv('ETCD_SNAPSHOT_TIMEOUT', '600'))
+# 스냅샷 조회: 열어 둘 스냅샷 수와 유지 시간(초), 스냅샷별 동시 조회 수 (클러스터 etcd 호출 제한과 별도)
+ETCD_SNAPSHOT_OPEN_MAX = int(os.getenv('ETCD_SNAPSHOT_OPEN_MAX', '4'))
+ETCD_SNAPSHOT_OPEN_TTL = int(os.getenv('ETCD_SNAPSHOT_OPEN_TTL', '1800'))
+ETCD_SNAPSHOT_CONCURRENCY = int(os.getenv('ETCD_SNAPSHOT_CONCURRENCY', '4'))
+
+# 클러스터 상태 확인: 동시에 확인하는 스레드 수, 클러스터별 제한 시간(초), 대시보드 결과 캐시(초)
+CLUSTER_PROBE_WORKERS = int(os.getenv('CLUSTER_PROBE_WORKERS', '16'))
+CLUSTER_PROBE_TIMEOUT = float(os.getenv('CLUSTER_PROBE_TIMEOUT', '5'))
+CLUSTER_STATUS_CACHE_TTL = float(os.getenv('CLUSTER_STATUS_CACHE_TTL', '15'))
+
+# 관측: /metrics 에 Prometheus metrics 노출 (prometheus_client 필요), 응답에 Server-Timing 헤더 추가
+ETCD_METRICS_ENABLED = os.getenv('ETCD_METRICS_ENABLED', 'True').lower() == 'true'
+ETCD_SERVER_TIMING_ENABLED = os.getenv('ETCD_SERVER_TIMING_ENABLED', 'True').lower() == 'true'
+# /metrics 는 세션 없이 scrape 하므로 허용 IP(대역) 또는 Bearer token 으로만 연다 (cluster id / 지연 시간 노출)
+ETCD_METRICS_ALLOWED_IPS = [
+    ip.strip() for ip in os.getenv('ETCD_METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',') if ip.strip()
+]
+ETCD_METRICS_TOKEN = os.getenv('ETCD_METRICS_TOKEN', '')
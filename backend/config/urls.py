@@ -1,9 +1,12 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from apps.etcd.views import MetricsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/clusters/', include('apps.clusters.urls')),
     path('api/etcd/', include('apps.etcd.urls')),
     path('api/auth/', include('apps.clusters.auth_urls')),
+    path('metrics', MetricsView.as_view(), name='metrics'),
 ]
@@ -0,0 +1,10 @@
+#!/bin/sh
+set -e
+
+# worker 별 metrics 기록 디렉터리, 이전 실행의 기록이 합산되지 않도록 시작할 때 비운다
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
+exec "$@"
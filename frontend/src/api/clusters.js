@@ -25,6 +25,10 @@ export const clustersApi = {
     return client.get(`/clusters/${id}/status/`)
   },
 
+  fleetStatus(refresh = false) {
+    return client.get('/clusters/fleet_status/', { params: refresh ? { refresh: true } : {} })
+  },
+
   testConnection(id) {
     return client.post(`/clusters/${id}/test_connection/`)
   },
@@ -1,5 +1,38 @@
 import client from './client'
 
+const csrfToken = () => document.cookie
+  .split('; ')
+  .find(row => row.startsWith('csrftoken='))
+  ?.split('=')[1] || ''
+
+const readLines = async (response, onItem) => {
+  if (!response.ok) {
+    const data = await response.json().catch(() => ({}))
+    throw new Error(data.error || JSON.stringify(data) || response.statusText)
+  }
+
+  const reader = response.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+  for (;;) {
+    const { done, value } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true })
+    const lines = buffer.split('\n')
+    buffer = lines.pop()
+    lines.filter(Boolean).forEach(line => onItem(JSON.parse(line)))
+  }
+  if (buffer) onItem(JSON.parse(buffer))
+}
+
+const searchLines = async (url, params, onItem, signal) => {
+  const query = new URLSearchParams(params)
+  const response = await fetch(`${url}?${query}`, { credentials: 'include', signal })
+  await readLines(response, onItem)
+}
+
+const snapshotPath = (clusterId, snapshotId) => `/etcd/${clusterId}/snapshots/${snapshotId}`
+
 export const etcdApi = {
   getKeys(clusterId, params = {}) {
     return client.get(`/etcd/${clusterId}/keys/`, { params })
@@ -9,19 +42,134 @@ export const etcdApi = {
     return client.get(`/etcd/${clusterId}/tree/`, { params })
   },
 
-  getValue(clusterId, key) {
-    return client.get(`/etcd/${clusterId}/kv/`, { params: { key } })
+  getChildren(clusterId, params = {}) {
+    return client.get(`/etcd/${clusterId}/children/`, { params })
+  },
+
+  // NDJSON 스트림을 읽으면서 한 줄(match / done / error)마다 onItem 호출
+  search(clusterId, params, onItem, signal) {
+    return searchLines(`/api/etcd/${clusterId}/search/`, params, onItem, signal)
+  },
+
+  // dry run: 지워질 키 수 / 크기 / batch 수
+  estimateDeletePrefix(clusterId, prefix, batchSize = null) {
+    return client.post(`/etcd/${clusterId}/delete-prefix/`, {
+      prefix,
+      dry_run: true,
+      ...(batchSize ? { batch_size: batchSize } : {})
+    })
+  },
+
+  // batch 마다 한 줄(started / progress / done / error)씩 onItem 호출, job_id 로 취소
+  async deletePrefix(clusterId, params, onItem) {
+    const response = await fetch(`/api/etcd/${clusterId}/delete-prefix/`, {
+      method: 'POST',
+      credentials: 'include',
+      headers: { 'Content-Type': 'application/json', 'X-CSRFToken': csrfToken() },
+      body: JSON.stringify(params)
+    })
+    await readLines(response, onItem)
+  },
+
+  cancelDeletePrefix(clusterId, jobId) {
+    return client.delete(`/etcd/${clusterId}/delete-prefix/${jobId}/`)
+  },
+
+  getStats(clusterId, params = {}) {
+    return client.get(`/etcd/${clusterId}/stats/`, { params })
+  },
+
+  getValue(clusterId, key, params = {}) {
+    return client.get(`/etcd/${clusterId}/kv/`, { params: { key, ...params } })
+  },
+
+  getHistory(clusterId, key, params = {}) {
+    return client.get(`/etcd/${clusterId}/kv/history/`, { params: { key, ...params } })
+  },
+
+  diffRevisions(clusterId, key, fromRevision, toRevision = 0) {
+    return client.get(`/etcd/${clusterId}/kv/diff/`, {
+      params: { key, from_revision: fromRevision, to_revision: toRevision }
+    })
   },
 
-  putValue(clusterId, key, value) {
-    return client.post(`/etcd/${clusterId}/kv/`, { key, value })
+  // expectedModRevision 을 주면 그 사이 다른 사람이 바꿨을 때 409 (0 은 없는 키만 생성)
+  putValue(clusterId, key, value, encoding = 'utf-8', expectedModRevision = null) {
+    return client.post(`/etcd/${clusterId}/kv/`, {
+      key,
+      value,
+      encoding,
+      expected_mod_revision: expectedModRevision
+    })
   },
 
-  deleteKey(clusterId, key, prefix = false) {
-    return client.delete(`/etcd/${clusterId}/kv/`, { data: { key, prefix } })
+  deleteKey(clusterId, key, prefix = false, expectedModRevision = null) {
+    return client.delete(`/etcd/${clusterId}/kv/`, {
+      data: { key, prefix, expected_mod_revision: expectedModRevision }
+    })
+  },
+
+  batch(clusterId, operations) {
+    return client.post(`/etcd/${clusterId}/batch/`, { operations })
+  },
+
+  exportUrl(clusterId, prefix = '/', compression = 'none') {
+    const params = new URLSearchParams({ prefix, compression })
+    return `/api/etcd/${clusterId}/export/?${params}`
+  },
+
+  importRecords(clusterId, file, compression = 'none') {
+    return client.post(`/etcd/${clusterId}/import/`, file, {
+      params: { compression },
+      headers: { 'Content-Type': 'application/octet-stream' }
+    })
+  },
+
+  watchUrl(clusterId, prefix = '/') {
+    return `/api/etcd/${clusterId}/watch/?${new URLSearchParams({ prefix })}`
   },
 
   getHealth(clusterId) {
     return client.get(`/etcd/${clusterId}/health/`)
+  },
+
+  listSnapshots(clusterId) {
+    return client.get(`/etcd/${clusterId}/snapshots/`)
+  },
+
+  // 저장하는 동안 한 줄(started / progress / done / error)씩 onItem 호출
+  async createSnapshot(clusterId, onItem) {
+    const response = await fetch(`/api/etcd/${clusterId}/snapshots/`, {
+      method: 'POST',
+      credentials: 'include',
+      headers: { 'Content-Type': 'application/json', 'X-CSRFToken': csrfToken() },
+      body: '{}'
+    })
+    await readLines(response, onItem)
+  },
+
+  deleteSnapshot(clusterId, snapshotId) {
+    return client.delete(`${snapshotPath(clusterId, snapshotId)}/`)
+  },
+
+  snapshotDownloadUrl(clusterId, snapshotId) {
+    return `/api${snapshotPath(clusterId, snapshotId)}/download/`
+  },
+
+  // 스냅샷 조회 (읽기 전용, 응답 형식은 live 조회와 같음)
+  getSnapshotChildren(clusterId, snapshotId, params = {}) {
+    return client.get(`${snapshotPath(clusterId, snapshotId)}/children/`, { params })
+  },
+
+  getSnapshotValue(clusterId, snapshotId, key, params = {}) {
+    return client.get(`${snapshotPath(clusterId, snapshotId)}/kv/`, { params: { key, ...params } })
+  },
+
+  getSnapshotStats(clusterId, snapshotId, params = {}) {
+    return client.get(`${snapshotPath(clusterId, snapshotId)}/stats/`, { params })
+  },
+
+  searchSnapshot(clusterId, snapshotId, params, onItem, signal) {
+    return searchLines(`/api${snapshotPath(clusterId, snapshotId)}/search/`, params, onItem, signal)
   }
 }